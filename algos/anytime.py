@@ -0,0 +1,84 @@
+from time import perf_counter
+from algos import bipartite, networkflow
+from algos.profiles import group_profiles, degree_upper_bound
+
+SOLVERS = {
+    "bipartite": bipartite.schedule_interviews,
+    "networkflow": networkflow.schedule_interviews
+}
+
+
+def anytime_schedule_interviews(
+    candidates: dict[str, dict],
+    recruiters: dict[str, dict],
+    slot_length_minutes: int,
+    max_interviews_per_candidate: int,
+    max_interviews_per_recruiter: int,
+    time_budget_ms: float = 500,
+    method: str = "bipartite",
+    **options
+) -> dict:
+    """
+    Schedules within a time budget and reports how good the result is.
+
+    The solver starts from the greedy schedule and improves it with augmenting paths
+    (bipartite) or flow iterations (networkflow) until it is maximum or the budget runs
+    out, keeping part of the budget to format the result. The solver reports whether it
+    finished, which proves its schedule maximum; otherwise the gap is measured against
+    a degree bound computed from the availability it has already parsed, in which
+    anyone not parsed in time counts with their full cap. With max_workers in options,
+    the budget covers splitting the instance and every component, and the bound is
+    the sum of the components' bounds.
+
+    Args:
+        candidates, recruiters, slot_length_minutes, max_interviews_per_candidate,
+        max_interviews_per_recruiter: as for the schedulers
+        time_budget_ms: wall-clock budget for the solve
+        method: "bipartite" or "networkflow"
+        options: extra keyword arguments for the solver (e.g. algorithm="dinic")
+
+    Returns:
+        {"schedule": [[candidate, recruiter, time_slot], ...], "interviews": int,
+         "upper_bound": int, "gap": upper_bound - interviews, "optimal": bool,
+         "finished": bool, "elapsed_ms": float}
+    """
+    if method not in SOLVERS:
+        raise ValueError(f"Unknown method: {method}")
+
+    start = perf_counter()
+    report = {}
+    scheduled = SOLVERS[method](candidates, recruiters, slot_length_minutes, max_interviews_per_candidate,
+                                max_interviews_per_recruiter, time_budget_ms=time_budget_ms, report=report,
+                                **options)
+    elapsed_ms = (perf_counter() - start) * 1000
+
+    finished = report["finished"]
+    upper_bound = report["upper_bound"]
+    optimal = finished or len(scheduled) == upper_bound
+
+    return {
+        "schedule": scheduled,
+        "interviews": len(scheduled),
+        "upper_bound": upper_bound,
+        "gap": upper_bound - len(scheduled),
+        "optimal": optimal,
+        "finished": finished,
+        "elapsed_ms": elapsed_ms
+    }
+
+
+def interview_upper_bound(
+    candidates: dict[str, dict],
+    recruiters: dict[str, dict],
+    slot_length_minutes: int,
+    max_interviews_per_candidate: int,
+    max_interviews_per_recruiter: int
+) -> int:
+    """
+    Upper bound on the number of interviews in any feasible schedule; see
+    algos.profiles.degree_upper_bound, which schedulers use on the profiles they
+    have already parsed.
+    """
+    return degree_upper_bound(group_profiles(candidates, slot_length_minutes),
+                              group_profiles(recruiters, slot_length_minutes),
+                              max_interviews_per_candidate, max_interviews_per_recruiter)
@@ -1,73 +1,40 @@
-from collections import defaultdict
-from datetime import datetime, timedelta
-from zoneinfo import ZoneInfo
-
-# Optional: Map common timezone abbreviations to IANA
-TIMEZONE_MAP = {
-    "PST": "America/Los_Angeles",
-    "EST": "America/New_York",
-    "CST": "America/Chicago",
-    "MST": "America/Denver"
-}
-
-def resolve_timezone(tz_str):
-    """
-    Resolves a timezone string to a ZoneInfo object.
-    Supports common abbreviations by mapping them to full IANA names.
-    """
-    return ZoneInfo(TIMEZONE_MAP.get(tz_str, tz_str))
-
-def parse_multi_day_slots(availability, slot_length_minutes, timezone_str):
-    """
-    Converts availability ranges into discrete time slots of fixed length,
-    filtering out weekends and ensuring the slots fall within 9am–6pm in the local time zone.
-
-    Args:
-        availability: list of strings like "2025-04-01 09:00-10:00"
-        slot_length_minutes: duration of each interview slot (e.g., 30)
-        timezone_str: time zone (e.g., "EST", "PST", "America/New_York")
-
-    Returns:
-        A set of timezone-aware datetime objects, each representing a slot start time
-    """
-    tz = resolve_timezone(timezone_str)
-    time_slots = set()
-
-    for time_range in availability:
-        # Split "2025-04-01 09:00-10:00" into parts
-        date_str, time_str = time_range.split()
-        start_str, end_str = time_str.split("-")
-
-        # Convert to timezone-aware datetime objects
-        start = datetime.strptime(f"{date_str} {start_str}", "%Y-%m-%d %H:%M").replace(tzinfo=tz)
-        end = datetime.strptime(f"{date_str} {end_str}", "%Y-%m-%d %H:%M").replace(tzinfo=tz)
-
-        # Skip weekends
-        if start.weekday() >= 5:
-            continue
-        
-        # Clamp slots to working hours: 9am to 6pm
-        work_start = start.replace(hour=9, minute=0)
-        work_end = start.replace(hour=18, minute=0)
-        start = max(start, work_start)
-        end = min(end, work_end)
-
-        # Generate discrete time slots (e.g., every 30 minutes)
-        while start + timedelta(minutes=slot_length_minutes) <= end:
-            time_slots.add(start)
-            start += timedelta(minutes=slot_length_minutes)
-    return time_slots
+import warnings
+from bisect import bisect_left
+from collections import defaultdict, deque
+from time import perf_counter
+from algos.components import solve_components
+from algos.greedy import greedy_assignments
+from algos.profiles import (expand_assignments, resolve_schedule, budget_deadline, degree_upper_bound,
+                            parse_profiles)
+from utils.instrumentation import get_instrumentation
+from utils.time_paraser import format_slot
 
 def schedule_interviews(
     candidates: dict[str, dict],
     recruiters: dict[str, dict],
     slot_length_minutes: int,
     max_interviews_per_candidate: int,
-    max_interviews_per_recruiter: int
+    max_interviews_per_recruiter: int,
+    algorithm: str = "phases",
+    max_workers: int = None,
+    dedupe_profiles: bool = False,
+    time_budget_ms: float = None,
+    initial_schedule: list[list[str]] = None,
+    report: dict = None
 ) -> list[list[str]]:
     """
     Matches candidates and recruiters for interviews based on availability.
-    Uses first-come-first-serve matching on overlapping time slots.
+
+    The matching is a b-matching: both caps are vertex capacities during augmentation,
+    and nobody is booked twice in one slot, so one solve returns a maximum feasible
+    schedule. Candidates are served in input order, earliest slots first.
+
+    Both matching engines augment in phases of shortest paths (BFS layering and an
+    iterative DFS) through one vertex per slot, between one vertex per profile on each
+    side (one person each without dedupe_profiles): "phases" starts from an empty matching;
+    "hopcroft_karp" first finds a one-interview-per-candidate matching on the
+    candidate-recruiter-slot graph, then tops it up with the same capacity-aware
+    augmentation.
 
     Args:
         candidates: dict mapping candidate name to {"availability": [...], "timezone": ...}
@@ -75,61 +42,426 @@ def schedule_interviews(
         slot_length_minutes: fixed duration of each interview slot
         max_interviews_per_candidate: maximum interviews allowed per candidate
         max_interviews_per_recruiter: maximum interviews allowed per recruiter
+        algorithm: matching engine, "phases" or "hopcroft_karp"; "kuhn" is a deprecated
+            name for "phases"
+        max_workers: if set, solve each connected component in a process pool of this size
+        dedupe_profiles: collapse people with identical availability into one vertex with
+            aggregated capacity, and expand the assignments back to individuals afterwards
+        time_budget_ms: if set, start from the greedy schedule instead of the engine's
+            own initial matching, and stop once this many milliseconds have passed, less
+            a share kept for formatting; the result is then the best schedule found so
+            far, or the greedy schedule itself if the graph could not be built in time.
+            Parsing stops at a share of the budget, and only the people parsed by then
+            are scheduled. With max_workers the budget covers the whole solve.
+        initial_schedule: a previous [candidate, recruiter, time_slot] schedule to start
+            from instead; the interviews that still fit the current availability and caps
+            are kept as the initial matching and only augmented from there
+        report: if a dict is given, it receives "finished" (everyone was parsed and the
+            matching ran to completion, so the schedule is maximum) and "upper_bound" (the
+            schedule's size if finished, else algos.profiles.degree_upper_bound; summed
+            over components when max_workers is set)
 
     Returns:
         A list of [candidate, recruiter, time_slot] assignments
     """
-    # Parse candidate availability into sets of datetime slots
-    candidate_slots = {
-        cand: parse_multi_day_slots(data["availability"], slot_length_minutes, data["timezone"])
-        for cand, data in candidates.items()
-    }
-
-    # Parse recruiter availability into sets of datetime slots
-    recruiter_slots = {
-        rec: parse_multi_day_slots(data["availability"], slot_length_minutes, data["timezone"])
-        for rec, data in recruiters.items()
-    }
-
-    slot_key_to_info = {}
-    adj = defaultdict(list)
-    for rec, r_slots in recruiter_slots.items():
-        for slot in r_slots:
-            key = f"{rec}_{slot.isoformat()}"
-            slot_key_to_info[key] = (rec, slot)
-
-    for cand, c_slots in candidate_slots.items():
-        for key, (rec, slot) in slot_key_to_info.items():
-            if slot in c_slots:
-                adj[cand].append(key)
-
-    def dfs(cand, visited, match):
-        for slot_key in adj[cand]:
-            if slot_key in visited:
-                continue
-            visited.add(slot_key)
-            if slot_key not in match or dfs(match[slot_key], visited, match):
-                match[slot_key] = cand
-                return True
-        return False
-
-    match = {}
-    candidate_match_count = defaultdict(int)
-    recruiter_match_count = defaultdict(int)
-
-    for cand in candidates:
-        if candidate_match_count[cand] >= max_interviews_per_candidate:
+    if algorithm == "kuhn":
+        # The engine augments in phases of shortest paths, not one path at a time
+        warnings.warn('algorithm="kuhn" is deprecated, use "phases"', DeprecationWarning, stacklevel=2)
+        algorithm = "phases"
+
+    if max_workers is not None:
+        scheduled = solve_components(schedule_interviews, candidates, recruiters, slot_length_minutes,
+                                     max_interviews_per_candidate, max_interviews_per_recruiter, max_workers,
+                                     algorithm=algorithm, dedupe_profiles=dedupe_profiles,
+                                     time_budget_ms=time_budget_ms, initial_schedule=initial_schedule,
+                                     report=report)
+        return sorted(scheduled, key=lambda x: x[2])
+
+    deadline = budget_deadline(time_budget_ms)
+    instrumentation = get_instrumentation()
+
+    def out_of_time():
+        return deadline is not None and perf_counter() >= deadline
+
+    def finish(assignments, finished):
+        # Expand the profile-level assignments and show each slot in the recruiter's
+        # time zone, earliest first
+        with instrumentation.span("bipartite.format"):
+            scheduled = sorted(([cand, rec, format_slot(slot, recruiters[rec]["timezone"])]
+                                for cand, rec, slot in expand_assignments(assignments, candidate_profiles,
+                                                                          recruiter_profiles)),
+                               key=lambda x: x[2])
+        if report is not None:
+            # Only a solve over everyone proves the schedule maximum
+            report["finished"] = finished = finished and parsed_all
+            report["upper_bound"] = len(scheduled) if finished else upper_bound
+        return scheduled
+
+    # Parse availability into profiles of integer slots (UTC minutes); with a budget,
+    # only as many people as leave time to schedule them
+    with instrumentation.span("bipartite.parse"):
+        candidate_profiles, recruiter_profiles, parsed_all = parse_profiles(
+            candidates, recruiters, slot_length_minutes, dedupe_profiles, deadline)
+    if not parsed_all:
+        # Everyone else is left out of this solve
+        instrumentation.count("bipartite.deadline_hits")
+    if report is not None:
+        # Within the budget, so that reporting on an unfinished solve is cheap
+        upper_bound = degree_upper_bound(candidate_profiles, recruiter_profiles,
+                                         max_interviews_per_candidate, max_interviews_per_recruiter,
+                                         len(candidates), len(recruiters))
+
+    if algorithm not in ("phases", "hopcroft_karp"):
+        raise ValueError(f"Unknown matching algorithm: {algorithm}")
+    seed = None
+    fallback = None  # the greedy schedule, returned as is if there is no time to improve on it
+    if initial_schedule is not None:
+        # Warm start: the previous schedule at profile level
+        candidate_index = {cand: c for c, (_, members) in enumerate(candidate_profiles) for cand in members}
+        recruiter_index = {rec: r for r, (_, members) in enumerate(recruiter_profiles) for rec in members}
+        seed = [(candidate_index[cand], recruiter_index[rec], slot)
+                for cand, rec, slot in resolve_schedule(initial_schedule, candidates, recruiters)
+                if cand in candidate_index and rec in recruiter_index]
+    elif deadline is not None:
+        # Anytime mode: the greedy schedule is a cheap, feasible starting point, found
+        # before anything else spends the budget
+        seed = fallback = greedy_assignments(candidate_profiles, recruiter_profiles, max_interviews_per_candidate,
+                                             max_interviews_per_recruiter, deadline)
+        if out_of_time():
+            instrumentation.count("bipartite.deadline_hits")
+            return finish(fallback, False)
+
+    with instrumentation.span("bipartite.build_graph"):
+        # Each profile only touches the slots it shares with the other side, earliest first
+        candidate_union = set().union(*(slots for slots, _ in candidate_profiles))
+        recruiter_union = set().union(*(slots for slots, _ in recruiter_profiles))
+        candidate_slots = []
+        recruiter_slots = []
+        for profiles, profile_slots, other_union in ((candidate_profiles, candidate_slots, recruiter_union),
+                                                     (recruiter_profiles, recruiter_slots, candidate_union)):
+            for slots, _ in profiles:
+                if fallback is not None and out_of_time():
+                    break
+                profile_slots.append(sorted(slots & other_union))
+        instrumentation.count("bipartite.edges", sum(map(len, candidate_slots)) + sum(map(len, recruiter_slots)))
+
+    if fallback is not None and out_of_time():
+        # The graph was not built in time
+        instrumentation.count("bipartite.deadline_hits")
+        return finish(fallback, False)
+
+    candidate_sizes = [len(members) for _, members in candidate_profiles]
+    recruiter_sizes = [len(members) for _, members in recruiter_profiles]
+    with instrumentation.span("bipartite.solve"):
+        if seed is not None:
+            initial = _feasible_matching(seed, candidate_profiles, recruiter_profiles,
+                                         max_interviews_per_candidate, max_interviews_per_recruiter)
+            instrumentation.count("bipartite.initial_matches", len(initial))
+        elif algorithm == "phases":
+            initial = []
+        else:
+            # One left vertex per candidate and one right vertex per recruiter and slot;
+            # the members of a profile are interchangeable copies
+            keys = []  # right vertex -> (recruiter profile, slot)
+            slot_to_keys = defaultdict(list)
+            for r, slots in enumerate(recruiter_slots):
+                for slot in slots:
+                    for _ in range(recruiter_sizes[r]):
+                        slot_to_keys[slot].append(len(keys))
+                        keys.append((r, slot))
+            left = [c for c, size in enumerate(candidate_sizes) for _ in range(size)
+                    if max_interviews_per_candidate > 0]
+            adj = [[key for slot in candidate_slots[c] for key in slot_to_keys[slot]] for c in left]
+            match_right = _hopcroft_karp(adj, len(keys))
+            # Keep the matching feasible for the recruiter cap before topping it up
+            initial = []
+            recruiter_match_count = [0] * len(recruiter_profiles)
+            for key, i in enumerate(match_right):
+                r, slot = keys[key]
+                if i != -1 and recruiter_match_count[r] < max_interviews_per_recruiter * recruiter_sizes[r]:
+                    initial.append((left[i], r, slot))
+                    recruiter_match_count[r] += 1
+        assignments, finished = _b_matching(candidate_slots, candidate_sizes, recruiter_slots, recruiter_sizes,
+                                            max_interviews_per_candidate, max_interviews_per_recruiter,
+                                            initial, deadline)
+
+    return finish(assignments, finished)
+
+
+def _feasible_matching(seed, candidate_profiles, recruiter_profiles,
+                       max_interviews_per_candidate, max_interviews_per_recruiter):
+    """
+    Keeps the (candidate profile, recruiter profile, slot) interviews of seed that are
+    still feasible: both profiles free at the slot, no profile booked at a slot more
+    often than it has members, and both caps respected, first come first kept.
+
+    Returns:
+        The kept interviews, to start _b_matching from
+    """
+    matching = []
+    booked = defaultdict(int)  # (side, profile, slot) -> interviews
+    candidate_load = defaultdict(int)
+    recruiter_load = defaultdict(int)
+    for c, r, slot in seed:
+        c_slots, c_members = candidate_profiles[c]
+        r_slots, r_members = recruiter_profiles[r]
+        if (slot not in c_slots or slot not in r_slots or
+                booked[0, c, slot] >= len(c_members) or booked[1, r, slot] >= len(r_members) or
+                candidate_load[c] >= max_interviews_per_candidate * len(c_members) or
+                recruiter_load[r] >= max_interviews_per_recruiter * len(r_members)):
             continue
-        success = dfs(cand, set(), match)
-        if success:
-            candidate_match_count[cand] += 1
-
-    scheduled = []
-    for slot_key, cand in match.items():
-        rec, slot = slot_key_to_info[slot_key]
-        if recruiter_match_count[rec] < max_interviews_per_recruiter:
-            slot_str = slot.astimezone(resolve_timezone(recruiters[rec]["timezone"])).strftime("%Y-%m-%d %H:%M %Z")
-            scheduled.append([cand, rec, slot_str])
-            recruiter_match_count[rec] += 1
-
-    return sorted(scheduled, key=lambda x: x[2])
\ No newline at end of file
+        matching.append((c, r, slot))
+        booked[0, c, slot] += 1
+        booked[1, r, slot] += 1
+        candidate_load[c] += 1
+        recruiter_load[r] += 1
+    return matching
+
+
+def _b_matching(candidate_slots, candidate_sizes, recruiter_slots, recruiter_sizes,
+                max_interviews_per_candidate, max_interviews_per_recruiter, initial, deadline=None):
+    """
+    Maximum b-matching by capacity-aware augmenting paths, in phases.
+
+    Every booking runs candidate profile -> slot -> recruiter profile through one
+    vertex per slot, so the graph has an edge per (profile, slot) rather than one per
+    candidate-recruiter pair at each slot. A profile of k people takes k times the
+    per-person cap, and each of its slot edges carries up to k interviews, so the
+    members can be given distinct slots afterwards and nobody is booked twice at a
+    slot. Augmenting paths may move other candidates to another slot, and move a
+    recruiter who is at their cap off one slot and onto another.
+
+    Each phase layers the graph with one BFS from every candidate profile with spare
+    capacity, then an iterative DFS with a per-vertex arc pointer finds a blocking set
+    of shortest augmenting paths (Dinic's algorithm), so a phase costs O(V + E) plus
+    the paths found. Vertices and edges are integer indices into flat lists.
+
+    The first phase visits candidates in input order and their slots earliest first,
+    so it books what a greedy pass would; later phases only add interviews by
+    rearranging those. The candidates and recruiters booked at a slot are paired in
+    profile order.
+
+    Args:
+        candidate_slots, recruiter_slots: per profile, the slots shared with the other
+            side, earliest first
+        candidate_sizes, recruiter_sizes: per profile, the number of members
+        initial: a feasible starting matching as (candidate profile, recruiter
+            profile, slot), one per interview
+        deadline: perf_counter() value after which no new phase or search is started
+
+    Returns:
+        The matching as (candidate profile, recruiter profile, slot), one per interview,
+        and whether it is maximum (False if the deadline stopped it)
+    """
+    num_candidates = len(candidate_slots)
+    slot_ids = {}
+    for slots in recruiter_slots:
+        for slot in slots:
+            slot_ids.setdefault(slot, len(slot_ids))
+    slot_base = num_candidates
+    recruiter_base = slot_base + len(slot_ids)
+    num_nodes = recruiter_base + len(recruiter_slots)
+
+    # Vertices: candidate profiles, then slots, then recruiter profiles. heads[u][p] is
+    # the p-th neighbour of u and edges[u][p] the edge between them: edges below
+    # num_pairs join a candidate profile to a slot, the rest a slot to a recruiter
+    # profile. An arc is forward when it points to a later layer; it has residual
+    # capacity when its edge has room (forward) or carries flow (backward).
+    heads = [[] for _ in range(num_nodes)]
+    edges = [[] for _ in range(num_nodes)]
+    capacity = []
+    edge_owner = []  # profile vertex of each edge
+    edge_slot = []  # slot vertex of each edge
+    first_edge = []  # profile -> id of its first edge, for the initial matching
+    for side, base, profile_slots, sizes in ((0, 0, candidate_slots, candidate_sizes),
+                                             (1, recruiter_base, recruiter_slots, recruiter_sizes)):
+        if side == 1:
+            num_pairs = len(capacity)
+        for p, slots in enumerate(profile_slots):
+            if deadline is not None and perf_counter() >= deadline:
+                # No time to search: the starting matching is the best one found
+                get_instrumentation().count("bipartite.deadline_hits")
+                return list(initial), False
+            owner = base + p
+            first_edge.append(len(capacity))
+            for slot in slots:
+                u = slot_base + slot_ids[slot]
+                e = len(capacity)
+                heads[owner].append(u)
+                edges[owner].append(e)
+                heads[u].append(owner)
+                edges[u].append(e)
+                capacity.append(sizes[p])
+                edge_owner.append(owner)
+                edge_slot.append(u)
+
+    mc = max_interviews_per_candidate
+    mr = max_interviews_per_recruiter
+    cap = [mc * size for size in candidate_sizes] + [0] * len(slot_ids) + [mr * size for size in recruiter_sizes]
+    flow = [0] * len(capacity)
+    load = [0] * num_nodes  # interviews per profile
+    for c, r, slot in initial:
+        flow[first_edge[c] + bisect_left(candidate_slots[c], slot)] += 1
+        flow[first_edge[num_candidates + r] + bisect_left(recruiter_slots[r], slot)] += 1
+        load[c] += 1
+        load[recruiter_base + r] += 1
+
+    instrumentation = get_instrumentation()
+    phases = 0
+    augmentations = 0
+    finished = True
+    while mc > 0 and mr > 0:
+        if deadline is not None and perf_counter() >= deadline:
+            instrumentation.count("bipartite.deadline_hits")
+            finished = False
+            break
+
+        # BFS from every candidate profile with spare capacity, up to the nearest
+        # recruiter profiles with room
+        roots = [c for c in range(num_candidates) if load[c] < cap[c] and heads[c]]
+        level = [-1] * num_nodes
+        for c in roots:
+            level[c] = 0
+        queue = list(roots)
+        sink_level = -1
+        for u in queue:
+            next_level = level[u] + 1
+            if sink_level != -1 and next_level > sink_level:
+                break
+            for v, e in zip(heads[u], edges[u]):
+                if level[v] == -1 and (flow[e] < capacity[e] if v > u else flow[e]):
+                    level[v] = next_level
+                    queue.append(v)
+                    if v >= recruiter_base and load[v] < cap[v]:
+                        sink_level = next_level
+        if sink_level == -1:
+            break
+        phases += 1
+
+        # Blocking flow: iterative DFS along the layers, candidates in input order
+        pointer = [0] * num_nodes
+        for root in roots:
+            if deadline is not None and perf_counter() >= deadline:
+                break
+            while load[root] < cap[root] and level[root] == 0:
+                stack = [root]
+                path = []  # edge used to reach each vertex after the root
+                while stack:
+                    u = stack[-1]
+                    if u >= recruiter_base and load[u] < cap[u]:
+                        for k, e in enumerate(path):
+                            if stack[k + 1] > stack[k]:
+                                flow[e] += 1
+                            else:
+                                flow[e] -= 1
+                            # The arc may have room for another path
+                            pointer[stack[k]] -= 1
+                        load[root] += 1
+                        load[u] += 1
+                        augmentations += 1
+                        break
+                    p = pointer[u]
+                    if level[u] == sink_level or p == len(heads[u]):
+                        # Dead end: drop u from the layered graph for this phase
+                        level[u] = -1
+                        stack.pop()
+                        if path:
+                            path.pop()
+                        continue
+                    pointer[u] = p + 1
+                    v = heads[u][p]
+                    e = edges[u][p]
+                    if level[v] == level[u] + 1 and (flow[e] < capacity[e] if v > u else flow[e]):
+                        stack.append(v)
+                        path.append(e)
+                if not stack:
+                    break
+
+    instrumentation.count("bipartite.bfs_runs", phases)
+    instrumentation.count("bipartite.augmentations", augmentations)
+
+    # Pair the candidates and the recruiters booked at each slot
+    slots = list(slot_ids)
+    booked_candidates = defaultdict(deque)
+    for e in range(num_pairs):
+        booked_candidates[edge_slot[e]].extend([edge_owner[e]] * flow[e])
+    matching = []
+    for e in range(num_pairs, len(capacity)):
+        u = edge_slot[e]
+        for _ in range(flow[e]):
+            matching.append((booked_candidates[u].popleft(), edge_owner[e] - recruiter_base, slots[u - slot_base]))
+    return matching, finished
+
+
+def _hopcroft_karp(adj, num_right):
+    """
+    Hopcroft-Karp maximum matching on integer-indexed adjacency lists.
+
+    Args:
+        adj: list where adj[u] holds the right vertices adjacent to left vertex u
+        num_right: number of right vertices
+
+    Returns:
+        A list match_right where match_right[v] is the left vertex matched to v, or -1
+    """
+    num_left = len(adj)
+    match_left = [-1] * num_left
+    match_right = [-1] * num_right
+    phases = 0
+    augmentations = 0
+
+    while True:
+        # BFS from all free left vertices to build the layered graph
+        phases += 1
+        dist = [-1] * num_left
+        queue = deque()
+        for u in range(num_left):
+            if match_left[u] == -1:
+                dist[u] = 0
+                queue.append(u)
+
+        found = False
+        while queue:
+            u = queue.popleft()
+            for v in adj[u]:
+                w = match_right[v]
+                if w == -1:
+                    found = True
+                elif dist[w] == -1:
+                    dist[w] = dist[u] + 1
+                    queue.append(w)
+        if not found:
+            break
+
+        # Iterative DFS along the layers, with a per-vertex edge pointer
+        pointer = [0] * num_left
+        for root in range(num_left):
+            if match_left[root] != -1:
+                continue
+            stack = [root]
+            while stack:
+                u = stack[-1]
+                neighbors = adj[u]
+                if pointer[u] == len(neighbors):
+                    # Dead end: drop u from the layered graph for this phase
+                    dist[u] = -1
+                    stack.pop()
+                    continue
+                v = neighbors[pointer[u]]
+                pointer[u] += 1
+                w = match_right[v]
+                if w == -1:
+                    # Augment: every vertex on the stack takes the edge it last tried
+                    for x in stack:
+                        y = adj[x][pointer[x] - 1]
+                        match_left[x] = y
+                        match_right[y] = x
+                    augmentations += 1
+                    break
+                if dist[w] == dist[u] + 1:
+                    stack.append(w)
+
+    instrumentation = get_instrumentation()
+    instrumentation.count("bipartite.bfs_runs", phases)
+    instrumentation.count("bipartite.augmentations", augmentations)
+    return match_right
\ No newline at end of file
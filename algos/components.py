@@ -0,0 +1,136 @@
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter, time
+from algos.profiles import FORMAT_BUDGET_SHARE, PARSE_BUDGET_SHARE
+from utils.time_paraser import parse_multi_day_slot_minutes
+
+
+def split_components(
+    candidates: dict[str, dict],
+    recruiters: dict[str, dict],
+    slot_length_minutes: int,
+    deadline: float = None
+) -> list[tuple[dict[str, dict], dict[str, dict]]]:
+    """
+    Splits a scheduling instance into the connected components of its
+    candidate-recruiter-slot graph. Only slots where at least one candidate and one
+    recruiter are free connect people; anyone without such a slot can never be
+    scheduled and is left out.
+
+    Args:
+        candidates: dict mapping candidate name to {"availability": [...], "timezone": ...}
+        recruiters: dict mapping recruiter name to {"availability": [...], "timezone": ...}
+        slot_length_minutes: fixed duration of each interview slot
+        deadline: perf_counter() value at which to give up parsing
+
+    Returns:
+        A list of (candidates, recruiters) sub-instances, ordered by the first
+        candidate of each component in input order, with members in input order, or
+        None if the deadline passed first
+    """
+    people = [("c", cand) for cand in candidates] + [("r", rec) for rec in recruiters]
+    slots = []
+    for data in list(candidates.values()) + list(recruiters.values()):
+        if deadline is not None and perf_counter() >= deadline:
+            return None
+        slots.append(parse_multi_day_slot_minutes(data["availability"], slot_length_minutes, data["timezone"]))
+    num_candidates = len(candidates)
+    shared = set().union(*slots[:num_candidates]) & set().union(*slots[num_candidates:])
+
+    # Union-find over people, joined through the first person seen at each shared slot
+    parent = list(range(len(people)))
+
+    def find(x):
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+
+    first_at_slot = {}
+    for person, person_slots in enumerate(slots):
+        for slot in person_slots & shared:
+            other = first_at_slot.setdefault(slot, person)
+            root_a, root_b = find(person), find(other)
+            if root_a != root_b:
+                parent[max(root_a, root_b)] = min(root_a, root_b)
+
+    components = {}
+    for person, (side, name) in enumerate(people):
+        if not slots[person] & shared:
+            continue
+        sub_candidates, sub_recruiters = components.setdefault(find(person), ({}, {}))
+        if side == "c":
+            sub_candidates[name] = candidates[name]
+        else:
+            sub_recruiters[name] = recruiters[name]
+
+    return [components[root] for root in sorted(components)]
+
+
+def solve_components(
+    schedule_func,
+    candidates: dict[str, dict],
+    recruiters: dict[str, dict],
+    slot_length_minutes: int,
+    max_interviews_per_candidate: int,
+    max_interviews_per_recruiter: int,
+    max_workers: int = None,
+    time_budget_ms: float = None,
+    report: dict = None,
+    **options
+) -> list[list[str]]:
+    """
+    Solves each connected component independently in a process pool and merges
+    the results deterministically: component order, then each scheduler's own order.
+
+    Args:
+        schedule_func: module-level scheduler with the standard signature
+        candidates, recruiters, slot_length_minutes, max_interviews_per_candidate,
+        max_interviews_per_recruiter: the full instance, as for schedule_func
+        max_workers: pool size (None lets the executor pick one per CPU)
+        time_budget_ms: if set, one budget for the whole solve, splitting included:
+            each component gets only the time left when it starts, so components
+            queued behind others get less. If splitting takes more than
+            PARSE_BUDGET_SHARE of the budget, the instance is solved here as one
+            component with the time left.
+        report: if a dict is given, it receives "finished" (every component's solve
+            finished) and "upper_bound" (the sum of the components' bounds), from the
+            report each component's schedule_func fills in
+        options: extra keyword arguments for schedule_func (e.g. algorithm)
+
+    Returns:
+        A list of [candidate, recruiter, time_slot] assignments
+    """
+    # Merging the results and shutting the pool down take their share, like formatting
+    end = time() + time_budget_ms * (1 - FORMAT_BUDGET_SHARE) / 1000 if time_budget_ms is not None else None
+    split_deadline = perf_counter() + time_budget_ms * PARSE_BUDGET_SHARE / 1000 if end is not None else None
+    parts = split_components(candidates, recruiters, slot_length_minutes, split_deadline)
+    if parts is None:
+        parts = [(candidates, recruiters)]
+        max_workers = 1
+    args = [(schedule_func, end, report is not None,
+             (sub_candidates, sub_recruiters, slot_length_minutes,
+              max_interviews_per_candidate, max_interviews_per_recruiter), options)
+            for sub_candidates, sub_recruiters in parts]
+
+    if len(parts) <= 1 or max_workers == 1:
+        results = [_solve_component(*part_args) for part_args in args]
+    else:
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            futures = [pool.submit(_solve_component, *part_args) for part_args in args]
+            results = [future.result() for future in futures]
+
+    if report is not None:
+        report["finished"] = all(part_report["finished"] for _, part_report in results)
+        report["upper_bound"] = sum(part_report["upper_bound"] for _, part_report in results)
+    return [interview for result, _ in results for interview in result]
+
+
+def _solve_component(schedule_func, end, with_report, part_args, options):
+    # Runs in a worker: the budget is whatever is left of the whole solve's, by the
+    # wall clock, since perf_counter() values do not carry across processes
+    if end is not None:
+        options = dict(options, time_budget_ms=max(0.0, (end - time()) * 1000))
+    part_report = {} if with_report else None
+    if with_report:
+        options = dict(options, report=part_report)
+    return schedule_func(*part_args, **options), part_report
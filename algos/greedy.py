@@ -1,19 +1,29 @@
+import heapq
+from time import perf_counter
 from collections import defaultdict
-from datetime import datetime
-from zoneinfo import ZoneInfo
-import copy
-from statistics import variance
-from utils.time_paraser import parse_multi_day_slots
+from algos.components import solve_components
+from algos.profiles import group_profiles, expand_assignments, budget_deadline
+from algos.scheduler_state import SchedulerState
+from utils.instrumentation import get_instrumentation
+from utils.time_paraser import format_slot, parse_formatted_slot
 def greedy_schedule_interviews(
     candidates: dict[str, dict],
     recruiters: dict[str, dict],
     slot_length_minutes: int,
     max_interviews_per_candidate: int,
-    max_interviews_per_recruiter: int
+    max_interviews_per_recruiter: int,
+    max_workers: int = None,
+    dedupe_profiles: bool = False,
+    time_budget_ms: float = None,
+    store=None
 ) -> list[list[str]]:
     """
     Matches candidates and recruiters for interviews using a greedy algorithm
     that prioritizes earlier time slots.
+
+    Slots are walked in time order by a k-way merge of everyone's sorted slots, so
+    candidate-recruiter pairs are only looked at when their slot comes up, and the
+    walk stops as soon as every candidate or every recruiter is at capacity.
     
     Args:
         candidates: dict mapping candidate name to {"availability": [...], "timezone": ...}
@@ -21,86 +31,166 @@ def greedy_schedule_interviews(
         slot_length_minutes: fixed duration of each interview slot
         max_interviews_per_candidate: maximum interviews allowed per candidate
         max_interviews_per_recruiter: maximum interviews allowed per recruiter
+        max_workers: if set, solve each connected component in a process pool of this size
+        dedupe_profiles: collapse people with identical availability into one node with
+            aggregated capacity, and expand the assignments back to individuals afterwards
+        time_budget_ms: if set, stop walking slots once this many milliseconds have passed,
+            less a share kept for formatting, and return the interviews booked so far
+            (parsing is not interrupted; with max_workers the budget covers the whole solve)
+        store: if set (e.g. a SQLiteScheduleStore), the schedule replaces its bookings
+            in one batched transaction
         
     Returns:
         A list of [candidate, recruiter, time_slot] assignments
     """
-    # Parse candidate availability into sets of datetime slots
-    candidate_slots = {
-        cand: parse_multi_day_slots(data["availability"], slot_length_minutes, data["timezone"])
-        for cand, data in candidates.items()
-    }
+    if max_workers is not None:
+        scheduled = solve_components(greedy_schedule_interviews, candidates, recruiters, slot_length_minutes,
+                                     max_interviews_per_candidate, max_interviews_per_recruiter, max_workers,
+                                     dedupe_profiles=dedupe_profiles, time_budget_ms=time_budget_ms)
+        if store is not None:
+            # Components return formatted times; recover the slots for the store
+            _save_schedule(store, [(cand, rec, parse_formatted_slot(time_str, candidates[cand]["timezone"]), time_str)
+                                   for cand, rec, time_str in scheduled])
+        return scheduled
 
-    # Parse recruiter availability into sets of datetime slots
-    recruiter_slots = {
-        rec: parse_multi_day_slots(data["availability"], slot_length_minutes, data["timezone"])
-        for rec, data in recruiters.items()
-    }
+    deadline = budget_deadline(time_budget_ms)
+    instrumentation = get_instrumentation()
 
-    # Create UTC version for each time slot and maintain mapping between original time slot and UTC time slot
-    candidate_slots_utc = {}
-    utc_to_original_map = {}
-   
-    for cand, slots in candidate_slots.items():
-       candidate_slots_utc[cand] = set()
-       for slot in slots:
-           # Convert to UTC time
-           slot_utc = slot.astimezone(ZoneInfo("UTC"))
-           candidate_slots_utc[cand].add(slot_utc)
-           # Record mapping from UTC -> original time
-           utc_to_original_map[(cand, slot_utc)] = slot
-   
-   # Similarly process the recruiter's time slots
-    recruiter_slots_utc = {}
-    for rec, slots in recruiter_slots.items():
-       recruiter_slots_utc[rec] = set()
-       for slot in slots:
-           slot_utc = slot.astimezone(ZoneInfo("UTC"))
-           recruiter_slots_utc[rec].add(slot_utc)
-
-    # Build candidate-recruiter-slot match list (only where slots overlap)
-    # edges = []
-    # for cand, c_slots in candidate_slots.items():
-    #     for rec, r_slots in recruiter_slots.items():
-    #         for slot in c_slots & r_slots:  # Intersection of available times
-    #             edges.append((cand, rec, slot))
-
-     # Connect candidates to recruiters in UTC timezone
-    edges = []
-    for cand, c_slots_utc in candidate_slots_utc.items():
-       for rec, r_slots_utc in recruiter_slots_utc.items():
-           # Find commonly available times in UTC
-           common_slots_utc = c_slots_utc & r_slots_utc
-           
-           for slot_utc in common_slots_utc:
-               # Use candidate's original timezone time as the result
-               original_slot = utc_to_original_map[(cand, slot_utc)]
-               edges.append((cand, rec, original_slot))
-
-    # Schedule interviews using first-come-first-serve on sorted slots
-    scheduled = []
-    candidate_counts = defaultdict(int)
-    recruiter_counts = defaultdict(int)
-    used_slots = set()  # Track which slots are already used by whom
-
-    # Sort by time slot (earliest first) for greedy scheduling
-    for cand, rec, slot in sorted(edges, key=lambda x: x[2]):
-        if (
-            candidate_counts[cand] < max_interviews_per_candidate and
-            recruiter_counts[rec] < max_interviews_per_recruiter and
-            (cand, slot) not in used_slots and
-            (rec, slot) not in used_slots
-        ):
-            # Schedule the interview
-            scheduled.append([cand, rec, slot.strftime("%Y-%m-%d %H:%M %Z")])
-            candidate_counts[cand] += 1
-            recruiter_counts[rec] += 1
-            used_slots.add((cand, slot))
-            used_slots.add((rec, slot))
+    # Parse availability into profiles of integer slots (UTC minutes)
+    with instrumentation.span("greedy.parse"):
+        candidate_profiles = group_profiles(candidates, slot_length_minutes, dedupe_profiles)
+        recruiter_profiles = group_profiles(recruiters, slot_length_minutes, dedupe_profiles)
+
+    assignments = greedy_assignments(candidate_profiles, recruiter_profiles, max_interviews_per_candidate,
+                                     max_interviews_per_recruiter, deadline)
+
+    with instrumentation.span("greedy.format"):
+        # Schedule the interviews, shown in the candidate's time zone
+        rows = [(cand, rec, slot, format_slot(slot, candidates[cand]["timezone"]))
+                for cand, rec, slot in expand_assignments(assignments, candidate_profiles, recruiter_profiles)]
+        scheduled = [[cand, rec, time_str] for cand, rec, _, time_str in rows]
+
+    if store is not None:
+        _save_schedule(store, rows)
 
     return scheduled
 
 
+def _save_schedule(store, rows):
+    """Replace the store's bookings with (candidate, recruiter, slot, formatted time) rows"""
+    with get_instrumentation().span("greedy.store"), store.transaction():
+        store.clear()
+        store.add_many(rows)
+
+
+def greedy_assignments(
+    candidate_profiles: list[tuple[frozenset, list[str]]],
+    recruiter_profiles: list[tuple[frozenset, list[str]]],
+    max_interviews_per_candidate: int,
+    max_interviews_per_recruiter: int,
+    deadline: float = None
+) -> list[tuple[int, int, int]]:
+    """
+    The greedy schedule at profile level, for schedulers that start from it.
+
+    Args:
+        candidate_profiles, recruiter_profiles: as returned by group_profiles
+        deadline: perf_counter() value at which to stop and keep what is booked
+
+    Returns:
+        A list of (candidate profile index, recruiter profile index, slot), one per
+        interview, earliest slot first
+    """
+    instrumentation = get_instrumentation()
+
+    with instrumentation.span("greedy.build_graph"):
+        # Each profile's slots, earliest first, for the k-way merge
+        candidate_slots = []
+        recruiter_slots = []
+        for profiles, profile_slots in ((candidate_profiles, candidate_slots), (recruiter_profiles, recruiter_slots)):
+            for slots, _ in profiles:
+                if deadline is not None and perf_counter() >= deadline:
+                    instrumentation.count("greedy.deadline_hits")
+                    return []
+                profile_slots.append(sorted(slots))
+
+    with instrumentation.span("greedy.solve"):
+        # A profile shared by k people can take k interviews per slot and k times the per-person cap
+        candidate_sizes = [len(members) for _, members in candidate_profiles]
+        recruiter_sizes = [len(members) for _, members in recruiter_profiles]
+        candidate_left = [size * max_interviews_per_candidate for size in candidate_sizes]
+        recruiter_left = [size * max_interviews_per_recruiter for size in recruiter_sizes]
+        open_candidates = sum(1 for left in candidate_left if left > 0)
+        open_recruiters = sum(1 for left in recruiter_left if left > 0)
+
+        # Schedule interviews first-come-first-serve, one slot at a time
+        assignments = []
+        pairs = 0
+        candidate_events = _slot_groups(candidate_slots, candidate_left)
+        recruiter_events = _slot_groups(recruiter_slots, recruiter_left)
+        candidate_event = next(candidate_events, None)
+        recruiter_event = next(recruiter_events, None)
+        while candidate_event and recruiter_event and open_candidates and open_recruiters:
+            if deadline is not None and perf_counter() >= deadline:
+                instrumentation.count("greedy.deadline_hits")
+                break
+            if candidate_event[0] < recruiter_event[0]:
+                candidate_event = next(candidate_events, None)
+                continue
+            if recruiter_event[0] < candidate_event[0]:
+                recruiter_event = next(recruiter_events, None)
+                continue
+
+            slot, group = candidate_event
+            recruiter_group = recruiter_event[1]
+            recruiter_free = [recruiter_sizes[r] for r in recruiter_group]  # people not busy in this slot
+            for c in group:
+                if deadline is not None and perf_counter() >= deadline:
+                    # A busy slot can take a while; the check at the top of the loop stops the walk
+                    break
+                candidate_free = candidate_sizes[c]
+                for j, r in enumerate(recruiter_group):
+                    if not candidate_left[c] or not candidate_free:
+                        break
+                    pairs += 1
+                    count = min(candidate_left[c], recruiter_left[r], candidate_free, recruiter_free[j])
+                    if count > 0:
+                        assignments.extend([(c, r, slot)] * count)
+                        candidate_left[c] -= count
+                        recruiter_left[r] -= count
+                        candidate_free -= count
+                        recruiter_free[j] -= count
+                        if not recruiter_left[r]:
+                            open_recruiters -= 1
+                if not candidate_left[c]:
+                    open_candidates -= 1
+
+            candidate_event = next(candidate_events, None)
+            recruiter_event = next(recruiter_events, None)
+        instrumentation.count("greedy.edges", pairs)
+
+    return assignments
+
+
+def _slot_groups(profile_slots, left):
+    """
+    Yields (slot, profiles available in it) in time order, by a k-way merge of the
+    per-profile sorted slot lists. Profiles with no capacity left (left[i] == 0 when
+    the merge resumes) drop out of it.
+    """
+    heap = [(slots[0], i, 0) for i, slots in enumerate(profile_slots) if slots and left[i] > 0]
+    heapq.heapify(heap)
+    while heap:
+        slot = heap[0][0]
+        popped = []
+        while heap and heap[0][0] == slot:
+            popped.append(heapq.heappop(heap))
+        yield slot, [i for _, i, _ in popped]
+        for _, i, pos in popped:
+            if pos + 1 < len(profile_slots[i]) and left[i] > 0:
+                heapq.heappush(heap, (profile_slots[i][pos + 1], i, pos + 1))
+
+
 def handle_real_time_adjustment(
     scheduled: list[list[str]],
     candidate_to_adjust: str = None,
@@ -111,10 +201,24 @@ def handle_real_time_adjustment(
     recruiters: dict[str, dict] = None,
     slot_length_minutes: int = 30,
     max_interviews_per_candidate: int = 2,
-    max_interviews_per_recruiter: int = 2
+    max_interviews_per_recruiter: int = 2,
+    store=None
 ) -> list[list[str]]:
     """
     Handle real-time adjustments to the interview schedule.
+
+    This is a one-shot wrapper around SchedulerState: every call re-parses every
+    participant's availability and re-indexes the given schedule before applying a
+    single delta operation, so one call costs as much as the whole instance. Only
+    the operation itself is incremental. Callers that apply many adjustments should
+    keep a SchedulerState instead and call cancel/add/reschedule on it directly, so
+    nothing is rebuilt between adjustments.
+
+    With a store (e.g. a SQLiteScheduleStore shared by worker processes), the
+    bookings are read from and written to the store instead of scheduled, and the
+    adjustment runs as one transaction. Availability is parsed before the transaction
+    starts, so other processes are only locked out while bookings are checked and
+    written; bookings that no longer fit the given availability are left as they are.
     
     Args:
         scheduled: Current schedule of interviews
@@ -127,109 +231,53 @@ def handle_real_time_adjustment(
         slot_length_minutes: Duration of each interview slot
         max_interviews_per_candidate: Maximum interviews per candidate
         max_interviews_per_recruiter: Maximum interviews per recruiter
+        store: Booking store to adjust in place (scheduled is then ignored)
         
     Returns:
         Updated schedule
     """
-    # Make a copy of the schedule to avoid modifying the original
-    updated_schedule = copy.deepcopy(scheduled)
-    
-    # Helper function to check if an interview matches the adjustment criteria
-    def matches_criteria(interview):
-        matches = True
-        if candidate_to_adjust and interview[0] != candidate_to_adjust:
-            matches = False
-        if recruiter_to_adjust and interview[1] != recruiter_to_adjust:
-            matches = False
-        if time_slot_to_adjust and time_slot_to_adjust not in interview[2]:
-            matches = False
-        return matches
-    
-    if action == "cancel":
-        # Remove interviews that match the criteria
-        updated_schedule = [interview for interview in updated_schedule 
-                           if not matches_criteria(interview)]
-    
-    elif action == "add" and candidates and recruiters:
-        # Create subset of candidates and recruiters for targeted scheduling
-        subset_candidates = {}
-        subset_recruiters = {}
-        
-        if candidate_to_adjust:
-            subset_candidates = {candidate_to_adjust: candidates[candidate_to_adjust]}
-        else:
-            subset_candidates = candidates
-            
-        if recruiter_to_adjust:
-            subset_recruiters = {recruiter_to_adjust: recruiters[recruiter_to_adjust]}
-        else:
-            subset_recruiters = recruiters
-        
-        # Get existing bookings to avoid conflicts
-        existing_bookings = set()
-        for interview in updated_schedule:
-            cand, rec, time = interview
-            # Parse time string back to datetime for comparison
-            dt_format = "%Y-%m-%d %H:%M %Z"
-            slot_dt = datetime.strptime(time, dt_format)
-            existing_bookings.add((cand, slot_dt))
-            existing_bookings.add((rec, slot_dt))
-        
-        # Try to schedule new interviews
-        new_interviews = greedy_schedule_interviews(
-            subset_candidates,
-            subset_recruiters,
+    if store is None:
+        state = SchedulerState.from_schedule(
+            scheduled,
+            candidates or {},
+            recruiters or {},
             slot_length_minutes,
             max_interviews_per_candidate,
             max_interviews_per_recruiter
         )
-        
-        # Only add non-conflicting interviews
-        for new_interview in new_interviews:
-            cand, rec, time = new_interview
-            dt_format = "%Y-%m-%d %H:%M %Z"
-            slot_dt = datetime.strptime(time, dt_format)
-            
-            # Check if this would create a conflict
-            if (cand, slot_dt) not in existing_bookings and (rec, slot_dt) not in existing_bookings:
-                updated_schedule.append(new_interview)
-                existing_bookings.add((cand, slot_dt))
-                existing_bookings.add((rec, slot_dt))
+        return _apply_adjustment(state, candidate_to_adjust, recruiter_to_adjust, time_slot_to_adjust,
+                                 action, candidates, recruiters)
+
+    # Parse and index availability before taking the write lock, which then only
+    # covers the conflict checks and writes
+    state = SchedulerState(
+        candidates or {},
+        recruiters or {},
+        slot_length_minutes,
+        max_interviews_per_candidate,
+        max_interviews_per_recruiter,
+        store
+    )
+    with store.transaction():
+        return _apply_adjustment(state, candidate_to_adjust, recruiter_to_adjust, time_slot_to_adjust,
+                                 action, candidates, recruiters)
+
+
+def _apply_adjustment(state, candidate_to_adjust, recruiter_to_adjust, time_slot_to_adjust,
+                      action, candidates, recruiters):
+    if action == "cancel":
+        # Remove interviews that match the criteria
+        state.cancel(candidate_to_adjust, recruiter_to_adjust, time_slot_to_adjust)
+    
+    elif action == "add" and candidates and recruiters:
+        # Book new, non-conflicting interviews for the affected people
+        state.add(candidate_to_adjust, recruiter_to_adjust)
     
     elif action == "reschedule" and candidates and recruiters:
-        # First cancel the matching interviews
-        temp_schedule = [interview for interview in updated_schedule 
-                         if not matches_criteria(interview)]
-        
-        # Then try to add new interviews for the affected people
-        subset_candidates = {}
-        subset_recruiters = {}
-        
-        if candidate_to_adjust:
-            subset_candidates = {candidate_to_adjust: candidates[candidate_to_adjust]}
-        if recruiter_to_adjust:
-            subset_recruiters = {recruiter_to_adjust: recruiters[recruiter_to_adjust]}
-            
-        # If we have both candidates and recruiters to reschedule
-        if subset_candidates and subset_recruiters:
-            # Use the existing function for adding
-            return handle_real_time_adjustment(
-                temp_schedule,
-                candidate_to_adjust,
-                recruiter_to_adjust,
-                None,  # Don't filter by time slot for rescheduling
-                "add",
-                candidates,
-                recruiters,
-                slot_length_minutes,
-                max_interviews_per_candidate,
-                max_interviews_per_recruiter
-            )
-        else:
-            # If we're only rescheduling one side, just return the cancelled schedule
-            return temp_schedule
+        # Cancel the matching interviews, then rebook the affected people
+        state.reschedule(candidate_to_adjust, recruiter_to_adjust, time_slot_to_adjust)
     
-    return updated_schedule
+    return state.to_schedule()
 
 
 def optimize_fairness(
@@ -237,7 +285,9 @@ def optimize_fairness(
     candidates: dict[str, dict],
     recruiters: dict[str, dict],
     slot_length_minutes: int,
-    fairness_objective: str = "balanced"
+    fairness_objective: str = "balanced",
+    max_interviews_per_candidate: int = None,
+    max_interviews_per_recruiter: int = None
 ) -> list[list[str]]:
     """
     Optimize the interview schedule based on different fairness objectives.
@@ -248,6 +298,9 @@ def optimize_fairness(
         recruiters: Dictionary of recruiter availability
         slot_length_minutes: Duration of each interview slot
         fairness_objective: "balanced", "max_total", or "min_variance"
+        max_interviews_per_candidate: cap used by "min_variance" (default: the most
+            interviews any candidate has in the current schedule)
+        max_interviews_per_recruiter: cap used by "min_variance" (default: likewise)
         
     Returns:
         Optimized schedule
@@ -290,40 +343,23 @@ def optimize_fairness(
         return scheduled
     
     elif fairness_objective == "min_variance":
-        # Calculate current variance in interview distribution
-        if candidate_count:
-            candidate_interview_counts = list(candidate_count.values())
-            if len(candidate_interview_counts) > 1:
-                cand_variance = variance(candidate_interview_counts)
-            else:
-                cand_variance = 0
-        else:
-            cand_variance = 0
-            
-        if recruiter_count:
-            recruiter_interview_counts = list(recruiter_count.values())
-            if len(recruiter_interview_counts) > 1:
-                rec_variance = variance(recruiter_interview_counts)
-            else:
-                rec_variance = 0
-        else:
-            rec_variance = 0
-            
-        # If variance is already 0, nothing to optimize
-        if cand_variance == 0 and rec_variance == 0:
-            return scheduled
-            
-        # Otherwise, try to redistribute some interviews
-        # This is a complex optimization problem, so here's a simple approach:
-        # Find participants with most and fewest interviews and try to adjust
-        
-        # This would be more complex to implement fully, but would involve:
-        # 1. Identifying overscheduled and underscheduled participants
-        # 2. Searching for alternative time slots to reduce variance
-        # 3. Making adjustments that reduce overall variance
-        
-        # For simplicity, we'll just return the current schedule
-        # A real implementation would need more sophisticated optimization
+        # One min-cost-flow solve: a maximum schedule with the smallest sum of squared
+        # interview counts over candidates and recruiters together. The current
+        # schedule respects the caps, so the result never has fewer interviews than it.
+        # Imported here so that greedy does not depend on the flow module.
+        from algos.networkflow import min_cost_schedule_interviews
+        if max_interviews_per_candidate is None:
+            max_interviews_per_candidate = max(candidate_count.values(), default=1)
+        if max_interviews_per_recruiter is None:
+            max_interviews_per_recruiter = max(recruiter_count.values(), default=1)
+        return min_cost_schedule_interviews(
+            candidates,
+            recruiters,
+            slot_length_minutes,
+            max_interviews_per_candidate,
+            max_interviews_per_recruiter,
+            objective="min_variance"
+        )
         
     return scheduled
 
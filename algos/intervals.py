@@ -0,0 +1,244 @@
+import heapq
+from utils.instrumentation import get_instrumentation
+from utils.time_paraser import format_slot, parse_availability_intervals
+
+
+def interval_schedule_interviews(
+    candidates: dict[str, dict],
+    recruiters: dict[str, dict],
+    slot_length_minutes: int,
+    max_interviews_per_candidate: int,
+    max_interviews_per_recruiter: int,
+    start_granularity_minutes: int = None
+) -> list[list[str]]:
+    """
+    Matches candidates and recruiters for interviews without discretizing availability.
+
+    Availability stays as merged UTC intervals per person. A sweep line over interval
+    starts finds each candidate-recruiter overlap window when it opens, and interviews
+    are placed greedily, earliest start first, inside those windows. The start-time
+    grid is only applied at placement, so fine alignment over a long horizon costs no
+    more memory than coarse alignment.
+
+    Unlike the slot-based schedulers, start times do not follow each person's own
+    range starts: every interview starts on a multiple of start_granularity_minutes
+    (UTC), and a person's interviews never overlap in time.
+
+    Args:
+        candidates: dict mapping candidate name to {"availability": [...], "timezone": ...}
+        recruiters: dict mapping recruiter name to {"availability": [...], "timezone": ...}
+        slot_length_minutes: fixed duration of each interview
+        max_interviews_per_candidate: maximum interviews allowed per candidate
+        max_interviews_per_recruiter: maximum interviews allowed per recruiter
+        start_granularity_minutes: grid for interview start times (default: slot_length_minutes)
+
+    Returns:
+        A list of [candidate, recruiter, time_slot] assignments, earliest first
+    """
+    grid = start_granularity_minutes or slot_length_minutes
+    instrumentation = get_instrumentation()
+
+    with instrumentation.span("intervals.parse"):
+        candidate_names = list(candidates)
+        recruiter_names = list(recruiters)
+        candidate_intervals = [parse_availability_intervals(candidates[c]["availability"], candidates[c]["timezone"])
+                               for c in candidate_names]
+        recruiter_intervals = [parse_availability_intervals(recruiters[r]["availability"], recruiters[r]["timezone"])
+                               for r in recruiter_names]
+
+    with instrumentation.span("intervals.solve"):
+        events = _interval_events(candidate_intervals, recruiter_intervals)
+        assignments = _place_interviews(events, len(candidate_names), len(recruiter_names), slot_length_minutes,
+                                        max_interviews_per_candidate, max_interviews_per_recruiter, grid)
+
+    with instrumentation.span("intervals.format"):
+        # Schedule the interviews, shown in the candidate's time zone
+        scheduled = []
+        for c, r, start in assignments:
+            cand = candidate_names[c]
+            scheduled.append([cand, recruiter_names[r], format_slot(start, candidates[cand]["timezone"])])
+
+    return scheduled
+
+
+def schedule_dataset(
+    dataset,
+    slot_length_minutes: int,
+    max_interviews_per_candidate: int,
+    max_interviews_per_recruiter: int,
+    start_granularity_minutes: int = None
+) -> list[tuple[int, int, int]]:
+    """
+    Runs the interval scheduler directly on a ColumnarDataset (utils.columnar).
+
+    The interval table is already sorted by start, so the sweep streams it from the
+    memory-mapped columns; only overlap windows and bookings become Python objects,
+    not the rows themselves.
+
+    Returns:
+        (candidate id, recruiter participant id, start) rows, earliest first, ready
+        for utils.columnar.write_assignments
+    """
+    grid = start_granularity_minutes or slot_length_minutes
+    num_candidates = dataset.num_candidates
+
+    def events():
+        for participant, start, end in zip(dataset.interval_participant, dataset.interval_start,
+                                           dataset.interval_end):
+            if participant < num_candidates:
+                yield start, 0, participant, end
+            else:
+                yield start, 1, participant - num_candidates, end
+
+    with get_instrumentation().span("intervals.solve"):
+        assignments = _place_interviews(events(), num_candidates, dataset.num_recruiters, slot_length_minutes,
+                                        max_interviews_per_candidate, max_interviews_per_recruiter, grid)
+    return [(c, num_candidates + r, start) for c, r, start in assignments]
+
+
+def _align(minute, grid):
+    """Round a UTC minute up to the start-time grid"""
+    return -(-minute // grid) * grid
+
+
+def _interval_events(candidate_intervals, recruiter_intervals):
+    """
+    All intervals as (start, side, person, end) sweep events, side 0 for candidates
+    and 1 for recruiters, sorted by start.
+    """
+    events = []
+    for side, intervals in ((0, candidate_intervals), (1, recruiter_intervals)):
+        for person, person_intervals in enumerate(intervals):
+            for start, end in person_intervals:
+                events.append((start, side, person, end))
+    events.sort()
+    return events
+
+
+def _place_interviews(events, num_candidates, num_recruiters, slot_length_minutes,
+                      max_interviews_per_candidate, max_interviews_per_recruiter, grid):
+    """
+    Greedy placement, earliest start first, inside the overlap windows found by the sweep.
+
+    Returns:
+        (candidate, recruiter, start) per interview, in start order
+    """
+    candidate_left = [max_interviews_per_candidate] * num_candidates
+    recruiter_left = [max_interviews_per_recruiter] * num_recruiters
+    candidate_free_at = [None] * num_candidates  # end of the latest interview
+    recruiter_free_at = [None] * num_recruiters
+    open_candidates = num_candidates if max_interviews_per_candidate > 0 else 0
+    open_recruiters = num_recruiters if max_interviews_per_recruiter > 0 else 0
+
+    windows = _overlap_windows(events, candidate_left, recruiter_left, slot_length_minutes)
+    pending = []  # (earliest start, candidate, recruiter, window end)
+    next_window = next(windows, None)
+    num_windows = 0
+    assignments = []
+    while (pending or next_window) and open_candidates and open_recruiters:
+        # Windows open in time order, so only those opening before the earliest
+        # pending start can compete with it
+        if next_window and (not pending or next_window[0] <= pending[0][0]):
+            num_windows += 1
+            window_start, window_end, c, r = next_window
+            heapq.heappush(pending, (_align(window_start, grid), c, r, window_end))
+            next_window = next(windows, None)
+            continue
+
+        start, c, r, window_end = heapq.heappop(pending)
+        if not candidate_left[c] or not recruiter_left[r]:
+            continue
+        # Bookings happen in start order, so only each person's latest interview can clash
+        earliest = start
+        if candidate_free_at[c] is not None:
+            earliest = max(earliest, candidate_free_at[c])
+        if recruiter_free_at[r] is not None:
+            earliest = max(earliest, recruiter_free_at[r])
+        earliest = _align(earliest, grid)
+        if earliest + slot_length_minutes > window_end:
+            continue
+        if earliest > start:
+            heapq.heappush(pending, (earliest, c, r, window_end))
+            continue
+
+        assignments.append((c, r, start))
+        candidate_free_at[c] = recruiter_free_at[r] = start + slot_length_minutes
+        candidate_left[c] -= 1
+        recruiter_left[r] -= 1
+        if not candidate_left[c]:
+            open_candidates -= 1
+        if not recruiter_left[r]:
+            open_recruiters -= 1
+        # The pair may meet again later in the same window
+        heapq.heappush(pending, (_align(start + slot_length_minutes, grid), c, r, window_end))
+    get_instrumentation().count("intervals.windows", num_windows)
+    return assignments
+
+
+def _overlap_windows(events, candidate_left, recruiter_left, min_length):
+    """
+    Sweep line over interval starts (events from _interval_events, or any iterable
+    of them sorted by start) and ends, yielding (start, end, candidate, recruiter)
+    for every overlap of at least min_length, in order of start.
+
+    A window is reported by the later of its two intervals to start, against the
+    intervals of the other side that are open at that moment. People at capacity
+    (left[i] == 0 when the sweep reaches an interval) are skipped.
+    """
+    open_ends = ({}, {})  # side -> {person: end of the open interval}, in arrival order
+    closing = []  # (end, side, person)
+    lefts = (candidate_left, recruiter_left)
+    for start, side, person, end in events:
+        # Intervals are half-open, so those ending at start are already closed
+        while closing and closing[0][0] <= start:
+            closed_end, closed_side, closed_person = heapq.heappop(closing)
+            if open_ends[closed_side].get(closed_person) == closed_end:
+                del open_ends[closed_side][closed_person]
+        if not lefts[side][person]:
+            continue
+
+        other = 1 - side
+        for other_person, other_end in list(open_ends[other].items()):
+            if not lefts[other][other_person]:
+                del open_ends[other][other_person]
+                continue
+            window_end = min(end, other_end)
+            if window_end - start >= min_length:
+                if side == 0:
+                    yield start, window_end, person, other_person
+                else:
+                    yield start, window_end, other_person, person
+
+        open_ends[side][person] = end
+        heapq.heappush(closing, (end, side, person))
+
+
+# Example usage
+if __name__ == "__main__":
+    candidates = {
+        "Alice": {
+            "availability": ["2025-04-01 09:00-10:00", "2025-04-01 13:10-14:00"],
+            "timezone": "EST"
+        },
+        "Bob": {
+            "availability": ["2025-04-01 09:20-10:30"],
+            "timezone": "EST"
+        }
+    }
+
+    recruiters = {
+        "R1": {
+            "availability": ["2025-04-01 09:00-10:00"],
+            "timezone": "EST"
+        },
+        "R2": {
+            "availability": ["2025-04-01 13:00-14:00", "2025-04-01 09:30-10:30"],
+            "timezone": "EST"
+        }
+    }
+
+    schedule = interval_schedule_interviews(candidates, recruiters, slot_length_minutes=30,
+                                            max_interviews_per_candidate=2, max_interviews_per_recruiter=2,
+                                            start_granularity_minutes=15)
+    for interview in schedule:
+        print(f"Candidate: {interview[0]}, Recruiter: {interview[1]}, Time: {interview[2]}")
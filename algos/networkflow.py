@@ -1,6 +1,12 @@
 from collections import defaultdict, deque
-from zoneinfo import ZoneInfo
-from utils.time_paraser import parse_multi_day_slots
+from heapq import heappush, heappop
+from time import perf_counter
+from algos.components import solve_components
+from algos.greedy import greedy_assignments
+from algos.profiles import (group_profiles, expand_assignments, resolve_schedule, budget_deadline,
+                            degree_upper_bound, parse_profiles)
+from utils.instrumentation import get_instrumentation
+from utils.time_paraser import format_slot
 
 # ---------------------- NETWORK FLOW IMPLEMENTATION ----------------------
 
@@ -12,6 +18,7 @@ class MaxFlow:
        """
        self.graph = defaultdict(dict)
        self.nodes = nodes
+       self.finished = False  # set by the solver: the flow is maximum
 
    def add_edge(self, u, v, capacity):
        """
@@ -20,6 +27,29 @@ class MaxFlow:
        self.graph[u][v] = capacity
        # Reverse edge with 0 capacity (for residual graph)
        self.graph[v][u] = 0 
+       return (u, v)
+
+   def flow(self, edge):
+       """
+       Return the flow on an edge, given the handle returned by add_edge.
+       """
+       u, v = edge
+       return self.graph[v][u]
+
+   def residual(self, edge):
+       """
+       Return the remaining capacity of an edge, given the handle returned by add_edge.
+       """
+       u, v = edge
+       return self.graph[u][v]
+
+   def push(self, edge, amount):
+       """
+       Send amount units of flow along an edge, e.g. to start from a known flow.
+       """
+       u, v = edge
+       self.graph[u][v] -= amount
+       self.graph[v][u] += amount
 
    def bfs(self, source, sink, parent):
        """
@@ -40,14 +70,20 @@ class MaxFlow:
                        return True
        return False
 
-   def ford_fulkerson(self, source, sink):
+   def ford_fulkerson(self, source, sink, deadline=None):
        """
        Find the maximum flow from source to sink using Ford-Fulkerson Algorithm.
+       With a deadline (a perf_counter() value), stop augmenting once it has passed;
+       the network then holds a valid, possibly smaller flow, and finished stays False.
        """
        parent = {}
        max_flow = 0
+       bfs_runs = 1
+       augmentations = 0
+       instrumentation = get_instrumentation()
 
        while self.bfs(source, sink, parent):
+           augmentations += 1
            path_flow = float("Inf")
            v = sink
 
@@ -66,15 +102,406 @@ class MaxFlow:
                v = u
 
            max_flow += path_flow
+           if deadline is not None and perf_counter() >= deadline:
+               instrumentation.count("maxflow.deadline_hits")
+               break
+           bfs_runs += 1  # the search about to run in the loop condition
+       else:
+           self.finished = True
 
+       instrumentation.count("maxflow.bfs_runs", bfs_runs)
+       instrumentation.count("maxflow.augmentations", augmentations)
        return max_flow
 
+class FlowNetwork:
+   def __init__(self, num_nodes):
+       """
+       Initialize a flow network stored as flat edge arrays with a CSR index.
+       Nodes are the integers 0..num_nodes-1. Edge e and its reverse edge e ^ 1
+       are stored next to each other, so residual updates need no lookups.
+       """
+       self.num_nodes = num_nodes
+       self.edge_to = []    # head node of each edge
+       self.edge_cap = []   # residual capacity of each edge
+       self.adj_start = []  # CSR offsets: edges leaving u are adj_edges[adj_start[u]:adj_start[u + 1]]
+       self.adj_edges = []
+       self.finished = False  # set by the solver: the flow is maximum
+
+   def add_edge(self, u, v, capacity):
+       """
+       Add an edge with capacity to the network. Returns the edge id.
+       """
+       edge = len(self.edge_to)
+       self.edge_to.append(v)
+       self.edge_cap.append(capacity)
+       # Reverse edge with 0 capacity (for residual graph)
+       self.edge_to.append(u)
+       self.edge_cap.append(0)
+       return edge
+
+   def flow(self, edge):
+       """
+       Return the flow on an edge, given the id returned by add_edge.
+       """
+       return self.edge_cap[edge ^ 1]
+
+   def residual(self, edge):
+       """
+       Return the remaining capacity of an edge, given the id returned by add_edge.
+       """
+       return self.edge_cap[edge]
+
+   def push(self, edge, amount):
+       """
+       Send amount units of flow along an edge, e.g. to start from a known flow.
+       """
+       self.edge_cap[edge] -= amount
+       self.edge_cap[edge ^ 1] += amount
+
+   def build(self):
+       """
+       Group edge ids by tail node (counting sort) into the CSR index.
+       Does nothing if no edge was added since the last build.
+       """
+       if self.adj_start and len(self.adj_edges) == len(self.edge_to):
+           return
+       n = self.num_nodes
+       edge_to = self.edge_to
+       start = [0] * (n + 1)
+       for e in range(len(edge_to)):
+           start[edge_to[e ^ 1] + 1] += 1
+       for u in range(n):
+           start[u + 1] += start[u]
+       fill = start[:n]
+       order = [0] * len(edge_to)
+       for e in range(len(edge_to)):
+           u = edge_to[e ^ 1]
+           order[fill[u]] = e
+           fill[u] += 1
+       self.adj_start = start
+       self.adj_edges = order
+
+   def dinic(self, source, sink, deadline=None):
+       """
+       Find the maximum flow from source to sink using Dinic's algorithm:
+       BFS level graphs plus blocking flows found with current-arc pointers.
+       With a deadline (a perf_counter() value), stop augmenting once it has passed;
+       the network then holds a valid, possibly smaller flow, and finished stays False.
+       """
+       self.build()
+       n = self.num_nodes
+       edge_to, cap = self.edge_to, self.edge_cap
+       start, order = self.adj_start, self.adj_edges
+       max_flow = 0
+       bfs_runs = 0
+       augmentations = 0
+
+       while True:
+           # Build the level graph, unless the deadline has passed
+           out_of_time = deadline is not None and perf_counter() >= deadline
+           if not out_of_time:
+               bfs_runs += 1
+               level = [-1] * n
+               level[source] = 0
+               queue = deque([source])
+               while queue:
+                   u = queue.popleft()
+                   for k in range(start[u], start[u + 1]):
+                       e = order[k]
+                       v = edge_to[e]
+                       if cap[e] > 0 and level[v] < 0:
+                           level[v] = level[u] + 1
+                           queue.append(v)
+           if out_of_time or level[sink] < 0:
+               instrumentation = get_instrumentation()
+               if out_of_time:
+                   instrumentation.count("maxflow.deadline_hits")
+               instrumentation.count("maxflow.bfs_runs", bfs_runs)
+               instrumentation.count("maxflow.augmentations", augmentations)
+               self.finished = not out_of_time
+               return max_flow
+
+           # Blocking flow: iterative DFS that never revisits an exhausted arc
+           current = start[:n]
+           while True:
+               path = []
+               u = source
+               while u != sink:
+                   k = current[u]
+                   end = start[u + 1]
+                   while k < end:
+                       e = order[k]
+                       if cap[e] > 0 and level[edge_to[e]] == level[u] + 1:
+                           break
+                       k += 1
+                   current[u] = k
+                   if k < end:
+                       path.append(order[k])
+                       u = edge_to[order[k]]
+                   elif u == source:
+                       break
+                   else:
+                       # Dead end: retreat and skip the arc that led here
+                       level[u] = -1
+                       u = edge_to[path.pop() ^ 1]
+                       current[u] += 1
+               if u != sink:
+                   break
+
+               path_flow = min(cap[e] for e in path)
+               for e in path:
+                   cap[e] -= path_flow
+                   cap[e ^ 1] += path_flow
+               max_flow += path_flow
+               augmentations += 1
+               if deadline is not None and perf_counter() >= deadline:
+                   break
+
+   def push_relabel(self, source, sink, deadline=None):
+       """
+       Find the maximum flow from source to sink using highest-label push-relabel
+       with an exact initial labelling and the gap heuristic.
+       The deadline is accepted for a uniform interface but ignored: until it
+       finishes, the network holds a preflow, not a flow. Schedulers with a time
+       budget use dinic instead.
+       """
+       self.build()
+       n = self.num_nodes
+       edge_to, cap = self.edge_to, self.edge_cap
+       start, order = self.adj_start, self.adj_edges
+
+       # Initial heights: residual distance to the sink (n if unreachable)
+       height = [n] * n
+       height[sink] = 0
+       queue = deque([sink])
+       while queue:
+           v = queue.popleft()
+           for k in range(start[v], start[v + 1]):
+               e = order[k]
+               u = edge_to[e]
+               if cap[e ^ 1] > 0 and height[u] == n and u != sink:
+                   height[u] = height[v] + 1
+                   queue.append(u)
+       height[source] = n
+
+       count = [0] * (2 * n + 1)
+       for u in range(n):
+           count[height[u]] += 1
+       excess = [0] * n
+       current = start[:n]
+       buckets = [[] for _ in range(2 * n + 1)]
+       highest = 0
+       relabels = 0
+       gaps = 0
+
+       # Saturate every edge leaving the source
+       for k in range(start[source], start[source + 1]):
+           e = order[k]
+           f = cap[e]
+           if f > 0:
+               v = edge_to[e]
+               cap[e] = 0
+               cap[e ^ 1] += f
+               if excess[v] == 0 and v != sink and v != source:
+                   buckets[height[v]].append(v)
+                   highest = max(highest, height[v])
+               excess[v] += f
+
+       while highest >= 0:
+           bucket = buckets[highest]
+           if not bucket:
+               highest -= 1
+               continue
+           u = bucket.pop()
+           if height[u] != highest:
+               # Lifted by a gap since it was queued
+               buckets[height[u]].append(u)
+               highest = max(highest, height[u])
+               continue
+
+           # Discharge u completely
+           while excess[u] > 0:
+               k = current[u]
+               if k == start[u + 1]:
+                   # Relabel
+                   relabels += 1
+                   old = height[u]
+                   new = 2 * n
+                   for k2 in range(start[u], start[u + 1]):
+                       e = order[k2]
+                       if cap[e] > 0 and height[edge_to[e]] + 1 < new:
+                           new = height[edge_to[e]] + 1
+                   count[old] -= 1
+                   if count[old] == 0 and old < n:
+                       # Gap: nothing above old can reach the sink any more
+                       gaps += 1
+                       for w in range(n):
+                           if old < height[w] < n:
+                               count[height[w]] -= 1
+                               height[w] = n + 1
+                               count[n + 1] += 1
+                               current[w] = start[w]
+                       new = max(new, n + 1)
+                   height[u] = new
+                   count[new] += 1
+                   current[u] = start[u]
+                   continue
+
+               e = order[k]
+               v = edge_to[e]
+               if cap[e] > 0 and height[u] == height[v] + 1:
+                   f = min(excess[u], cap[e])
+                   cap[e] -= f
+                   cap[e ^ 1] += f
+                   excess[u] -= f
+                   if excess[v] == 0 and v != sink and v != source:
+                       buckets[height[v]].append(v)
+                       highest = max(highest, height[v])
+                   excess[v] += f
+               else:
+                   current[u] = k + 1
+
+       instrumentation = get_instrumentation()
+       instrumentation.count("maxflow.relabels", relabels)
+       instrumentation.count("maxflow.gaps", gaps)
+       self.finished = True
+       return excess[sink]
+
+class MinCostFlow:
+   def __init__(self, num_nodes):
+       """
+       Initialize a min-cost flow network on nodes 0..num_nodes-1.
+       Edge e and its reverse edge e ^ 1 are stored next to each other, as in FlowNetwork;
+       the reverse edge has the negated cost.
+       """
+       self.num_nodes = num_nodes
+       self.edge_to = []
+       self.edge_cap = []
+       self.edge_cost = []
+       self.adj = [[] for _ in range(num_nodes)]
+
+   def add_edge(self, u, v, capacity, cost):
+       """
+       Add an edge with capacity and a non-negative cost per unit of flow. Returns the edge id.
+       """
+       edge = len(self.edge_to)
+       self.edge_to += [v, u]
+       self.edge_cap += [capacity, 0]
+       self.edge_cost += [cost, -cost]
+       self.adj[u].append(edge)
+       self.adj[v].append(edge + 1)
+       return edge
+
+   def flow(self, edge):
+       """
+       Return the flow on an edge, given the id returned by add_edge.
+       """
+       return self.edge_cap[edge ^ 1]
+
+   def successive_shortest_paths(self, source, sink):
+       """
+       Find a maximum flow of minimum cost by augmenting along shortest (cheapest) paths.
+       Dijkstra runs on reduced costs with node potentials, which stay non-negative
+       because every edge cost is; each shortest-path tree is then used for as many
+       augmentations as it allows (a blocking flow on its zero-reduced-cost edges).
+
+       Returns:
+           A tuple (max_flow, total_cost)
+       """
+       n = self.num_nodes
+       edge_to, cap, cost, adj = self.edge_to, self.edge_cap, self.edge_cost, self.adj
+       potential = [0] * n
+       max_flow = total_cost = 0
+       dijkstra_runs = augmentations = 0
+
+       while True:
+           # Shortest distances from the source on reduced costs
+           dijkstra_runs += 1
+           dist = [None] * n
+           dist[source] = 0
+           heap = [(0, source)]
+           while heap:
+               d, u = heappop(heap)
+               if d > dist[u]:
+                   continue
+               for e in adj[u]:
+                   if cap[e] > 0:
+                       v = edge_to[e]
+                       nd = d + cost[e] + potential[u] - potential[v]
+                       if dist[v] is None or nd < dist[v]:
+                           dist[v] = nd
+                           heappush(heap, (nd, v))
+           if dist[sink] is None:
+               break
+           for u in range(n):
+               if dist[u] is not None:
+                   potential[u] += dist[u]
+
+           # Augment along tight edges (zero reduced cost) until none lead to the sink
+           current = [0] * n
+           while True:
+               path = []
+               visited = [False] * n
+               u = source
+               visited[u] = True
+               while u != sink:
+                   edges = adj[u]
+                   while current[u] < len(edges):
+                       e = edges[current[u]]
+                       v = edge_to[e]
+                       if cap[e] > 0 and not visited[v] and cost[e] + potential[u] - potential[v] == 0:
+                           break
+                       current[u] += 1
+                   if current[u] < len(edges):
+                       e = edges[current[u]]
+                       path.append(e)
+                       u = edge_to[e]
+                       visited[u] = True
+                   elif u == source:
+                       break
+                   else:
+                       # Dead end: retreat and skip the edge that led here
+                       u = edge_to[path.pop() ^ 1]
+                       current[u] += 1
+               if u != sink:
+                   break
+
+               path_flow = min(cap[e] for e in path)
+               for e in path:
+                   cap[e] -= path_flow
+                   cap[e ^ 1] += path_flow
+                   total_cost += path_flow * cost[e]
+               max_flow += path_flow
+               augmentations += 1
+
+       instrumentation = get_instrumentation()
+       instrumentation.count("mincostflow.dijkstra_runs", dijkstra_runs)
+       instrumentation.count("mincostflow.augmentations", augmentations)
+       return max_flow, total_cost
+
 # ---------------------- INTERVIEW SCHEDULING ----------------------
 
-def schedule_interviews(candidates, recruiters, slot_length_minutes, max_interviews_per_candidate, max_interviews_per_recruiter):
+def schedule_interviews(candidates, recruiters, slot_length_minutes, max_interviews_per_candidate, max_interviews_per_recruiter,
+                        algorithm="edmonds_karp", max_workers=None, dedupe_profiles=False, time_budget_ms=None,
+                        initial_schedule=None, report=None):
    """
-   Matches candidates and recruiters for interviews based on their availability using the Ford-Fulkerson algorithm.
-   All time comparisons are done in UTC to ensure correct cross-timezone matching.
+   Matches candidates and recruiters for interviews based on their availability using maximum flow.
+   All time comparisons are done on UTC minutes to ensure correct cross-timezone matching.
+
+   The network has a time-slot layer, so one max-flow run yields a conflict-free,
+   maximum-cardinality schedule:
+
+       source -> candidate          capacity max_interviews_per_candidate
+       candidate -> slot            capacity 1 (a candidate attends one interview per slot)
+       slot -> recruiter            capacity 1 (a recruiter runs one interview per slot)
+       recruiter -> sink            capacity max_interviews_per_recruiter
+
+   Every candidate and recruiter routed through the same slot node are both free at
+   that slot, so any pairing of them inside the slot is valid. This keeps the network
+   linear in the size of the availability instead of quadratic per slot.
+
+   With dedupe_profiles, people with identical availability share one node whose
+   capacities are multiplied by the number of people in the profile.
   
    Args:
        candidates: dictionary of candidates and their availability.
@@ -82,90 +509,278 @@ def schedule_interviews(candidates, recruiters, slot_length_minutes, max_intervi
        slot_length_minutes: fixed duration of each interview slot.
        max_interviews_per_candidate: maximum interviews allowed per candidate.
        max_interviews_per_recruiter: maximum interviews allowed per recruiter.
+       algorithm: max-flow solver, "edmonds_karp" (Ford-Fulkerson with BFS on MaxFlow),
+           "dinic" or "push_relabel" (both on the array-backed FlowNetwork).
+       max_workers: if set, solve each connected component in a process pool of this size.
+       dedupe_profiles: collapse people with identical availability into one node.
+       time_budget_ms: if set, push the greedy schedule through the network first and stop
+           the solver once this many milliseconds have passed, less a share kept for
+           formatting, returning the best schedule found so far (the greedy schedule itself
+           if the network could not be built in time). push_relabel only holds a valid flow
+           when it finishes, so dinic runs in its place. Parsing stops at a share of the
+           budget, and only the people parsed by then are scheduled. With max_workers the
+           budget covers the whole solve.
+       initial_schedule: a previous [candidate, recruiter, time_slot] schedule to start from
+           instead of greedy's; the interviews that still fit the current availability and
+           caps become the initial flow, and the solver only augments from there. Within a
+           slot, the pairing of candidates and recruiters may change.
+       report: if a dict is given, it receives "finished" (everyone was parsed and the
+           solver ran to completion, so the schedule is maximum) and "upper_bound" (the
+           schedule's size if finished, else algos.profiles.degree_upper_bound; summed
+           over components when max_workers is set).
 
    Returns:
-       A List of scheduled interviews as [candidate, recruiter, time_slot].
+       A List of scheduled interviews as [candidate, recruiter, time_slot], earliest first
+       (within each component when max_workers is set).
    """
+   if max_workers is not None:
+       return solve_components(schedule_interviews, candidates, recruiters, slot_length_minutes,
+                               max_interviews_per_candidate, max_interviews_per_recruiter, max_workers,
+                               algorithm=algorithm, dedupe_profiles=dedupe_profiles,
+                               time_budget_ms=time_budget_ms, initial_schedule=initial_schedule,
+                               report=report)
+
+   deadline = budget_deadline(time_budget_ms)
+   instrumentation = get_instrumentation()
+   if algorithm == "push_relabel" and deadline is not None:
+       # push_relabel cannot stop early with a valid flow
+       algorithm = "dinic"
+
+   def out_of_time():
+       return deadline is not None and perf_counter() >= deadline
+
+   def finish(assignments, finished):
+       # Format results, showing each slot in the candidate's time zone
+       with instrumentation.span("networkflow.format"):
+           scheduled_interviews = [[cand, rec, format_slot(slot, candidates[cand]["timezone"])]
+                                   for cand, rec, slot in expand_assignments(assignments, candidate_profiles,
+                                                                             recruiter_profiles)]
+       if report is not None:
+           # Only a solve over everyone proves the schedule maximum
+           report["finished"] = finished = finished and parsed_all
+           report["upper_bound"] = len(scheduled_interviews) if finished else upper_bound
+       return scheduled_interviews
+
+   # Parse time slots into profiles of integer slots (UTC minutes); with a budget,
+   # only as many people as leave time to schedule them
+   with instrumentation.span("networkflow.parse"):
+       candidate_profiles, recruiter_profiles, parsed_all = parse_profiles(
+           candidates, recruiters, slot_length_minutes, dedupe_profiles, deadline)
+   if not parsed_all:
+       # Everyone else is left out of this solve
+       instrumentation.count("networkflow.deadline_hits")
+   if report is not None:
+       # Within the budget, so that reporting on an unfinished solve is cheap
+       upper_bound = degree_upper_bound(candidate_profiles, recruiter_profiles,
+                                        max_interviews_per_candidate, max_interviews_per_recruiter,
+                                        len(candidates), len(recruiters))
+
+   seed = None
+   fallback = None  # the greedy schedule, returned as is if there is no time to improve on it
+   if initial_schedule is not None:
+       # Warm start: the previous schedule at profile level
+       candidate_index = {cand: c for c, (_, members) in enumerate(candidate_profiles) for cand in members}
+       recruiter_index = {rec: r for r, (_, members) in enumerate(recruiter_profiles) for rec in members}
+       seed = [(candidate_index[cand], recruiter_index[rec], slot)
+               for cand, rec, slot in resolve_schedule(initial_schedule, candidates, recruiters)
+               if cand in candidate_index and rec in recruiter_index]
+   elif deadline is not None:
+       # Anytime mode: start from the greedy schedule's flow, found before anything else
+       # spends the budget
+       seed = fallback = greedy_assignments(candidate_profiles, recruiter_profiles, max_interviews_per_candidate,
+                                            max_interviews_per_recruiter, deadline)
+       if out_of_time():
+           instrumentation.count("networkflow.deadline_hits")
+           return finish(fallback, False)
+
+   with instrumentation.span("networkflow.build_graph"):
+       build_start = perf_counter()
+       # Only slots where both sides have someone free get a node
+       candidate_union = set().union(*(slots for slots, _ in candidate_profiles))
+       recruiter_union = set().union(*(slots for slots, _ in recruiter_profiles))
+       shared_slots = sorted(candidate_union & recruiter_union)
   
-   # Parse time slots, get datetime objects in original timezone
-   candidate_slots = {cand: parse_multi_day_slots(data["availability"], slot_length_minutes, data["timezone"])
-                      for cand, data in candidates.items()}
-  
-   recruiter_slots = {rec: parse_multi_day_slots(data["availability"], slot_length_minutes, data["timezone"])
-                      for rec, data in recruiters.items()}
-  
-   # Create UTC version for each time slot and maintain mapping between original time slot and UTC time slot
-   candidate_slots_utc = {}
-   utc_to_original_map = {}
-   
-   for cand, slots in candidate_slots.items():
-       candidate_slots_utc[cand] = set()
-       for slot in slots:
-           # Convert to UTC time
-           slot_utc = slot.astimezone(ZoneInfo("UTC"))
-           candidate_slots_utc[cand].add(slot_utc)
-           # Record mapping from UTC -> original time
-           utc_to_original_map[(cand, slot_utc)] = slot
-   
-   # Similarly process the recruiter's time slots
-   recruiter_slots_utc = {}
-   for rec, slots in recruiter_slots.items():
-       recruiter_slots_utc[rec] = set()
-       for slot in slots:
-           slot_utc = slot.astimezone(ZoneInfo("UTC"))
-           recruiter_slots_utc[rec].add(slot_utc)
-  
-   # Create flow network
-   nodes = set(["source", "sink"]) | set(candidates.keys()) | set(recruiters.keys())
-   flow_network = MaxFlow(nodes)
-
-   # Connect source to candidates
-   for cand in candidates:
-       flow_network.add_edge("source", cand, max_interviews_per_candidate)
-
-   # Connect recruiters to sink
-   for rec in recruiters:
-       flow_network.add_edge(rec, "sink", max_interviews_per_recruiter)
-
-   # Connect candidates to recruiters in UTC timezone
-   edges = []
-   for cand, c_slots_utc in candidate_slots_utc.items():
-       for rec, r_slots_utc in recruiter_slots_utc.items():
-           # Find commonly available times in UTC
-           common_slots_utc = c_slots_utc & r_slots_utc
-           
-           for slot_utc in common_slots_utc:
-               flow_network.add_edge(cand, rec, 1)
-               # Use candidate's original timezone time as the result
-               original_slot = utc_to_original_map[(cand, slot_utc)]
-               edges.append((cand, rec, original_slot))
+       # Create flow network on integer node ids: source, sink, candidates, recruiters, slots
+       source, sink = 0, 1
+       first_rec_node = 2 + len(candidate_profiles)
+       first_slot_node = first_rec_node + len(recruiter_profiles)
+       slot_node = {slot: first_slot_node + i for i, slot in enumerate(shared_slots)}
+       num_nodes = first_slot_node + len(slot_node)
 
+       if algorithm == "edmonds_karp":
+           flow_network = MaxFlow(range(num_nodes))
+           solve = flow_network.ford_fulkerson
+       elif algorithm == "dinic":
+           flow_network = FlowNetwork(num_nodes)
+           solve = flow_network.dinic
+       elif algorithm == "push_relabel":
+           flow_network = FlowNetwork(num_nodes)
+           solve = flow_network.push_relabel
+       else:
+           raise ValueError(f"Unknown max-flow algorithm: {algorithm}")
+
+       # Connect source to candidates, and candidates to the slots they are free in
+       source_edges = []
+       candidate_edges = []
+       candidate_edge = {}  # (candidate profile, slot) -> edge, to push the seed along
+       for c, (c_slots, members) in enumerate(candidate_profiles):
+           if fallback is not None and out_of_time():
+               break
+           source_edges.append(flow_network.add_edge(source, 2 + c, len(members) * max_interviews_per_candidate))
+           for slot in sorted(c_slots & recruiter_union):
+               edge = flow_network.add_edge(2 + c, slot_node[slot], len(members))
+               candidate_edges.append((c, slot, edge))
+               if seed is not None:
+                   candidate_edge[c, slot] = edge
+
+       # Connect slots to the recruiters free in them, and recruiters to sink
+       recruiter_edges = []
+       recruiter_edge = {}
+       sink_edges = []
+       for r, (r_slots, members) in enumerate(recruiter_profiles):
+           if fallback is not None and out_of_time():
+               break
+           for slot in sorted(r_slots & candidate_union):
+               edge = flow_network.add_edge(slot_node[slot], first_rec_node + r, len(members))
+               recruiter_edges.append((r, slot, edge))
+               if seed is not None:
+                   recruiter_edge[r, slot] = edge
+           sink_edges.append(flow_network.add_edge(first_rec_node + r, sink, len(members) * max_interviews_per_recruiter))
+       instrumentation.count("networkflow.edges", len(candidate_edges) + len(recruiter_edges) + len(candidate_profiles) + len(recruiter_profiles))
+       if isinstance(flow_network, FlowNetwork) and not (fallback is not None and out_of_time()):
+           # Index the edges here rather than in the solver, so the deadline covers it. Indexing
+           # takes about as long as adding the edges did; skip it if that no longer fits.
+           if fallback is not None and perf_counter() + (perf_counter() - build_start) >= deadline:
+               instrumentation.count("networkflow.deadline_hits")
+               return finish(fallback, False)
+           flow_network.build()
+
+   if fallback is not None and out_of_time():
+       # The network was not built in time
+       instrumentation.count("networkflow.deadline_hits")
+       return finish(fallback, False)
 
    # Run maximum flow algorithm
-   flow_network.ford_fulkerson("source", "sink")
-
-   # Format results
-   scheduled_interviews = []
-   
-   # Need to track interview count for each person
-   candidate_counts = defaultdict(int)
-   recruiter_counts = defaultdict(int)
-   
-   for cand, rec, slot in edges:
-       # Check if this edge is used
-       if flow_network.graph[rec][cand] > 0:
-           # Key modification: Check if interview count limits are exceeded
-           if (candidate_counts[cand] < max_interviews_per_candidate and
-               recruiter_counts[rec] < max_interviews_per_recruiter):
-               
-               formatted_time = slot.strftime("%Y-%m-%d %H:%M %Z")
-               scheduled_interviews.append([cand, rec, formatted_time])
-               
-               # Update counts
-               candidate_counts[cand] += 1
-               recruiter_counts[rec] += 1
-               
-   return scheduled_interviews
+   with instrumentation.span("networkflow.solve"):
+       if seed is not None:
+           # Push each interview that still fits: both people free at the slot and
+           # every edge on its path left with capacity
+           initial_flow = 0
+           for c, r, slot in seed:
+               path = (source_edges[c], candidate_edge.get((c, slot)), recruiter_edge.get((r, slot)), sink_edges[r])
+               if None in path or any(flow_network.residual(edge) < 1 for edge in path):
+                   continue
+               for edge in path:
+                   flow_network.push(edge, 1)
+               initial_flow += 1
+           instrumentation.count("networkflow.initial_flow", initial_flow)
+       solve(source, sink, deadline=deadline)
 
+   with instrumentation.span("networkflow.format"):
+       # Collect who is booked in each slot; flow conservation makes both lists equally long
+       booked_candidates = defaultdict(list)
+       booked_recruiters = defaultdict(list)
+       for c, slot, edge in candidate_edges:
+           flow = flow_network.flow(edge)
+           if flow:
+               booked_candidates[slot].extend([c] * flow)
+       for r, slot, edge in recruiter_edges:
+           flow = flow_network.flow(edge)
+           if flow:
+               booked_recruiters[slot].extend([r] * flow)
 
+       assignments = []
+       for slot in shared_slots:
+           for c, r in zip(booked_candidates[slot], booked_recruiters[slot]):
+               assignments.append((c, r, slot))
 
+   return finish(assignments, flow_network.finished)
+
+
+def min_cost_schedule_interviews(candidates, recruiters, slot_length_minutes, max_interviews_per_candidate, max_interviews_per_recruiter,
+                                 objective="min_variance", dedupe_profiles=False):
+   """
+   Schedules a maximum number of interviews and, among all maximum schedules, one of
+   minimum cost, with a single min-cost-flow solve on the same layered network as
+   schedule_interviews.
+
+   Objectives:
+       "min_variance": the k-th interview of a person costs 2k - 1, so a schedule costs
+           the sum of squared interview counts. The per-person cost ladders are convex,
+           so the solver fills them in order. The total is fixed at the maximum, so the
+           result minimizes the candidates' and recruiters' sums of squares added
+           together. That is their joint spread; either side alone may end up
+           less even than a schedule that only balances that side.
+       "earliest": each interview costs the rank of its slot, so earlier slots are
+           preferred across the whole schedule rather than one candidate at a time.
+
+   Args:
+       candidates, recruiters, slot_length_minutes, max_interviews_per_candidate,
+       max_interviews_per_recruiter, dedupe_profiles: as for schedule_interviews
+       objective: "min_variance" or "earliest"
+
+   Returns:
+       A List of scheduled interviews as [candidate, recruiter, time_slot], earliest first
+   """
+   if objective not in ("min_variance", "earliest"):
+       raise ValueError(f"Unknown min-cost objective: {objective}")
+   instrumentation = get_instrumentation()
+
+   with instrumentation.span("mincostflow.parse"):
+       candidate_profiles = group_profiles(candidates, slot_length_minutes, dedupe_profiles)
+       recruiter_profiles = group_profiles(recruiters, slot_length_minutes, dedupe_profiles)
+
+   with instrumentation.span("mincostflow.build_graph"):
+       candidate_union = set().union(*(slots for slots, _ in candidate_profiles))
+       recruiter_union = set().union(*(slots for slots, _ in recruiter_profiles))
+       shared_slots = sorted(candidate_union & recruiter_union)
+
+       source, sink = 0, 1
+       first_rec_node = 2 + len(candidate_profiles)
+       first_slot_node = first_rec_node + len(recruiter_profiles)
+       slot_node = {slot: first_slot_node + i for i, slot in enumerate(shared_slots)}
+       flow_network = MinCostFlow(first_slot_node + len(slot_node))
+
+       def add_ladder(u, v, members, cap):
+           # A profile of k people takes its i-th round of interviews at cost 2i - 1 each
+           if objective == "min_variance":
+               for i in range(1, cap + 1):
+                   flow_network.add_edge(u, v, members, 2 * i - 1)
+           else:
+               flow_network.add_edge(u, v, members * cap, 0)
+
+       candidate_edges = []
+       for c, (c_slots, members) in enumerate(candidate_profiles):
+           add_ladder(source, 2 + c, len(members), max_interviews_per_candidate)
+           for slot in sorted(c_slots & recruiter_union):
+               slot_cost = slot_node[slot] - first_slot_node if objective == "earliest" else 0
+               candidate_edges.append((c, slot, flow_network.add_edge(2 + c, slot_node[slot], len(members), slot_cost)))
+
+       recruiter_edges = []
+       for r, (r_slots, members) in enumerate(recruiter_profiles):
+           for slot in sorted(r_slots & candidate_union):
+               recruiter_edges.append((r, slot, flow_network.add_edge(slot_node[slot], first_rec_node + r, len(members), 0)))
+           add_ladder(first_rec_node + r, sink, len(members), max_interviews_per_recruiter)
+       instrumentation.count("mincostflow.edges", len(flow_network.edge_to) // 2)
+
+   with instrumentation.span("mincostflow.solve"):
+       flow_network.successive_shortest_paths(source, sink)
+
+   with instrumentation.span("mincostflow.format"):
+       booked_candidates = defaultdict(list)
+       booked_recruiters = defaultdict(list)
+       for c, slot, edge in candidate_edges:
+           booked_candidates[slot].extend([c] * flow_network.flow(edge))
+       for r, slot, edge in recruiter_edges:
+           booked_recruiters[slot].extend([r] * flow_network.flow(edge))
+
+       assignments = []
+       for slot in shared_slots:
+           for c, r in zip(booked_candidates[slot], booked_recruiters[slot]):
+               assignments.append((c, r, slot))
+
+       scheduled_interviews = []
+       for cand, rec, slot in expand_assignments(assignments, candidate_profiles, recruiter_profiles):
+           scheduled_interviews.append([cand, rec, format_slot(slot, candidates[cand]["timezone"])])
+
+   return scheduled_interviews
@@ -0,0 +1,205 @@
+from itertools import islice
+from time import perf_counter
+from utils.time_paraser import parse_multi_day_slot_minutes, resolve_slot
+
+# Share of a time budget held back for formatting the schedule and reporting on it
+FORMAT_BUDGET_SHARE = 0.1
+# Share of the time left that parsing may use, so that scheduling the people parsed
+# still fits when the whole instance cannot be parsed in time
+PARSE_BUDGET_SHARE = 0.25
+
+
+def group_profiles(
+    people: dict[str, dict],
+    slot_length_minutes: int,
+    dedupe: bool = True
+) -> list[tuple[frozenset, list[str]]]:
+    """
+    Parses availability and collapses people with identical slots (after UTC
+    normalization) into one profile. Identical raw availability is only parsed once.
+
+    Args:
+        people: dict mapping name to {"availability": [...], "timezone": ...}
+        slot_length_minutes: fixed duration of each interview slot
+        dedupe: if False, every person gets a profile of their own
+
+    Returns:
+        A list of (slots, members) in order of first appearance, where slots is a
+        frozenset of UTC minutes and members lists the names sharing it in input order
+    """
+    profiles, add = _profile_grouper(slot_length_minutes, dedupe)
+    for name, data in people.items():
+        add(name, data)
+    return list(profiles.values())
+
+
+def _profile_grouper(slot_length_minutes, dedupe):
+    # The profiles grouped so far, by key, and a function adding one person to them
+    parsed = {}
+    profiles = {}
+
+    def add(name, data):
+        raw_key = (tuple(data["availability"]), data["timezone"])
+        slots = parsed.get(raw_key)
+        if slots is None:
+            slots = parsed[raw_key] = frozenset(
+                parse_multi_day_slot_minutes(data["availability"], slot_length_minutes, data["timezone"])
+            )
+        profile_key = slots if dedupe else name
+        if profile_key in profiles:
+            profiles[profile_key][1].append(name)
+        else:
+            profiles[profile_key] = (slots, [name])
+
+    return profiles, add
+
+
+def expand_assignments(
+    assignments: list[tuple[int, int, int]],
+    candidate_profiles: list[tuple[frozenset, list[str]]],
+    recruiter_profiles: list[tuple[frozenset, list[str]]]
+) -> list[tuple[str, str, int]]:
+    """
+    Expands profile-level assignments back to individuals.
+
+    A profile of k people may hold at most k interviews per slot and k times the
+    per-person cap in total. Handing out each profile's interviews round-robin in
+    slot order then gives every member distinct slots and at most the per-person cap.
+
+    Args:
+        assignments: (candidate profile index, recruiter profile index, slot), one per interview
+        candidate_profiles, recruiter_profiles: as returned by group_profiles
+
+    Returns:
+        A list of (candidate, recruiter, slot), earliest slot first
+    """
+    next_candidate = [0] * len(candidate_profiles)
+    next_recruiter = [0] * len(recruiter_profiles)
+    expanded = []
+    for c, r, slot in sorted(assignments, key=lambda x: x[2]):
+        candidate_members = candidate_profiles[c][1]
+        recruiter_members = recruiter_profiles[r][1]
+        cand = candidate_members[next_candidate[c] % len(candidate_members)]
+        rec = recruiter_members[next_recruiter[r] % len(recruiter_members)]
+        next_candidate[c] += 1
+        next_recruiter[r] += 1
+        expanded.append((cand, rec, slot))
+    return expanded
+
+
+def resolve_schedule(
+    scheduled: list[list[str]],
+    candidates: dict[str, dict],
+    recruiters: dict[str, dict]
+) -> list[tuple[str, str, int]]:
+    """
+    Converts a [candidate, recruiter, time_slot] schedule back to (candidate, recruiter,
+    slot), dropping interviews of people who are gone or whose time cannot be resolved.
+    Availability and caps are not checked here.
+    """
+    resolved = []
+    for cand, rec, time_str in scheduled:
+        if cand in candidates and rec in recruiters:
+            slot = resolve_slot(time_str, candidates[cand], recruiters[rec])
+            if slot is not None:
+                resolved.append((cand, rec, slot))
+    return resolved
+
+
+def parse_profiles(
+    candidates: dict[str, dict],
+    recruiters: dict[str, dict],
+    slot_length_minutes: int,
+    dedupe: bool = True,
+    deadline: float = None
+) -> tuple[list, list, bool]:
+    """
+    group_profiles for both sides of an instance. With a deadline, parsing stops once
+    PARSE_BUDGET_SHARE of the time left has passed, so that the people parsed can
+    still be scheduled. Both sides are parsed alternately, keeping the same share of
+    each parsed, so that neither is left empty.
+
+    Returns:
+        (candidate_profiles, recruiter_profiles, complete), where complete is False if
+        the profiles leave anyone out
+    """
+    if deadline is None:
+        return (group_profiles(candidates, slot_length_minutes, dedupe),
+                group_profiles(recruiters, slot_length_minutes, dedupe), True)
+
+    parse_deadline = perf_counter() + max(0.0, deadline - perf_counter()) * PARSE_BUDGET_SHARE
+    candidate_profiles, add_candidate = _profile_grouper(slot_length_minutes, dedupe)
+    recruiter_profiles, add_recruiter = _profile_grouper(slot_length_minutes, dedupe)
+    candidate_items = iter(candidates.items())
+    recruiter_items = iter(recruiters.items())
+    num_candidates, num_recruiters = len(candidates), len(recruiters)
+    parsed_candidates = parsed_recruiters = 0
+    while ((parsed_candidates < num_candidates or parsed_recruiters < num_recruiters) and
+           perf_counter() < parse_deadline):
+        if parsed_recruiters == num_recruiters or (parsed_candidates < num_candidates and
+                                                   parsed_candidates * num_recruiters <=
+                                                   parsed_recruiters * num_candidates):
+            add_candidate(*next(candidate_items))
+            parsed_candidates += 1
+        else:
+            add_recruiter(*next(recruiter_items))
+            parsed_recruiters += 1
+    complete = parsed_candidates == num_candidates and parsed_recruiters == num_recruiters
+    return list(candidate_profiles.values()), list(recruiter_profiles.values()), complete
+
+
+def budget_deadline(time_budget_ms: float) -> float:
+    """
+    The perf_counter() value at which a scheduler given time_budget_ms must stop
+    solving, so that formatting its result still fits in the budget.
+
+    Returns:
+        The deadline, or None without a budget
+    """
+    if time_budget_ms is None:
+        return None
+    return perf_counter() + time_budget_ms * (1 - FORMAT_BUDGET_SHARE) / 1000
+
+
+def degree_upper_bound(
+    candidate_profiles: list[tuple[frozenset, list[str]]],
+    recruiter_profiles: list[tuple[frozenset, list[str]]],
+    max_interviews_per_candidate: int,
+    max_interviews_per_recruiter: int,
+    num_candidates: int = None,
+    num_recruiters: int = None
+) -> int:
+    """
+    Upper bound on the number of interviews in any feasible schedule.
+
+    Nobody can take more interviews than their cap or than the slots they share with
+    the other side, and every interview uses one candidate and one recruiter, so the
+    smaller of the two sums bounds the maximum.
+
+    Args:
+        candidate_profiles, recruiter_profiles: as returned by group_profiles
+        num_candidates, num_recruiters: sizes of the whole instance, if the profiles only
+            cover the people parsed so far (see parse_profiles); everyone else counts
+            with their full cap, and the slots shared with a partly parsed side are
+            bounded by each person's own slots
+    """
+    def shared(slots, other, cap):
+        if other is None:
+            return min(len(slots), cap)
+        # Shared slots counted only up to the cap, without building the intersection
+        return len(list(islice((slot for slot in slots if slot in other), cap)))
+
+    def unparsed(profiles, total):
+        return total - sum(len(members) for _, members in profiles) if total is not None else 0
+
+    missing_candidates = unparsed(candidate_profiles, num_candidates)
+    missing_recruiters = unparsed(recruiter_profiles, num_recruiters)
+    candidate_union = None if missing_candidates else set().union(*(slots for slots, _ in candidate_profiles))
+    recruiter_union = None if missing_recruiters else set().union(*(slots for slots, _ in recruiter_profiles))
+    candidate_bound = sum(len(members) * shared(slots, recruiter_union, max_interviews_per_candidate)
+                          for slots, members in candidate_profiles)
+    recruiter_bound = sum(len(members) * shared(slots, candidate_union, max_interviews_per_recruiter)
+                          for slots, members in recruiter_profiles)
+    return min(candidate_bound + missing_candidates * max_interviews_per_candidate,
+               recruiter_bound + missing_recruiters * max_interviews_per_recruiter)
+
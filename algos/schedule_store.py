@@ -0,0 +1,240 @@
+import sqlite3
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from typing import Iterable, Optional
+
+
+class MemoryScheduleStore:
+    """
+    In-memory bookings indexed by candidate, by recruiter and by slot.
+
+    This is the default store of SchedulerState. SQLiteScheduleStore has the same
+    methods, so either can back a state. Slots are UTC minutes, or None for
+    bookings whose time could not be resolved; find returns rows as
+    (booking id, candidate, recruiter, slot, formatted time).
+    """
+
+    def __init__(self):
+        self.bookings = {}  # booking id -> (candidate, recruiter, slot, formatted time)
+        self.by_candidate = defaultdict(set)
+        self.by_recruiter = defaultdict(set)
+        self.by_slot = defaultdict(set)
+        self._next_id = 0
+
+    def transaction(self):
+        """Group several changes; a no-op in memory"""
+        return nullcontext(self)
+
+    def add(self, candidate: str, recruiter: str, slot: Optional[int], time_str: str) -> int:
+        """Book an interview and return its booking id"""
+        booking_id = self._next_id
+        self._next_id += 1
+        self.bookings[booking_id] = (candidate, recruiter, slot, time_str)
+        self.by_candidate[candidate].add(booking_id)
+        self.by_recruiter[recruiter].add(booking_id)
+        self.by_slot[slot].add(booking_id)
+        return booking_id
+
+    def add_many(self, rows: Iterable[tuple]) -> None:
+        """Book (candidate, recruiter, slot, formatted time) rows in order"""
+        for row in rows:
+            self.add(*row)
+
+    def remove(self, booking_id: int) -> tuple:
+        """Cancel a booking and return its (candidate, recruiter, slot, formatted time)"""
+        candidate, recruiter, slot, time_str = self.bookings.pop(booking_id)
+        self.by_candidate[candidate].discard(booking_id)
+        self.by_recruiter[recruiter].discard(booking_id)
+        self.by_slot[slot].discard(booking_id)
+        return candidate, recruiter, slot, time_str
+
+    def find(self, candidate: str = None, recruiter: str = None, slot: int = None) -> list[tuple]:
+        """Booking rows matching all given criteria (None matches any), in booking order"""
+        # Start from the smallest index that applies
+        if candidate is not None:
+            booking_ids = self.by_candidate.get(candidate, ())
+        elif recruiter is not None:
+            booking_ids = self.by_recruiter.get(recruiter, ())
+        elif slot is not None:
+            booking_ids = self.by_slot.get(slot, ())
+        else:
+            booking_ids = self.bookings.keys()
+
+        rows = []
+        for booking_id in sorted(booking_ids):
+            cand, rec, booked_slot, time_str = self.bookings[booking_id]
+            if recruiter is not None and rec != recruiter:
+                continue
+            if slot is not None and booked_slot != slot:
+                continue
+            rows.append((booking_id, cand, rec, booked_slot, time_str))
+        return rows
+
+    def count(self, candidate: str = None, recruiter: str = None) -> int:
+        """Number of bookings of a candidate or of a recruiter"""
+        if candidate is not None:
+            return len(self.by_candidate.get(candidate, ()))
+        return len(self.by_recruiter.get(recruiter, ()))
+
+    def is_booked(self, slot: int, candidate: str = None, recruiter: str = None) -> bool:
+        """
+        Whether a candidate or a recruiter already has an interview at slot; a slot of
+        None matches their bookings whose time could not be resolved
+        """
+        if candidate is not None:
+            booking_ids = self.by_candidate.get(candidate, ())
+        else:
+            booking_ids = self.by_recruiter.get(recruiter, ())
+        return any(self.bookings[booking_id][2] == slot for booking_id in booking_ids)
+
+    def rows(self) -> list[tuple]:
+        """Every booking as (candidate, recruiter, slot, formatted time), in booking order"""
+        return list(self.bookings.values())
+
+    def clear(self) -> None:
+        """Cancel every booking"""
+        self.bookings.clear()
+        self.by_candidate.clear()
+        self.by_recruiter.clear()
+        self.by_slot.clear()
+
+
+class SQLiteScheduleStore:
+    """
+    Bookings kept in a local SQLite database.
+
+    Bookings are indexed by (candidate, slot), (recruiter, slot) and by the full
+    assignment, so conflict checks and lookups are index queries instead of scans
+    of the whole schedule. Each process opens its own store on the same file;
+    transaction() takes the database write lock up front, so adjustments made by
+    separate worker processes are serialized and each one sees the bookings
+    committed before it.
+
+    Usage:
+        with SQLiteScheduleStore("schedule.db") as store:
+            state = SchedulerState(candidates, recruiters, 30, 2, 2, store=store)
+            with store.transaction():
+                state.reschedule(candidate="Alice")
+    """
+
+    SCHEMA = """
+        CREATE TABLE IF NOT EXISTS bookings (
+            id INTEGER PRIMARY KEY,
+            candidate TEXT NOT NULL,
+            recruiter TEXT NOT NULL,
+            slot INTEGER,
+            time_str TEXT NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS bookings_candidate_slot ON bookings (candidate, slot);
+        CREATE INDEX IF NOT EXISTS bookings_recruiter_slot ON bookings (recruiter, slot);
+        CREATE INDEX IF NOT EXISTS bookings_assignment ON bookings (candidate, recruiter, slot);
+        CREATE INDEX IF NOT EXISTS bookings_slot ON bookings (slot);
+    """
+
+    def __init__(self, path: str, timeout: float = 30.0):
+        """
+        Args:
+            path: database file, created if missing (":memory:" for a private database)
+            timeout: seconds to wait for another process's write lock
+        """
+        self.path = path
+        # Autocommit mode: transactions are started explicitly by transaction()
+        self.connection = sqlite3.connect(path, timeout=timeout, isolation_level=None)
+        if path != ":memory:":
+            # Readers do not block the writer (and vice versa) across processes
+            self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(self.SCHEMA)
+        self._depth = 0
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    @contextmanager
+    def transaction(self):
+        """
+        Run the enclosed block as one transaction, committed at the end or rolled
+        back on error. Nested blocks join the outermost transaction.
+        """
+        if self._depth:
+            self._depth += 1
+            try:
+                yield self
+            finally:
+                self._depth -= 1
+            return
+
+        self.connection.execute("BEGIN IMMEDIATE")
+        self._depth = 1
+        try:
+            yield self
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        else:
+            self.connection.execute("COMMIT")
+        finally:
+            self._depth = 0
+
+    def add(self, candidate: str, recruiter: str, slot: Optional[int], time_str: str) -> int:
+        """Book an interview and return its booking id"""
+        cursor = self.connection.execute(
+            "INSERT INTO bookings (candidate, recruiter, slot, time_str) VALUES (?, ?, ?, ?)",
+            (candidate, recruiter, slot, time_str))
+        return cursor.lastrowid
+
+    def add_many(self, rows: Iterable[tuple]) -> None:
+        """Book (candidate, recruiter, slot, formatted time) rows in order, in one transaction"""
+        with self.transaction():
+            self.connection.executemany(
+                "INSERT INTO bookings (candidate, recruiter, slot, time_str) VALUES (?, ?, ?, ?)", rows)
+
+    def remove(self, booking_id: int) -> tuple:
+        """Cancel a booking and return its (candidate, recruiter, slot, formatted time)"""
+        with self.transaction():
+            row = self.connection.execute(
+                "SELECT candidate, recruiter, slot, time_str FROM bookings WHERE id = ?", (booking_id,)).fetchone()
+            if row is None:
+                raise KeyError(booking_id)
+            self.connection.execute("DELETE FROM bookings WHERE id = ?", (booking_id,))
+        return row
+
+    def find(self, candidate: str = None, recruiter: str = None, slot: int = None) -> list[tuple]:
+        """Booking rows matching all given criteria (None matches any), in booking order"""
+        conditions = []
+        params = []
+        for column, value in (("candidate", candidate), ("recruiter", recruiter), ("slot", slot)):
+            if value is not None:
+                conditions.append(f"{column} = ?")
+                params.append(value)
+        where = " WHERE " + " AND ".join(conditions) if conditions else ""
+        return self.connection.execute(
+            f"SELECT id, candidate, recruiter, slot, time_str FROM bookings{where} ORDER BY id", params).fetchall()
+
+    def count(self, candidate: str = None, recruiter: str = None) -> int:
+        """Number of bookings of a candidate or of a recruiter"""
+        column, value = ("candidate", candidate) if candidate is not None else ("recruiter", recruiter)
+        return self.connection.execute(f"SELECT COUNT(*) FROM bookings WHERE {column} = ?", (value,)).fetchone()[0]
+
+    def is_booked(self, slot: int, candidate: str = None, recruiter: str = None) -> bool:
+        """
+        Whether a candidate or a recruiter already has an interview at slot; a slot of
+        None matches their bookings whose time could not be resolved
+        """
+        column, value = ("candidate", candidate) if candidate is not None else ("recruiter", recruiter)
+        return self.connection.execute(
+            f"SELECT 1 FROM bookings WHERE {column} = ? AND slot IS ? LIMIT 1", (value, slot)).fetchone() is not None
+
+    def rows(self) -> list[tuple]:
+        """Every booking as (candidate, recruiter, slot, formatted time), in booking order"""
+        return self.connection.execute(
+            "SELECT candidate, recruiter, slot, time_str FROM bookings ORDER BY id").fetchall()
+
+    def clear(self) -> None:
+        """Cancel every booking"""
+        self.connection.execute("DELETE FROM bookings")
@@ -0,0 +1,229 @@
+from collections import defaultdict
+from algos.schedule_store import MemoryScheduleStore
+from utils.time_paraser import parse_multi_day_slot_minutes, format_slot, resolve_slot
+
+
+class SchedulerState:
+    """
+    Persistent, indexed view of an interview schedule.
+
+    Bookings are indexed by candidate, by recruiter and by slot, and availability
+    is kept as an inverted index from slot to the people free then. Cancel, add
+    and reschedule therefore only touch the affected people and slots instead of
+    rebuilding the whole schedule.
+
+    Bookings live in a store: in memory by default, or a SQLiteScheduleStore shared
+    with other processes, in which case every check and change is a query on it.
+    """
+
+    def __init__(
+        self,
+        candidates: dict[str, dict],
+        recruiters: dict[str, dict],
+        slot_length_minutes: int,
+        max_interviews_per_candidate: int,
+        max_interviews_per_recruiter: int,
+        store=None
+    ):
+        """
+        Args:
+            candidates: dict mapping candidate name to {"availability": [...], "timezone": ...}
+            recruiters: dict mapping recruiter name to {"availability": [...], "timezone": ...}
+            slot_length_minutes: fixed duration of each interview slot
+            max_interviews_per_candidate: maximum interviews allowed per candidate
+            max_interviews_per_recruiter: maximum interviews allowed per recruiter
+            store: where bookings are kept (default: a new MemoryScheduleStore); existing
+                bookings in the store are kept as they are, even where they no longer fit
+                the given availability, and the store is not written to
+        """
+        self.slot_length_minutes = slot_length_minutes
+        self.max_interviews_per_candidate = max_interviews_per_candidate
+        self.max_interviews_per_recruiter = max_interviews_per_recruiter
+
+        self.candidates = {}
+        self.recruiters = {}
+        self.candidate_slots = {}
+        self.recruiter_slots = {}
+        self.candidates_at = defaultdict(set)  # slot -> candidates free then
+        self.recruiters_at = defaultdict(set)  # slot -> recruiters free then
+        self.candidate_order = {}  # name -> position, to break ties in input order
+        self.recruiter_order = {}
+
+        self.store = store if store is not None else MemoryScheduleStore()
+
+        for cand, data in candidates.items():
+            self._index_person(cand, data, self.candidates, self.candidate_slots,
+                               self.candidates_at, self.candidate_order)
+        for rec, data in recruiters.items():
+            self._index_person(rec, data, self.recruiters, self.recruiter_slots,
+                               self.recruiters_at, self.recruiter_order)
+
+    @classmethod
+    def from_schedule(
+        cls,
+        scheduled: list[list[str]],
+        candidates: dict[str, dict],
+        recruiters: dict[str, dict],
+        slot_length_minutes: int,
+        max_interviews_per_candidate: int,
+        max_interviews_per_recruiter: int,
+        store=None
+    ) -> "SchedulerState":
+        """
+        Builds a state from an existing [candidate, recruiter, time_slot] schedule.
+        Time strings are matched back to slots using the candidate's or the
+        recruiter's time zone; bookings that cannot be resolved are kept as-is.
+        The schedule replaces any bookings already in the store, in one batched write.
+        """
+        state = cls(candidates, recruiters, slot_length_minutes,
+                    max_interviews_per_candidate, max_interviews_per_recruiter, store)
+        with state.store.transaction():
+            state.store.clear()
+            state.store.add_many((cand, rec, state._resolve_slot(cand, rec, time_str), time_str)
+                                 for cand, rec, time_str in scheduled)
+        return state
+
+    # ---------------------- AVAILABILITY ----------------------
+
+    def set_candidate(self, name: str, data: dict) -> list[list[str]]:
+        """
+        Adds a candidate or replaces their availability. Bookings that no longer fit
+        the new availability are cancelled and returned.
+        """
+        return self._set_person(name, data, self.candidates, self.candidate_slots,
+                                self.candidates_at, self.candidate_order, "candidate")
+
+    def set_recruiter(self, name: str, data: dict) -> list[list[str]]:
+        """
+        Adds a recruiter or replaces their availability. Bookings that no longer fit
+        the new availability are cancelled and returned.
+        """
+        return self._set_person(name, data, self.recruiters, self.recruiter_slots,
+                                self.recruiters_at, self.recruiter_order, "recruiter")
+
+    def _set_person(self, name, data, people, person_slots, people_at, order, role):
+        slots = self._index_person(name, data, people, person_slots, people_at, order)
+        with self.store.transaction():
+            stale = [booking_id for booking_id, _, _, slot, _ in self.store.find(**{role: name})
+                     if slot is not None and slot not in slots]
+            return [self._remove_booking(booking_id) for booking_id in stale]
+
+    def _index_person(self, name, data, people, person_slots, people_at, order):
+        # Availability only; bookings are left to the caller
+        for slot in person_slots.get(name, ()):
+            people_at[slot].discard(name)
+
+        slots = parse_multi_day_slot_minutes(data["availability"], self.slot_length_minutes, data["timezone"])
+        people[name] = data
+        order.setdefault(name, len(order))
+        person_slots[name] = slots
+        for slot in slots:
+            people_at[slot].add(name)
+        return slots
+
+    # ---------------------- ADJUSTMENTS ----------------------
+
+    def cancel(self, candidate: str = None, recruiter: str = None, time_slot=None) -> list[list[str]]:
+        """
+        Cancels every booking matching all given criteria.
+
+        Args:
+            candidate: only cancel this candidate's bookings
+            recruiter: only cancel this recruiter's bookings
+            time_slot: a slot in UTC minutes, or a substring of the formatted time
+
+        Returns:
+            The cancelled bookings as [candidate, recruiter, time_slot]
+        """
+        with self.store.transaction():
+            rows = self.store.find(candidate or None, recruiter or None,
+                                   time_slot if isinstance(time_slot, int) else None)
+            matching = [booking_id for booking_id, _, _, _, time_str in rows
+                        if not isinstance(time_slot, str) or time_slot in time_str]
+            return [self._remove_booking(booking_id) for booking_id in matching]
+
+    def add(self, candidate: str = None, recruiter: str = None) -> list[list[str]]:
+        """
+        Books as many new interviews as the caps allow for the given candidate
+        and/or recruiter, earliest free slot first, without touching existing bookings.
+        With neither given, every candidate is topped up in input order.
+
+        Returns:
+            The new bookings as [candidate, recruiter, time_slot]
+        """
+        with self.store.transaction():
+            if candidate:
+                return self._fill(candidate, recruiter, self.candidate_slots, self.recruiters_at, 0)
+            if recruiter:
+                return self._fill(recruiter, None, self.recruiter_slots, self.candidates_at, 1)
+
+            added = []
+            for cand in self.candidates:
+                added.extend(self._fill(cand, None, self.candidate_slots, self.recruiters_at, 0))
+            return added
+
+    def reschedule(self, candidate: str = None, recruiter: str = None, time_slot=None) -> list[list[str]]:
+        """
+        Cancels the matching bookings, then books new interviews for the same
+        candidate and/or recruiter.
+
+        Returns:
+            The new bookings as [candidate, recruiter, time_slot]
+        """
+        with self.store.transaction():
+            self.cancel(candidate, recruiter, time_slot)
+            if not candidate and not recruiter:
+                return []
+            return self.add(candidate, recruiter)
+
+    def to_schedule(self) -> list[list[str]]:
+        """
+        Returns the schedule as [candidate, recruiter, time_slot], in booking order.
+        """
+        return [[cand, rec, time_str] for cand, rec, _, time_str in self.store.rows()]
+
+    # ---------------------- INTERNALS ----------------------
+
+    def is_free(self, candidate: str, recruiter: str, slot: int) -> bool:
+        """
+        Checks that both people are available, unbooked and under their caps at slot.
+        """
+        return (
+            slot in self.candidate_slots.get(candidate, ()) and
+            slot in self.recruiter_slots.get(recruiter, ()) and
+            self.store.count(candidate=candidate) < self.max_interviews_per_candidate and
+            self.store.count(recruiter=recruiter) < self.max_interviews_per_recruiter and
+            not self.store.is_booked(slot, candidate=candidate) and
+            not self.store.is_booked(slot, recruiter=recruiter)
+        )
+
+    def _fill(self, person, partner, person_slots, partners_at, side):
+        cap = self.max_interviews_per_candidate if side == 0 else self.max_interviews_per_recruiter
+        role = "candidate" if side == 0 else "recruiter"
+        partner_order = self.recruiter_order if side == 0 else self.candidate_order
+
+        added = []
+        for slot in sorted(person_slots.get(person, ())):
+            if self.store.count(**{role: person}) >= cap:
+                break
+            if partner:
+                others = [partner] if partner in partners_at.get(slot, ()) else []
+            else:
+                others = sorted(partners_at.get(slot, ()), key=partner_order.get)
+            for other in others:
+                cand, rec = (person, other) if side == 0 else (other, person)
+                if self.is_free(cand, rec, slot):
+                    added.append(self._add_booking(cand, rec, slot, format_slot(slot, self.candidates[cand]["timezone"])))
+                    break
+        return added
+
+    def _add_booking(self, cand, rec, slot, time_str):
+        self.store.add(cand, rec, slot, time_str)
+        return [cand, rec, time_str]
+
+    def _remove_booking(self, booking_id):
+        cand, rec, _, time_str = self.store.remove(booking_id)
+        return [cand, rec, time_str]
+
+    def _resolve_slot(self, cand, rec, time_str):
+        return resolve_slot(time_str, self.candidates.get(cand), self.recruiters.get(rec))
@@ -0,0 +1,58 @@
+import sys
+import os
+# Add project root directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from datetime import timedelta
+
+from algos.anytime import anytime_schedule_interviews
+from tests.benchmark_test import BASE_DATE, generate_case
+from tests.engine_consistency_test import check_schedule
+
+# Headroom over the budget for timer noise and process start-up on a loaded machine
+TOLERANCE = 1.25
+
+def disjoint_case(num_components, num_candidates):
+    """One case per week, so the instance splits into at least num_components components"""
+    candidates, recruiters = {}, {}
+    for week in range(num_components):
+        part = generate_case(week, num_candidates, 2, 15, BASE_DATE + timedelta(weeks=week))
+        candidates.update((f"W{week}-{name}", data) for name, data in part[0].items())
+        recruiters.update((f"W{week}-{name}", data) for name, data in part[1].items())
+    return (candidates, recruiters) + part[2:]
+
+def check_budget(label, case, time_budget_ms, **options):
+    """Problems with an anytime solve: over budget, empty, infeasible or above its bound"""
+    result = anytime_schedule_interviews(*case, time_budget_ms=time_budget_ms, **options)
+    print(f"{label}: {result['interviews']} interviews, bound {result['upper_bound']}, "
+          f"{result['elapsed_ms']:.0f} ms of {time_budget_ms}")
+    problems = check_schedule(result["schedule"], case)
+    if result["elapsed_ms"] > time_budget_ms * TOLERANCE:
+        problems.append(f"took {result['elapsed_ms']:.0f} ms")
+    if not result["interviews"]:
+        problems.append("no interviews booked")
+    if result["upper_bound"] < result["interviews"]:
+        problems.append(f"bound {result['upper_bound']} below {result['interviews']} interviews")
+    return problems
+
+def main():
+    """Check that anytime solves keep to their budget and still book interviews"""
+    failures = 0
+    large = generate_case(0, 10000, 10, 15)  # parsing alone takes about the whole budget
+    split = disjoint_case(6, 300)  # more components than workers
+    runs = [
+        ("10000 candidates, bipartite", large, 500, {"method": "bipartite"}),
+        ("10000 candidates, networkflow", large, 500, {"method": "networkflow"}),
+        ("6 components, bipartite, 2 workers", split, 300, {"method": "bipartite", "max_workers": 2}),
+        ("6 components, networkflow, 2 workers", split, 300, {"method": "networkflow", "max_workers": 2}),
+    ]
+    for label, case, time_budget_ms, options in runs:
+        for problem in check_budget(label, case, time_budget_ms, **options):
+            failures += 1
+            print(f"FAIL {label}: {problem}")
+
+    print(f"{failures} failure(s)")
+    return failures
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
@@ -0,0 +1,209 @@
+import sys
+import os
+# Add project root directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import argparse
+import json
+import platform
+import random
+import subprocess
+import time
+import tracemalloc
+from datetime import datetime
+from functools import partial
+from typing import Dict, List, Any
+
+from tests.random_sample_test import TestCaseGenerator
+
+# Import the scheduling algorithms
+from algos.networkflow import schedule_interviews as networkflow_schedule
+from algos.bipartite import schedule_interviews as bipartite_schedule
+from algos.greedy import greedy_schedule_interviews as greedy_schedule
+from algos.intervals import interval_schedule_interviews as intervals_schedule
+
+# Every engine and option worth measuring; the first three are the defaults
+# (bipartite runs algorithm="phases")
+METHODS = {
+    "greedy": greedy_schedule,
+    "bipartite": bipartite_schedule,
+    "networkflow": networkflow_schedule,
+    "greedy_dedupe": partial(greedy_schedule, dedupe_profiles=True),
+    "greedy_parallel": partial(greedy_schedule, max_workers=os.cpu_count()),
+    "bipartite_hopcroft_karp": partial(bipartite_schedule, algorithm="hopcroft_karp"),
+    "bipartite_dedupe": partial(bipartite_schedule, dedupe_profiles=True),
+    "bipartite_parallel": partial(bipartite_schedule, max_workers=os.cpu_count()),
+    "networkflow_dinic": partial(networkflow_schedule, algorithm="dinic"),
+    "networkflow_push_relabel": partial(networkflow_schedule, algorithm="push_relabel"),
+    "networkflow_dedupe": partial(networkflow_schedule, dedupe_profiles=True),
+    "networkflow_parallel": partial(networkflow_schedule, max_workers=os.cpu_count()),
+    # Places interviews on a start-time grid, so its counts are not comparable one to one
+    "intervals": intervals_schedule
+}
+DEFAULT_METHODS = ["greedy", "bipartite", "networkflow"]
+
+# A Monday well clear of DST changes, so seeded cases are the same on every run
+BASE_DATE = datetime(2025, 1, 6)
+
+DEFAULT_SIZES = [10, 30, 100, 300, 1000, 3000, 10000]
+DEFAULT_DAYS = [5, 10]
+DEFAULT_SLOT_LENGTHS = [15, 30, 60]
+
+def generate_case(seed, num_candidates, num_days, slot_length, base_date=BASE_DATE):
+    """
+    Generate a benchmark case at a fixed seed and start date.
+
+    Recruiters scale with candidates (one per five), and caps stay fixed so that
+    only size, horizon and granularity vary between cases.
+    """
+    random.seed(seed)
+    generator = TestCaseGenerator(base_date)
+    return generator.generate_test_case(
+        num_candidates=num_candidates,
+        num_recruiters=max(2, num_candidates // 5),
+        num_days=num_days,
+        max_slots_per_day=2,
+        slot_length_minutes=slot_length,
+        max_interviews_per_candidate=2,
+        max_interviews_per_recruiter=5
+    )
+
+def measure(schedule_func, test_case, repeat=1, memory=True) -> Dict[str, Any]:
+    """
+    Time a scheduler (best of repeat runs) and, separately, trace its peak memory,
+    so the tracing overhead does not distort the timing.
+    """
+    wall_times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = schedule_func(*test_case)
+        wall_times.append(time.perf_counter() - start)
+
+    peak_memory = None
+    if memory:
+        tracemalloc.start()
+        schedule_func(*test_case)
+        _, peak_memory = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+    return {
+        "wall_seconds": min(wall_times),
+        "peak_memory_bytes": peak_memory,
+        "interviews": len(result)
+    }
+
+def run_benchmarks(methods, sizes, days, slot_lengths, seed=0, repeat=1,
+                   memory=True, max_seconds=60.0, base_date=BASE_DATE) -> List[Dict[str, Any]]:
+    """
+    Run every method over the grid of sizes, horizons and slot lengths.
+
+    Once a method takes longer than max_seconds on a case (or fails on it), larger
+    sizes with the same horizon and slot length are skipped for it: the knee has
+    been found.
+    """
+    records = []
+    for num_days in days:
+        for slot_length in slot_lengths:
+            too_slow = set()
+            for num_candidates in sizes:
+                test_case = generate_case(seed, num_candidates, num_days, slot_length, base_date)
+                for method_name in methods:
+                    if method_name in too_slow:
+                        continue
+                    record = {
+                        "algorithm": method_name,
+                        "num_candidates": num_candidates,
+                        "num_recruiters": len(test_case[1]),
+                        "num_days": num_days,
+                        "slot_length_minutes": slot_length,
+                        "seed": seed
+                    }
+                    try:
+                        record.update(measure(METHODS[method_name], test_case, repeat, memory))
+                    except Exception as e:
+                        # Record the failure (e.g. recursion limits) and stop growing this method
+                        record["error"] = f"{type(e).__name__}: {e}"
+                        records.append(record)
+                        too_slow.add(method_name)
+                        print(f"{method_name:24s} n={num_candidates:<6d} days={num_days:<3d} slot={slot_length:<3d} "
+                              f"error: {record['error']}")
+                        continue
+                    records.append(record)
+                    print(f"{method_name:24s} n={num_candidates:<6d} days={num_days:<3d} slot={slot_length:<3d} "
+                          f"{record['wall_seconds']:9.4f}s  {record['interviews']:7d} interviews"
+                          + (f"  {record['peak_memory_bytes'] / 2**20:8.1f} MiB" if memory else ""))
+                    if record["wall_seconds"] > max_seconds:
+                        too_slow.add(method_name)
+    return records
+
+def compare(baseline_records, records):
+    """Print the wall time and memory ratios against a previous run"""
+    def key(record):
+        return (record["algorithm"], record["num_candidates"], record["num_days"],
+                record["slot_length_minutes"], record["seed"])
+
+    baseline = {key(record): record for record in baseline_records}
+    print("\n=== Comparison with baseline (new / old) ===")
+    for record in records:
+        old = baseline.get(key(record))
+        if not old or "error" in old or "error" in record:
+            continue
+        line = (f"{record['algorithm']:24s} n={record['num_candidates']:<6d} days={record['num_days']:<3d} "
+                f"slot={record['slot_length_minutes']:<3d} time x{record['wall_seconds'] / max(old['wall_seconds'], 1e-9):6.2f}")
+        if record["peak_memory_bytes"] and old["peak_memory_bytes"]:
+            line += f"  memory x{record['peak_memory_bytes'] / old['peak_memory_bytes']:6.2f}"
+        if record["interviews"] != old["interviews"]:
+            line += f"  interviews {old['interviews']} -> {record['interviews']}"
+        print(line)
+
+def git_revision():
+    """Current commit of the repository, if available"""
+    try:
+        return subprocess.run(["git", "rev-parse", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+def main():
+    """Run the benchmark grid and write the results as JSON"""
+    parser = argparse.ArgumentParser(description="Benchmark the scheduling algorithms")
+    parser.add_argument("--algorithms", nargs="+", choices=list(METHODS) + ["all"], default=DEFAULT_METHODS,
+                        help="methods to run, or all (default: %(default)s)")
+    parser.add_argument("--sizes", nargs="+", type=int, default=DEFAULT_SIZES, help="numbers of candidates")
+    parser.add_argument("--days", nargs="+", type=int, default=DEFAULT_DAYS, help="horizon lengths in days")
+    parser.add_argument("--slot-lengths", nargs="+", type=int, default=DEFAULT_SLOT_LENGTHS, help="slot granularities in minutes")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base-date", type=datetime.fromisoformat, default=BASE_DATE,
+                        help="first day of the generated availability (YYYY-MM-DD)")
+    parser.add_argument("--repeat", type=int, default=1, help="timed runs per case (best is kept)")
+    parser.add_argument("--max-seconds", type=float, default=60.0, help="stop growing a method past this time")
+    parser.add_argument("--no-memory", action="store_true", help="skip the tracemalloc pass")
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--compare", help="previous JSON output to compare against")
+    args = parser.parse_args()
+    methods = list(METHODS) if "all" in args.algorithms else args.algorithms
+
+    records = run_benchmarks(methods, args.sizes, args.days, args.slot_lengths, seed=args.seed,
+                             repeat=args.repeat, memory=not args.no_memory, max_seconds=args.max_seconds,
+                             base_date=args.base_date)
+
+    output = {
+        "meta": {
+            "commit": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "base_date": args.base_date.date().isoformat(),
+            "timestamp": datetime.now().isoformat(timespec="seconds")
+        },
+        "results": records
+    }
+    with open(args.output, "w") as f:
+        json.dump(output, f, indent=2)
+    print(f"\nWrote {len(records)} results to {args.output}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            compare(json.load(f)["results"], records)
+
+if __name__ == "__main__":
+    main()
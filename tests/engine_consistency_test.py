@@ -0,0 +1,162 @@
+import sys
+import os
+# Add project root directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import random
+from collections import Counter
+from datetime import datetime
+
+from algos.bipartite import schedule_interviews as bipartite_schedule
+from algos.greedy import greedy_schedule_interviews as greedy_schedule
+from algos.intervals import interval_schedule_interviews as interval_schedule
+from algos.networkflow import schedule_interviews as networkflow_schedule
+from utils.time_paraser import parse_availability_intervals, parse_multi_day_slot_minutes, resolve_slot
+from tests.random_sample_test import TestCaseGenerator
+
+# A Monday well clear of DST changes, so seeded cases are the same on every run
+BASE_DATE = datetime(2025, 1, 6)
+
+# Engines that must all find a maximum schedule, by name
+MAXIMUM_ENGINES = {
+    "bipartite phases": lambda case, warm: bipartite_schedule(*case, algorithm="phases"),
+    "bipartite hopcroft_karp": lambda case, warm: bipartite_schedule(*case, algorithm="hopcroft_karp"),
+    "bipartite dedupe": lambda case, warm: bipartite_schedule(*case, dedupe_profiles=True),
+    "bipartite max_workers": lambda case, warm: bipartite_schedule(*case, max_workers=2),
+    "bipartite warm start": lambda case, warm: bipartite_schedule(*case, initial_schedule=warm),
+    "networkflow edmonds_karp": lambda case, warm: networkflow_schedule(*case, algorithm="edmonds_karp"),
+    "networkflow dinic": lambda case, warm: networkflow_schedule(*case, algorithm="dinic"),
+    "networkflow push_relabel": lambda case, warm: networkflow_schedule(*case, algorithm="push_relabel"),
+    "networkflow dedupe": lambda case, warm: networkflow_schedule(*case, dedupe_profiles=True),
+    "networkflow max_workers": lambda case, warm: networkflow_schedule(*case, max_workers=2),
+    "networkflow warm start": lambda case, warm: networkflow_schedule(*case, initial_schedule=warm),
+}
+
+def generate_case(seed):
+    """A small random case; duplicate profiles are common at this size"""
+    random.seed(seed)
+    generator = TestCaseGenerator(BASE_DATE)
+    return generator.generate_test_case(
+        num_candidates=random.randint(1, 20),
+        num_recruiters=random.randint(1, 6),
+        num_days=random.randint(1, 3),
+        max_slots_per_day=random.randint(1, 3),
+        slot_length_minutes=random.choice([15, 30, 60]),
+        max_interviews_per_candidate=random.randint(1, 3),
+        max_interviews_per_recruiter=random.randint(1, 4)
+    )
+
+def check_schedule(schedule, case):
+    """
+    Problems with a schedule: unknown people, caps exceeded, a person booked twice at
+    one time, or a time outside either person's availability.
+    """
+    candidates, recruiters, slot_length, max_cand, max_rec = case
+    available = {}
+    for people in (candidates, recruiters):
+        for name, data in people.items():
+            available[name] = parse_multi_day_slot_minutes(data["availability"], slot_length, data["timezone"])
+
+    problems = []
+    bookings = Counter()  # (person, slot) -> interviews; times may be shown in either time zone
+    for cand, rec, time_str in schedule:
+        if cand not in candidates or rec not in recruiters:
+            problems.append(f"unknown people in {(cand, rec, time_str)}")
+            continue
+        slot = resolve_slot(time_str, candidates[cand], recruiters[rec])
+        if slot is None or slot not in available[cand] or slot not in available[rec]:
+            problems.append(f"{time_str} is not free for both {cand} and {rec}")
+        bookings[cand, slot] += 1
+        bookings[rec, slot] += 1
+
+    for name, count in Counter(cand for cand, _, _ in schedule).items():
+        if count > max_cand:
+            problems.append(f"{name} has {count} interviews (cap {max_cand})")
+    for name, count in Counter(rec for _, rec, _ in schedule).items():
+        if count > max_rec:
+            problems.append(f"{name} has {count} interviews (cap {max_rec})")
+    for (name, slot), count in bookings.items():
+        if slot is not None and count > 1:
+            problems.append(f"{name} is booked {count} times at slot {slot}")
+    return problems
+
+def check_interval_schedule(schedule, case):
+    """
+    Problems with a schedule of the interval engine, whose start times follow a UTC
+    grid rather than each range's slots: unknown people, caps exceeded, interviews of
+    one person that overlap, or an interview not inside both people's availability.
+    """
+    candidates, recruiters, slot_length, max_cand, max_rec = case
+    intervals = {}
+    for people in (candidates, recruiters):
+        for name, data in people.items():
+            intervals[name] = parse_availability_intervals(data["availability"], data["timezone"])
+
+    problems = []
+    starts = {}  # person -> interview starts
+    for cand, rec, time_str in schedule:
+        if cand not in candidates or rec not in recruiters:
+            problems.append(f"unknown people in {(cand, rec, time_str)}")
+            continue
+        start = resolve_slot(time_str, candidates[cand], recruiters[rec])
+        for name in (cand, rec):
+            if start is None or not any(s <= start and start + slot_length <= e for s, e in intervals[name]):
+                problems.append(f"{time_str} is not inside the availability of {name}")
+            starts.setdefault(name, []).append(start if start is not None else 0)
+
+    for name, person_starts in starts.items():
+        cap = max_cand if name in candidates else max_rec
+        if len(person_starts) > cap:
+            problems.append(f"{name} has {len(person_starts)} interviews (cap {cap})")
+        person_starts.sort()
+        for earlier, later in zip(person_starts, person_starts[1:]):
+            if later - earlier < slot_length:
+                problems.append(f"{name} has overlapping interviews at {earlier} and {later}")
+    return problems
+
+def check_interval_repeats():
+    """A pair free together for three slots meets three times, as with greedy"""
+    free = {"availability": ["2025-01-07 09:00-12:00"], "timezone": "EST"}
+    case = ({"Alice": free}, {"R1": free}, 30, 3, 3)
+    schedule = interval_schedule(*case)
+    problems = check_interval_schedule(schedule, case)
+    if len(schedule) != len(greedy_schedule(*case)):
+        problems.append(f"booked {len(schedule)}, greedy {len(greedy_schedule(*case))}")
+    return problems
+
+def main(num_cases=60):
+    """Check every engine and option for feasibility and equal maximum cardinality"""
+    failures = 0
+    for seed in range(num_cases):
+        case = generate_case(seed)
+        warm = greedy_schedule(*case)
+        results = {"greedy": warm}
+        results.update((name, engine(case, warm)) for name, engine in MAXIMUM_ENGINES.items())
+
+        for name, schedule in results.items():
+            for problem in check_schedule(schedule, case):
+                failures += 1
+                print(f"FAIL seed {seed} {name}: {problem}")
+
+        sizes = {name: len(results[name]) for name in MAXIMUM_ENGINES}
+        if len(set(sizes.values())) > 1:
+            failures += 1
+            print(f"FAIL seed {seed}: interview counts differ: {sizes}")
+        if len(warm) > max(sizes.values()):
+            failures += 1
+            print(f"FAIL seed {seed}: greedy booked {len(warm)}, more than the maximum {max(sizes.values())}")
+
+        # Not on the slot grid, so only feasibility is comparable
+        for problem in check_interval_schedule(interval_schedule(*case), case):
+            failures += 1
+            print(f"FAIL seed {seed} intervals: {problem}")
+
+    for problem in check_interval_repeats():
+        failures += 1
+        print(f"FAIL intervals repeat: {problem}")
+
+    print(f"{num_cases} cases, {len(MAXIMUM_ENGINES)} maximum engines, {failures} failure(s)")
+    return failures
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
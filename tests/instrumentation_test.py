@@ -0,0 +1,57 @@
+import sys
+import os
+# Add project root directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from algos.networkflow import MaxFlow
+from utils.instrumentation import get_instrumentation, instrument
+
+def diamond():
+    """Source to sink through two disjoint paths of capacity 1: two augmentations"""
+    network = MaxFlow(["s", "a", "b", "t"])
+    for u, v in (("s", "a"), ("s", "b"), ("a", "t"), ("b", "t")):
+        network.add_edge(u, v, 1)
+    return network
+
+def expect(label, actual, expected):
+    ok = actual == expected
+    print(f"{'ok  ' if ok else 'FAIL'} {label}: {actual}" + ("" if ok else f" (expected {expected})"))
+    return not ok
+
+def main():
+    """Check the counters and spans recorded around a small max-flow solve"""
+    failures = 0
+
+    print("=== Ford-Fulkerson to completion ===")
+    with instrument() as stats:
+        with get_instrumentation().span("solve"):
+            flow = diamond().ford_fulkerson("s", "t")
+    counters = stats.to_dict()["counters"]
+    failures += expect("flow", flow, 2)
+    failures += expect("augmentations", counters["maxflow.augmentations"], 2)
+    # One search per augmenting path, and a last one that finds none
+    failures += expect("bfs runs", counters["maxflow.bfs_runs"], 3)
+    failures += expect("deadline hits", counters.get("maxflow.deadline_hits", 0), 0)
+    failures += expect("spans", [span["name"] for span in stats.to_dict()["spans"]], ["solve"])
+
+    print("\n=== Ford-Fulkerson stopped by its deadline ===")
+    with instrument() as stats:
+        network = diamond()
+        flow = network.ford_fulkerson("s", "t", deadline=0)  # already passed
+    counters = stats.to_dict()["counters"]
+    failures += expect("flow", flow, 1)
+    failures += expect("finished", network.finished, False)
+    failures += expect("augmentations", counters["maxflow.augmentations"], 1)
+    # The search after the first path never runs
+    failures += expect("bfs runs", counters["maxflow.bfs_runs"], 1)
+    failures += expect("deadline hits", counters["maxflow.deadline_hits"], 1)
+
+    print("\n=== Outside instrument() ===")
+    diamond().ford_fulkerson("s", "t")
+    failures += expect("counters recorded", hasattr(get_instrumentation(), "counters"), False)
+
+    print(f"\n{failures} failure(s)")
+    return failures
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
@@ -0,0 +1,87 @@
+import sys
+import os
+# Add project root directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from utils.message_parser import MessageParser
+from utils.parse_cache import ParseCache
+
+# (location text, expected zone); the default for unknown locations is America/New_York
+LOCATION_CASES = [
+    ("Boston", "America/New_York"),
+    ("our office is in the Tech Center, Boston", "America/New_York"),
+    ("Center", "America/New_York"),
+    ("Wake Forest", "America/New_York"),
+    ("Easter Road, Edinburgh", "Europe/London"),
+    ("Casey's building, Denver", "America/Denver"),
+    ("Davis Square, Seattle", "America/Los_Angeles"),
+    ("Palmer House, Chicago", "America/Chicago"),
+    ("Troll Street, Berlin", "Europe/Berlin"),
+    ("New Jersey", "America/New_York"),
+    ("Atlanta, Georgia", "America/New_York"),
+    ("Georgia", "America/New_York"),
+    ("Tbilisi, Georgia", "Asia/Tbilisi"),
+    ("Lyon, France", "Europe/Paris"),
+    ("Bengaluru, India", "Asia/Kolkata"),
+    ("Remote from Nairobi", "Africa/Nairobi"),
+    ("Nomenclature House", "America/New_York"),
+]
+
+# (timezone text in a message, expected zone)
+TIMEZONE_CASES = [
+    ("All times are in EST", "America/New_York"),
+    ("All times are in AEST", "Australia/Sydney"),
+    ("My timezone is CEST", "Europe/Paris"),
+    ("Times listed are in Europe/Berlin", "Europe/Berlin"),
+    ("Located in Sydney (AEDT)", "Australia/Sydney"),
+]
+
+def main():
+    """Check location and timezone inference against known cases"""
+    parser = MessageParser()
+    failures = 0
+
+    print("=== Location inference ===")
+    for location, expected in LOCATION_CASES:
+        zone = parser._infer_timezone_from_location(location)
+        ok = zone == expected
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {location!r}: {zone}" + ("" if ok else f" (expected {expected})"))
+
+    print("\n=== Parser-specific locations ===")
+    custom = MessageParser()
+    custom.location_timezone_map["Springfield"] = "America/Phoenix"
+    for location, expected in [("Springfield", "America/Phoenix"), ("Downtown Springfield, Illinois", "America/Phoenix")]:
+        zone = custom._infer_timezone_from_location(location)
+        ok = zone == expected
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {location!r}: {zone}" + ("" if ok else f" (expected {expected})"))
+
+    print("\n=== Shared cache ===")
+    # Parsers with different maps must not reuse each other's entries, even after a change
+    cache = ParseCache()
+    default, custom = MessageParser(cache=cache), MessageParser(cache=cache)
+    message = "My name is Test User.\n\nI'm based in Springfield\n\n2025-04-01 09:00-10:00\n"
+    zones = [("default parser", default.parse_message(message)["timezone"], "America/Chicago")]
+    custom.location_timezone_map["Springfield"] = "America/Phoenix"
+    zones.append(("custom parser", custom.parse_message(message)["timezone"], "America/Phoenix"))
+    del custom.location_timezone_map["Springfield"]
+    zones.append(("custom parser, map restored", custom.parse_message(message)["timezone"], "America/Chicago"))
+    for label, zone, expected in zones:
+        ok = zone == expected
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {label}: {zone}" + ("" if ok else f" (expected {expected})"))
+
+    print("\n=== Timezone expressions ===")
+    for text, expected in TIMEZONE_CASES:
+        message = f"My name is Test User.\n\n2025-04-01 09:00-10:00\n\n{text}\n"
+        zone = parser.parse_message(message)["timezone"]
+        ok = zone == expected
+        failures += not ok
+        print(f"{'ok  ' if ok else 'FAIL'} {text!r}: {zone}" + ("" if ok else f" (expected {expected})"))
+
+    print(f"\n{failures} failure(s)")
+    return failures
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
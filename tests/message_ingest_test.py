@@ -0,0 +1,96 @@
+import sys
+import os
+# Add project root directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import json
+import mailbox
+import tempfile
+from email.message import EmailMessage
+
+from utils.message_ingest import iter_messages, load_scheduling_data, stream_scheduling_data
+
+CARL = "My name is Carl Cole.\nEmail: carl@example.com\n\n2025-04-01 09:00-10:00\n\nAll times are in EST\n"
+CARL_AGAIN = "My name is Carl Cole.\nEmail: carl@example.com\n\n2025-04-03 14:00-15:00\n\nAll times are in EST\n"
+RITA = "My name is Rita Reed.\nCompany: Acme Corp\n\n2025-04-01 09:00-11:00\n\nAll times are in CET\n"
+NO_SLOTS = "My name is Nora Null.\nEmail: nora@example.com\n\nI'll send my availability next week.\n\nAll times are in EST\n"
+
+# (sender, text); a sender's second message is skipped and a message without slots is dropped
+MESSAGES = [
+    ("Carl Cole <Carl@Example.com>", CARL),
+    ("Nora Null <nora@example.com>", NO_SLOTS),
+    ("carl@example.com", CARL_AGAIN),
+    ("Rita Reed <rita@acme.com>", RITA),
+]
+
+EXPECTED = (
+    {"Carl Cole": {"availability": ["2025-04-01 09:00-10:00"], "timezone": "America/New_York"}},
+    {"Rita Reed": {"availability": ["2025-04-01 09:00-11:00"], "timezone": "Europe/Paris"}},
+)
+# A Maildir has no message order, so either of Carl's messages may come first
+EXPECTED_LATER = ({"Carl Cole": {"availability": ["2025-04-03 14:00-15:00"], "timezone": "America/New_York"}},
+                  EXPECTED[1])
+
+def write_jsonl(path):
+    with open(path, "w", encoding="utf-8") as f:
+        for sender, text in MESSAGES:
+            # Senders go under metadata as in RandomMessageGenerator output
+            f.write(json.dumps({"message": text, "metadata": {"email": sender}}) + "\n\n")
+
+def email_messages():
+    for number, (sender, text) in enumerate(MESSAGES):
+        message = EmailMessage()
+        message["From"] = sender
+        message["Subject"] = f"Availability {number}"
+        message.set_content(text)
+        yield message
+
+def write_mbox(path):
+    box = mailbox.mbox(path)
+    for message in email_messages():
+        box.add(message)
+    box.close()
+
+def write_maildir(path):
+    box = mailbox.Maildir(path)
+    for message in email_messages():
+        box.add(message)
+
+def check(label, actual, expected, *alternatives):
+    ok = actual == expected or actual in alternatives
+    print(f"{'ok  ' if ok else 'FAIL'} {label}" + ("" if ok else f": {actual} (expected {expected})"))
+    return not ok
+
+def main():
+    """Check ingestion from each source format and the dedupe and type rules"""
+    failures = 0
+
+    print("=== Source formats ===")
+    with tempfile.TemporaryDirectory() as directory:
+        sources = [
+            ("jsonl", os.path.join(directory, "dump.jsonl"), write_jsonl, [EXPECTED]),
+            ("mbox", os.path.join(directory, "inbox.mbox"), write_mbox, [EXPECTED]),
+            ("maildir", os.path.join(directory, "Maildir"), write_maildir, [EXPECTED, EXPECTED_LATER]),
+        ]
+        for label, path, write, allowed in sources:
+            write(path)
+            senders = sorted(sender for sender, _, _ in iter_messages(path))
+            failures += check(f"{label} senders", senders,
+                              sorted(["carl@example.com"] * 2 + ["nora@example.com", "rita@acme.com"]))
+            failures += check(f"{label} scheduling data", load_scheduling_data(path), *allowed)
+        failures += check("jsonl with 2 workers", load_scheduling_data(sources[0][1], max_workers=2), EXPECTED)
+
+    print("\n=== Dedupe and entity types ===")
+    # Without a sender, messages are deduped by the parsed email; a given entity type wins
+    raw = [(None, None, CARL), (None, None, CARL_AGAIN), ("rita@acme.com", "candidate", RITA)]
+    entries = [(entity_type, name) for entity_type, name, _ in stream_scheduling_data(raw)]
+    failures += check("no sender, given type", entries, [("candidate", "Carl Cole"), ("candidate", "Rita Reed")])
+    raw = [(None, "recruiter", CARL_AGAIN), (None, None, CARL)]
+    entries = [(entity_type, name, entry["availability"]) for entity_type, name, entry in stream_scheduling_data(raw)]
+    failures += check("first message wins", entries, [("recruiter", "Carl Cole", ["2025-04-03 14:00-15:00"])])
+
+    print(f"\n{failures} failure(s)")
+    return failures
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
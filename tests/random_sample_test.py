@@ -16,7 +16,13 @@ from algos.bipartite import schedule_interviews as bipartite_schedule
 from algos.greedy import greedy_schedule_interviews as greedy_schedule
 
 class TestCaseGenerator:
-    def __init__(self):
+    def __init__(self, base_date: datetime = None):
+        """
+        Args:
+            base_date: first day of every availability (default: next Monday), fixed
+                so that seeded cases do not shift with the wall clock
+        """
+        self.base_date = base_date
         self.timezone_map = {
             "PST": "America/Los_Angeles",
             "EST": "America/New_York",
@@ -47,8 +53,11 @@ class TestCaseGenerator:
     def generate_availability(self, num_days: int, slots_per_day: int) -> List[str]:
         """Generate availability slots for the specified number of days"""
         availability = []
-        base_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
-        base_date += timedelta(days=(7 - base_date.weekday()) % 7)  # Start from next Monday
+        if self.base_date is not None:
+            base_date = self.base_date.replace(hour=0, minute=0, second=0, microsecond=0)
+        else:
+            base_date = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+            base_date += timedelta(days=(7 - base_date.weekday()) % 7)  # Start from next Monday
         
         for day in range(num_days):
             current_date = base_date + timedelta(days=day)
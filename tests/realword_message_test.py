@@ -12,6 +12,7 @@ import random
 # Import message generator and parser
 from utils.message_generator import RandomMessageGenerator
 from utils.message_parser import MessageParser
+from utils.message_ingest import scheduler_entry
 
 # Import three scheduling algorithms
 from algos.networkflow import schedule_interviews as networkflow_schedule
@@ -35,36 +36,17 @@ def parse_messages_to_scheduling_data(messages_data):
     
     # Parse candidate messages
     for candidate_data in messages_data["candidates"]:
-        message = candidate_data["message"]
-        parsed_data = parser.parse_message(message)
-        
-        if parsed_data["name"] and parsed_data["available_slots"]:
-            # Format availability for scheduling algorithms
-            availability = []
-            for start, end in parsed_data["available_slots"]:
-                slot = f"{start.strftime('%Y-%m-%d %H:%M')}-{end.strftime('%H:%M')}"
-                availability.append(slot)
-            
-            candidates[parsed_data["name"]] = {
-                "availability": availability,
-                "timezone": parsed_data["timezone"]
-            }
+        parsed_data = parser.parse_message(candidate_data["message"])
+        entry = scheduler_entry(parsed_data)
+        if entry:
+            candidates[parsed_data["name"]] = entry
     
     # Parse recruiter messages
     for recruiter_data in messages_data["recruiters"]:
-        message = recruiter_data["message"]
-        parsed_data = parser.parse_message(message)
-        
-        if parsed_data["name"] and parsed_data["available_slots"]:
-            availability = []
-            for start, end in parsed_data["available_slots"]:
-                slot = f"{start.strftime('%Y-%m-%d %H:%M')}-{end.strftime('%H:%M')}"
-                availability.append(slot)
-            
-            recruiters[parsed_data["name"]] = {
-                "availability": availability,
-                "timezone": parsed_data["timezone"]
-            }
+        parsed_data = parser.parse_message(recruiter_data["message"])
+        entry = scheduler_entry(parsed_data)
+        if entry:
+            recruiters[parsed_data["name"]] = entry
     
     return candidates, recruiters
 
@@ -0,0 +1,153 @@
+import sys
+import os
+# Add project root directory to Python path
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+import sqlite3
+import tempfile
+from itertools import count
+
+from algos.scheduler_state import SchedulerState
+from algos.schedule_store import MemoryScheduleStore, SQLiteScheduleStore
+
+def person(*availability):
+    return {"availability": list(availability), "timezone": "America/New_York"}
+
+CANDIDATES = {
+    "Ann": person("2025-04-01 09:00-10:00"),
+    "Ben": person("2025-04-01 09:00-10:00"),
+    "Cal": person("2025-04-01 09:00-09:30"),
+}
+RECRUITERS = {
+    "R1": person("2025-04-01 09:00-10:00"),
+    "R2": person("2025-04-01 09:30-10:00"),
+}
+NINE, NINE_THIRTY = "2025-04-01 09:00 EDT", "2025-04-01 09:30 EDT"
+
+def new_state(store, scheduled=None):
+    """Candidates take one interview and recruiters two, in 30-minute slots"""
+    if scheduled is not None:
+        return SchedulerState.from_schedule(scheduled, CANDIDATES, RECRUITERS, 30, 1, 2, store=store)
+    return SchedulerState(CANDIDATES, RECRUITERS, 30, 1, 2, store=store)
+
+def check(label, actual, expected):
+    ok = actual == expected
+    print(f"{'ok  ' if ok else 'FAIL'} {label}" + ("" if ok else f": {actual} (expected {expected})"))
+    return not ok
+
+def check_adjustments(name, store):
+    """Book, conflict, cancel and availability changes give the same results on every store"""
+    failures = 0
+    state = new_state(store)
+    nine, nine_thirty = sorted(state.candidate_slots["Ann"])
+
+    # Ben cannot have R1 at 09:00 and R2 is not free then; Cal has no other slot
+    failures += check(f"{name}: add all", state.add(), [["Ann", "R1", NINE], ["Ben", "R1", NINE_THIRTY]])
+    failures += check(f"{name}: recruiter conflict", state.is_free("Cal", "R1", nine), False)
+    failures += check(f"{name}: candidate cap", state.is_free("Ann", "R2", nine_thirty), False)
+    failures += check(f"{name}: booked slot", store.is_booked(nine, recruiter="R1"), True)
+
+    failures += check(f"{name}: cancel candidate", state.cancel(candidate="Ann"), [["Ann", "R1", NINE]])
+    failures += check(f"{name}: freed slot", store.is_booked(nine, recruiter="R1"), False)
+    failures += check(f"{name}: add candidate", state.add(candidate="Cal"), [["Cal", "R1", NINE]])
+    # R1 is now at its cap, so Ann moves to R2
+    failures += check(f"{name}: recruiter cap", state.add(candidate="Ann"), [["Ann", "R2", NINE_THIRTY]])
+    failures += check(f"{name}: cancel by time", state.cancel(time_slot="09:30"),
+                      [["Ben", "R1", NINE_THIRTY], ["Ann", "R2", NINE_THIRTY]])
+    failures += check(f"{name}: stale booking", state.set_recruiter("R1", person("2025-04-01 09:30-10:00")),
+                      [["Cal", "R1", NINE]])
+    failures += check(f"{name}: empty schedule", state.to_schedule(), [])
+    return failures
+
+def check_unresolved(name, store):
+    """A booking whose time cannot be resolved is stored with no slot and still counts"""
+    failures = 0
+    state = new_state(store, [["Ann", "R1", "next week"]])
+    nine = min(state.candidate_slots["Ann"])
+
+    failures += check(f"{name}: stored without slot", [row[1:] for row in store.find(candidate="Ann")],
+                      [("Ann", "R1", None, "next week")])
+    failures += check(f"{name}: unresolved booked", store.is_booked(None, candidate="Ann"), True)
+    failures += check(f"{name}: unresolved other person", store.is_booked(None, candidate="Ben"), False)
+    failures += check(f"{name}: unresolved at a slot", store.is_booked(nine, candidate="Ann"), False)
+    failures += check(f"{name}: unresolved counts to cap", state.add(candidate="Ann"), [])
+    failures += check(f"{name}: unresolved kept", state.set_candidate("Ann", person("2025-04-02 09:00-10:00")), [])
+    failures += check(f"{name}: cancel unresolved", state.cancel(time_slot="next week"), [["Ann", "R1", "next week"]])
+    return failures
+
+def check_transactions(name, store):
+    """A failed transaction leaves no bookings behind, nested blocks included"""
+    failures = 0
+    state = new_state(store)
+    try:
+        with store.transaction():
+            state.add(candidate="Ann")
+            with store.transaction():
+                state.add(candidate="Ben")
+            raise ValueError("abort")
+    except ValueError:
+        pass
+    failures += check(f"{name}: rolled back", state.to_schedule(), [])
+    with store.transaction():
+        state.add(candidate="Ann")
+    failures += check(f"{name}: committed", state.to_schedule(), [["Ann", "R1", NINE]])
+    return failures
+
+def check_write_lock(path):
+    """transaction() takes the write lock up front, so another connection waits for the commit"""
+    failures = 0
+    with SQLiteScheduleStore(path) as store, SQLiteScheduleStore(path, timeout=0.05) as other:
+        state = new_state(store)
+        with store.transaction():
+            state.add(candidate="Ann")
+            try:
+                with other.transaction():
+                    pass
+                locked = False
+            except sqlite3.OperationalError:
+                locked = True
+            failures += check("sqlite file: locked while writing", locked, True)
+            failures += check("sqlite file: uncommitted hidden", other.count(candidate="Ann"), 0)
+        failures += check("sqlite file: committed visible", other.count(candidate="Ann"), 1)
+        with other.transaction():
+            failures += check("sqlite file: conflict seen", new_state(other).add(candidate="Ben"),
+                              [["Ben", "R1", NINE_THIRTY]])
+    return failures
+
+def main():
+    """Check SchedulerState adjustments against the memory and SQLite stores"""
+    failures = 0
+    with tempfile.TemporaryDirectory() as directory:
+        files = (os.path.join(directory, f"schedule{number}.db") for number in count())
+        stores = [
+            ("memory", MemoryScheduleStore),
+            ("sqlite :memory:", lambda: SQLiteScheduleStore(":memory:")),
+            ("sqlite file", lambda: SQLiteScheduleStore(next(files))),
+        ]
+        opened = []
+
+        print("=== Adjustments ===")
+        for name, make_store in stores:
+            opened.append(make_store())
+            failures += check_adjustments(name, opened[-1])
+
+        print("\n=== Unresolved bookings ===")
+        for name, make_store in stores:
+            opened.append(make_store())
+            failures += check_unresolved(name, opened[-1])
+
+        print("\n=== Transactions ===")
+        for name, make_store in stores[1:]:
+            opened.append(make_store())
+            failures += check_transactions(name, opened[-1])
+        failures += check_write_lock(os.path.join(directory, "shared.db"))
+
+        for store in opened:
+            if isinstance(store, SQLiteScheduleStore):
+                store.close()
+
+    print(f"\n{failures} failure(s)")
+    return failures
+
+if __name__ == "__main__":
+    sys.exit(1 if main() else 0)
@@ -0,0 +1,229 @@
+import json
+import mmap
+import os
+import sys
+from array import array
+from typing import Dict, List, Tuple, Iterable, Iterator
+
+from utils.time_paraser import parse_availability_intervals, resolve_slot
+
+FORMAT_VERSION = 1
+META_FILE = "meta.json"
+
+# Column name -> array typecode; every column is a raw little-endian file "<name>.bin"
+# that numpy can map as well, e.g. numpy.memmap(path, dtype="<i4", mode="r")
+COLUMNS = {
+    # Participants: candidates first, then recruiters; ids are row numbers
+    "participant_timezone": "i",  # index into meta["timezones"]
+    "participant_name_offsets": "q",  # name i is name_bytes[offsets[i]:offsets[i + 1]]
+    "participant_name_bytes": "B",  # UTF-8
+    # Availability intervals in UTC minutes, half-open, sorted by (start, participant)
+    "interval_participant": "i",
+    "interval_start": "i",
+    "interval_end": "i",
+    # Assignments: one row per interview
+    "assignment_candidate": "i",
+    "assignment_recruiter": "i",  # participant id, not recruiter number
+    "assignment_slot": "i"
+}
+
+# On-disk item sizes; array's "i" is 32-bit on every mainstream platform
+ITEM_SIZES = {"B": 1, "i": 4, "q": 8}
+
+ASSIGNMENT_COLUMNS = ("assignment_candidate", "assignment_recruiter", "assignment_slot")
+
+
+class ColumnarDataset:
+    """
+    Read-only view of a dataset written by write_dataset.
+
+    Columns are memory-mapped and exposed as memoryviews cast to their element type,
+    so opening a dataset copies nothing and iterating a column creates one int at a
+    time instead of one object per row up front.
+
+    Usage:
+        with ColumnarDataset(directory) as dataset:
+            for start, end in zip(dataset.interval_start, dataset.interval_end):
+                ...
+    """
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+            self.meta = json.load(f)
+        if self.meta.get("version") != FORMAT_VERSION:
+            raise ValueError(f"Unsupported columnar format version: {self.meta.get('version')}")
+
+        self.num_candidates = self.meta["num_candidates"]
+        self.num_recruiters = self.meta["num_recruiters"]
+        self.timezones = self.meta["timezones"]
+        self._maps = []
+        for name in COLUMNS:
+            setattr(self, name, self._map_column(name))
+
+    @property
+    def num_participants(self) -> int:
+        return self.num_candidates + self.num_recruiters
+
+    def name(self, participant: int) -> str:
+        """Name of a participant id"""
+        offsets = self.participant_name_offsets
+        return bytes(self.participant_name_bytes[offsets[participant]:offsets[participant + 1]]).decode("utf-8")
+
+    def timezone(self, participant: int) -> str:
+        """Time zone of a participant id"""
+        return self.timezones[self.participant_timezone[participant]]
+
+    def is_candidate(self, participant: int) -> bool:
+        return participant < self.num_candidates
+
+    def close(self) -> None:
+        # Views must be released before their maps can be closed
+        for name in COLUMNS:
+            view = getattr(self, name)
+            if isinstance(view, memoryview):
+                view.release()
+            setattr(self, name, None)
+        for column_map in self._maps:
+            column_map.close()
+        self._maps = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _map_column(self, name):
+        typecode = COLUMNS[name]
+        path = _column_path(self.directory, name)
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            return array(typecode)
+        with open(path, "rb") as f:
+            column_map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if sys.byteorder != "little" and array(typecode).itemsize > 1:
+            # Big-endian hosts need a swapped copy
+            values = array(typecode, column_map[:])
+            values.byteswap()
+            column_map.close()
+            return values
+        self._maps.append(column_map)
+        return memoryview(column_map).cast(typecode)
+
+
+def write_dataset(directory: str, candidates: Dict[str, Dict], recruiters: Dict[str, Dict]) -> Tuple[int, int]:
+    """
+    Write candidates and recruiters as a columnar dataset: a participant table and an
+    interval table of merged UTC availability intervals (see parse_availability_intervals).
+    Any existing assignment table is cleared.
+
+    Returns:
+        The number of participants and intervals written
+    """
+    os.makedirs(directory, exist_ok=True)
+    timezones = {}
+    participant_timezone = array(COLUMNS["participant_timezone"])
+    name_offsets = array(COLUMNS["participant_name_offsets"], [0])
+    name_bytes = bytearray()
+    intervals = []  # (start, participant, end)
+
+    people = list(candidates.items()) + list(recruiters.items())
+    for participant, (name, data) in enumerate(people):
+        participant_timezone.append(timezones.setdefault(data["timezone"], len(timezones)))
+        name_bytes += name.encode("utf-8")
+        name_offsets.append(len(name_bytes))
+        for start, end in parse_availability_intervals(data["availability"], data["timezone"]):
+            intervals.append((start, participant, end))
+    intervals.sort()
+
+    columns = {
+        "participant_timezone": participant_timezone,
+        "participant_name_offsets": name_offsets,
+        "participant_name_bytes": array("B", name_bytes),
+        "interval_participant": array("i", (participant for _, participant, _ in intervals)),
+        "interval_start": array("i", (start for start, _, _ in intervals)),
+        "interval_end": array("i", (end for _, _, end in intervals))
+    }
+    columns.update({name: array(COLUMNS[name]) for name in ASSIGNMENT_COLUMNS})
+    for name, values in columns.items():
+        _write_column(directory, name, values)
+
+    meta = {
+        "version": FORMAT_VERSION,
+        "num_candidates": len(candidates),
+        "num_recruiters": len(recruiters),
+        "timezones": list(timezones),
+        "counts": {name: len(values) for name, values in columns.items()}
+    }
+    _write_meta(directory, meta)
+    return len(people), len(intervals)
+
+
+def write_assignments(directory: str, assignments: Iterable[Tuple[int, int, int]]) -> int:
+    """
+    Replace the assignment table of a dataset.
+
+    Args:
+        assignments: (candidate id, recruiter participant id, slot) rows
+
+    Returns:
+        The number of assignments written
+    """
+    columns = {name: array(COLUMNS[name]) for name in ASSIGNMENT_COLUMNS}
+    candidate_column, recruiter_column, slot_column = columns.values()
+    for cand, rec, slot in assignments:
+        candidate_column.append(cand)
+        recruiter_column.append(rec)
+        slot_column.append(slot)
+    for name, values in columns.items():
+        _write_column(directory, name, values)
+
+    with open(os.path.join(directory, META_FILE), encoding="utf-8") as f:
+        meta = json.load(f)
+    meta["counts"].update({name: len(values) for name, values in columns.items()})
+    _write_meta(directory, meta)
+    return len(slot_column)
+
+
+def schedule_to_assignments(
+    scheduled: List[List[str]],
+    dataset: ColumnarDataset
+) -> Iterator[Tuple[int, int, int]]:
+    """
+    Convert a [candidate, recruiter, time_slot] schedule to assignment rows of a dataset,
+    skipping interviews of unknown people or with unresolvable times.
+    """
+    ids = {}
+    for participant in range(dataset.num_participants):
+        ids[(dataset.is_candidate(participant), dataset.name(participant))] = participant
+    for cand, rec, time_str in scheduled:
+        cand_id = ids.get((True, cand))
+        rec_id = ids.get((False, rec))
+        if cand_id is None or rec_id is None:
+            continue
+        slot = resolve_slot(time_str, {"timezone": dataset.timezone(cand_id)}, {"timezone": dataset.timezone(rec_id)})
+        if slot is not None:
+            yield cand_id, rec_id, slot
+
+
+def _column_path(directory, name):
+    return os.path.join(directory, name + ".bin")
+
+
+def _write_column(directory, name, values):
+    if values.itemsize != ITEM_SIZES[COLUMNS[name]]:
+        raise ValueError(f"Column {name} needs {ITEM_SIZES[COLUMNS[name]]}-byte items, got {values.itemsize}")
+    if sys.byteorder != "little" and values.itemsize > 1:
+        values = array(values.typecode, values)
+        values.byteswap()
+    path = _column_path(directory, name)
+    with open(path + ".tmp", "wb") as f:
+        values.tofile(f)
+    os.replace(path + ".tmp", path)
+
+
+def _write_meta(directory, meta):
+    path = os.path.join(directory, META_FILE)
+    with open(path + ".tmp", "w", encoding="utf-8") as f:
+        json.dump(meta, f, indent=2)
+    os.replace(path + ".tmp", path)
@@ -0,0 +1,375 @@
+import gzip
+import os
+import sys
+from collections import defaultdict
+from datetime import datetime
+from functools import lru_cache
+from itertools import chain
+from typing import Dict, List, Tuple, Optional, Iterable
+from zoneinfo import ZoneInfo, available_timezones
+
+DATA_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "gazetteer.tsv.gz")
+
+ZONEINFO_DIR = "/usr/share/zoneinfo"
+
+# Locations the parser has always known; they win over generated entries
+BASE_LOCATIONS = {
+    "New York": "America/New_York",
+    "Boston": "America/New_York",
+    "Philadelphia": "America/New_York",
+    "Atlanta": "America/New_York",
+    "Chicago": "America/Chicago",
+    "Dallas": "America/Chicago",
+    "Houston": "America/Chicago",
+    "Austin": "America/Chicago",
+    "Denver": "America/Denver",
+    "Phoenix": "America/Phoenix",
+    "Salt Lake City": "America/Denver",
+    "Albuquerque": "America/Denver",
+    "San Francisco": "America/Los_Angeles",
+    "Los Angeles": "America/Los_Angeles",
+    "Seattle": "America/Los_Angeles",
+    "Portland": "America/Los_Angeles"
+}
+
+# One-word place names that are ordinary words or surnames ("Tech Center", "Reading
+# this", "Dr. Palmer"); they are left out of the bundle so they cannot capture location text
+COMMON_WORDS = frozenset({
+    "Archway", "Barking", "Bath", "Bend", "Brick", "Bush", "Casey", "Center", "Clay", "Colon",
+    "Commonwealth", "Confederation", "Date", "Davis", "Delta", "Easter", "Enterprise", "Flint",
+    "Forest", "Grapevine", "Highland", "Homestead", "Hub", "Independence", "Jersey", "Male", "Man",
+    "Mango", "Mission", "Mobile", "Most", "Normal", "Orange", "Palmer", "Paradise", "Paramount",
+    "Pest", "Plantation", "Reading", "Reservoir", "Revere", "Sale", "Shaping", "Split", "Spring",
+    "Sunrise", "Surprise", "Temple", "Troll", "Union", "Uptown", "Vista", "Wake", "Wedding"
+})
+
+# US states by GeoNames admin1 code; each maps to the zone most of its population lives in
+US_STATES = {
+    "AL": "Alabama", "AK": "Alaska", "AZ": "Arizona", "AR": "Arkansas", "CA": "California",
+    "CO": "Colorado", "CT": "Connecticut", "DE": "Delaware", "DC": "District of Columbia",
+    "FL": "Florida", "GA": "Georgia", "HI": "Hawaii", "ID": "Idaho", "IL": "Illinois",
+    "IN": "Indiana", "IA": "Iowa", "KS": "Kansas", "KY": "Kentucky", "LA": "Louisiana",
+    "ME": "Maine", "MD": "Maryland", "MA": "Massachusetts", "MI": "Michigan", "MN": "Minnesota",
+    "MS": "Mississippi", "MO": "Missouri", "MT": "Montana", "NE": "Nebraska", "NV": "Nevada",
+    "NH": "New Hampshire", "NJ": "New Jersey", "NM": "New Mexico", "NY": "New York State",
+    "NC": "North Carolina", "ND": "North Dakota", "OH": "Ohio", "OK": "Oklahoma", "OR": "Oregon",
+    "PA": "Pennsylvania", "RI": "Rhode Island", "SC": "South Carolina", "SD": "South Dakota",
+    "TN": "Tennessee", "TX": "Texas", "UT": "Utah", "VT": "Vermont", "VA": "Virginia",
+    "WA": "Washington State", "WV": "West Virginia", "WI": "Wisconsin", "WY": "Wyoming"
+}
+
+# Zone for abbreviations shared by several zones; the rest go to the first zone using them
+PREFERRED_ZONES = {
+    "EST": "America/New_York", "EDT": "America/New_York",
+    "CST": "America/Chicago", "CDT": "America/Chicago",
+    "MST": "America/Denver", "MDT": "America/Denver",
+    "PST": "America/Los_Angeles", "PDT": "America/Los_Angeles",
+    "AKST": "America/Anchorage", "AKDT": "America/Anchorage",
+    "HST": "Pacific/Honolulu",
+    "AST": "America/Halifax", "ADT": "America/Halifax",
+    "NST": "America/St_Johns", "NDT": "America/St_Johns",
+    "GMT": "Europe/London", "BST": "Europe/London", "UTC": "UTC",
+    "WET": "Europe/Lisbon", "WEST": "Europe/Lisbon",
+    "CET": "Europe/Paris", "CEST": "Europe/Paris",
+    "EET": "Europe/Athens", "EEST": "Europe/Athens",
+    "MSK": "Europe/Moscow",
+    "IST": "Asia/Kolkata",
+    "PKT": "Asia/Karachi",
+    "JST": "Asia/Tokyo",
+    "KST": "Asia/Seoul",
+    "HKT": "Asia/Hong_Kong",
+    "SAST": "Africa/Johannesburg",
+    "WAT": "Africa/Lagos", "CAT": "Africa/Maputo", "EAT": "Africa/Nairobi",
+    "AEST": "Australia/Sydney", "AEDT": "Australia/Sydney",
+    "ACST": "Australia/Adelaide", "ACDT": "Australia/Adelaide",
+    "AWST": "Australia/Perth",
+    "NZST": "Pacific/Auckland", "NZDT": "Pacific/Auckland"
+}
+
+
+class AhoCorasick:
+    """
+    Multi-pattern string matcher.
+
+    All patterns are compiled into one automaton, so a text is matched against
+    every pattern in a single pass whose cost depends on the text length and the
+    number of matches, not on the number of patterns.
+    """
+
+    def __init__(self, patterns: Iterable[Tuple[str, object]]):
+        """
+        Args:
+            patterns: (pattern, value) pairs; a repeated pattern keeps its last value
+        """
+        self.goto = [{}]
+        self.fail = [0]
+        self.output = [None]  # (pattern length, value) ending at this node
+        self.dict_link = [0]  # nearest node on the fail chain with an output (0 if none)
+
+        for pattern, value in patterns:
+            node = 0
+            for char in pattern:
+                next_node = self.goto[node].get(char)
+                if next_node is None:
+                    next_node = len(self.goto)
+                    self.goto[node][char] = next_node
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.output.append(None)
+                    self.dict_link.append(0)
+                node = next_node
+            self.output[node] = (len(pattern), value)
+
+        # Breadth-first over the trie: fail links point to the longest proper suffix in the trie
+        queue = list(self.goto[0].values())  # depth-1 nodes fail to the root
+        for node in queue:
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                state = self.fail[node]
+                while state and char not in self.goto[state]:
+                    state = self.fail[state]
+                fallback = self.goto[state].get(char, 0)
+                self.fail[child] = fallback
+                self.dict_link[child] = fallback if self.output[fallback] else self.dict_link[fallback]
+
+    def iter_matches(self, text: str):
+        """Yield (start, end, value) for every occurrence of every pattern in text"""
+        goto, fail, output, dict_link = self.goto, self.fail, self.output, self.dict_link
+        node = 0
+        for i, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            match_node = node if output[node] else dict_link[node]
+            while match_node:
+                length, value = output[match_node]
+                yield i + 1 - length, i + 1, value
+                match_node = dict_link[match_node]
+
+
+class Gazetteer:
+    """
+    Location names and time zone abbreviations mapped to IANA time zones.
+
+    When a text names several locations, cities beat regions (countries and US
+    states), so "Tbilisi, Georgia" and "Atlanta, Georgia" both resolve to their
+    city, and more populous places beat smaller ones.
+    """
+
+    def __init__(self, locations: Dict[str, str], abbreviations: Dict[str, str],
+                 populations: Optional[Dict[str, int]] = None, regions: Iterable[str] = ()):
+        """
+        Args:
+            locations: location name -> zone
+            abbreviations: abbreviation -> zone
+            populations: location name -> population (0 for names not listed)
+            regions: location names that are countries or states rather than cities
+        """
+        self.locations = locations
+        self.abbreviations = abbreviations
+        self.populations = populations or {}
+        self.regions = set(regions)
+        self.zones = set(locations.values()) | set(abbreviations.values())
+        self.matcher = AhoCorasick((name.casefold(), (self._rank(name), zone)) for name, zone in locations.items())
+        self._override_matchers = {}  # changed entries -> automaton
+        self._override_maps = {}  # id of an overrides map -> (copy of the map, automaton)
+
+    def find_timezone(self, text: str, overrides: Optional[Dict[str, str]] = None) -> Optional[str]:
+        """
+        Return the zone of the best whole-word location in text, or None if text
+        mentions no known location. Names inside a longer match ("Forest" in
+        "Wake Forest") are ignored; of the rest, a city beats a region, then the
+        larger population wins, then the leftmost.
+
+        Args:
+            overrides: extra location name -> zone entries, e.g. a parser's own map;
+                entries that differ from the gazetteer win over every bundled location
+        """
+        folded = text.casefold()
+        matches = self.matcher.iter_matches(folded)
+        if overrides:
+            matches = chain(matches, self._override_matcher(overrides).iter_matches(folded))
+
+        words = []
+        for start, end, (rank, zone) in matches:
+            # Only whole words count, so "Nome" does not match inside "Nomenclature"
+            if start > 0 and folded[start - 1].isalnum():
+                continue
+            if end < len(folded) and folded[end].isalnum():
+                continue
+            words.append((start, end, rank, zone))
+
+        best = None
+        for start, end, rank, zone in words:
+            if any(other_start <= start and end <= other_end and other_end - other_start > end - start
+                   for other_start, other_end, _, _ in words):
+                continue
+            key = (tuple(-r for r in rank), start, start - end)
+            if best is None or key < best[0]:
+                best = (key, zone)
+        return best[1] if best else None
+
+    def normalize_abbreviation(self, abbreviation: str) -> Optional[str]:
+        """Return the zone for an abbreviation like "CET", or None"""
+        return self.abbreviations.get(abbreviation.strip().upper())
+
+    def _override_matcher(self, overrides):
+        """Automaton over the overrides that change the gazetteer, built once per distinct map"""
+        # The same map is passed on every call, so only a changed map is filtered and sorted
+        # again; comparing with a copy also catches an id reused by a different map
+        cached = self._override_maps.get(id(overrides))
+        if cached is not None and cached[0] == overrides:
+            return cached[1]
+
+        changed = tuple(sorted((name, zone) for name, zone in overrides.items()
+                               if self.locations.get(name) != zone))
+        matcher = self._override_matchers.get(changed)
+        if matcher is None:
+            matcher = AhoCorasick((name.casefold(), ((2, 0), zone)) for name, zone in changed)
+            self._override_matchers[changed] = matcher
+        self._override_maps[id(overrides)] = (dict(overrides), matcher)
+        return matcher
+
+    def _rank(self, name):
+        """(1 for a city or 0 for a region, population); caller overrides rank (2, 0)"""
+        return (0 if name in self.regions else 1, self.populations.get(name, 0))
+
+
+@lru_cache(maxsize=None)
+def load_gazetteer(path: str = DATA_PATH) -> Gazetteer:
+    """
+    Load the bundled gazetteer. It is read on first use and shared afterwards.
+
+    The file is gzipped TSV with one "kind<TAB>name<TAB>zone<TAB>population" row per
+    entry, where kind is "loc" for a city, "region" for a country or state, or "abbr"
+    for a time zone abbreviation (whose population is empty).
+    """
+    locations = {}
+    populations = {}
+    regions = []
+    abbreviations = {}
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            kind, name, zone, population = line.rstrip("\n").split("\t")
+            if kind == "abbr":
+                abbreviations[name] = zone
+            else:
+                locations[name] = zone
+                populations[name] = int(population)
+                if kind == "region":
+                    regions.append(name)
+    return Gazetteer(locations, abbreviations, populations, regions)
+
+
+def build_gazetteer(path: str = DATA_PATH, geonames_path: Optional[str] = None,
+                    min_population: int = 50000) -> Tuple[int, int]:
+    """
+    Regenerate the bundled data file from the system tz database: zone cities, countries
+    with a single zone and the abbreviations used by each zone. A GeoNames cities file
+    (e.g. cities15000.txt) adds every city it lists with at least min_population people,
+    ranks all locations by population and adds the US states.
+
+    With a GeoNames file, a one-word zone city is only kept if GeoNames lists a city of
+    that name in the same zone, so tz database names like "Knox" or "Beulah" do not
+    capture location text; names in COMMON_WORDS are never kept.
+
+    Returns:
+        The number of locations and abbreviations written
+    """
+    zones = _read_zone_tab("zone1970.tab") + _read_zone_tab("zone.tab")
+    known_zones = available_timezones()
+
+    locations = {}  # name -> (zone, population, kind)
+    cities = set()  # (name, zone) listed by GeoNames
+    country_population = defaultdict(int)
+    state_zone_population = defaultdict(lambda: defaultdict(int))  # US state code -> zone -> population
+    if geonames_path:
+        with open(geonames_path, encoding="utf-8") as f:
+            for line in f:
+                columns = line.rstrip("\n").split("\t")
+                name, country, state, zone = columns[2], columns[8], columns[10], columns[17]
+                population = int(columns[14] or 0)
+                if zone not in known_zones:
+                    continue
+                country_population[country] += population
+                if country == "US":
+                    state_zone_population[state][zone] += population
+                if population >= min_population and _is_plain_name(name):
+                    cities.add((name, zone))
+                    _add_location(locations, name, zone, population)
+
+    for _, zone in zones:
+        city = zone.rsplit("/", 1)[-1].replace("_", " ")
+        if zone not in known_zones or not _is_plain_name(city):
+            continue
+        if geonames_path and " " not in city and (city, zone) not in cities:
+            continue
+        _add_location(locations, city, zone, 0)
+
+    country_zones = {}
+    for codes, zone in zones:
+        for code in codes.split(","):
+            country_zones.setdefault(code, set()).add(zone)
+    for code, name in _read_iso3166():
+        if len(country_zones.get(code, ())) == 1 and _is_plain_name(name):
+            _add_location(locations, name, next(iter(country_zones[code])), country_population[code], "region")
+
+    for code, name in US_STATES.items():
+        zone_population = state_zone_population.get(code)
+        if zone_population:
+            zone = max(zone_population, key=zone_population.get)
+            _add_location(locations, name, zone, sum(zone_population.values()), "region")
+
+    for name, zone in BASE_LOCATIONS.items():
+        locations[name] = (zone, locations.get(name, (None, 0))[1], "loc")
+
+    abbreviations = {}
+    for _, zone in sorted(set(zones), key=lambda x: x[1]):
+        tz = ZoneInfo(zone)
+        for month in range(1, 13):
+            abbreviation = datetime(2025, month, 15, 12, tzinfo=tz).tzname()
+            if abbreviation.isalpha():
+                abbreviations.setdefault(abbreviation, zone)
+    abbreviations.update(PREFERRED_ZONES)
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # mtime=0 keeps the file byte-identical between builds
+    with open(path, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+        rows = [(kind, name, zone, str(population)) for name, (zone, population, kind) in sorted(locations.items())]
+        rows += [("abbr", name, zone, "") for name, zone in sorted(abbreviations.items())]
+        f.write("".join("\t".join(row) + "\n" for row in rows).encode("utf-8"))
+    load_gazetteer.cache_clear()
+    return len(locations), len(abbreviations)
+
+
+def _add_location(locations, name, zone, population, kind="loc"):
+    """Keep one place per name: a city over a region, then the most populous"""
+    if name in COMMON_WORDS:
+        return
+    if name not in locations or (kind == "loc", population) > (locations[name][2] == "loc", locations[name][1]):
+        locations[name] = (zone, population, kind)
+
+
+def _read_zone_tab(name: str) -> List[Tuple[str, str]]:
+    rows = []
+    with open(os.path.join(ZONEINFO_DIR, name), encoding="utf-8") as f:
+        for line in f:
+            if not line.startswith("#"):
+                columns = line.rstrip("\n").split("\t")
+                rows.append((columns[0], columns[2]))
+    return rows
+
+
+def _read_iso3166() -> List[Tuple[str, str]]:
+    with open(os.path.join(ZONEINFO_DIR, "iso3166.tab"), encoding="utf-8") as f:
+        return [tuple(line.rstrip("\n").split("\t")) for line in f if not line.startswith("#")]
+
+
+def _is_plain_name(name: str) -> bool:
+    return bool(name) and all(char.isalpha() or char in " .'-" for char in name)
+
+
+if __name__ == "__main__":
+    # Usage: python -m utils.gazetteer [geonames_cities.txt]
+    num_locations, num_abbreviations = build_gazetteer(geonames_path=sys.argv[1] if len(sys.argv) > 1 else None)
+    print(f"Wrote {num_locations} locations and {num_abbreviations} abbreviations to {DATA_PATH}")
@@ -0,0 +1,101 @@
+import json
+from collections import defaultdict
+from contextlib import contextmanager, nullcontext
+from contextvars import ContextVar
+from time import perf_counter_ns
+from typing import Callable, Dict, Any, Optional
+
+class Instrumentation:
+    """
+    Collects timed spans and counters from the scheduling pipeline.
+
+    Spans are recorded with perf_counter_ns as (name, start_ns, duration_ns);
+    counters are summed by name. An optional callback receives every event as a
+    dict as soon as it happens, e.g. to forward it to a metrics system.
+    """
+
+    def __init__(self, callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+        self.callback = callback
+        self.spans = []
+        self.counters = defaultdict(int)
+
+    @contextmanager
+    def span(self, name: str):
+        """Time the enclosed block as a span called name"""
+        start = perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = perf_counter_ns() - start
+            self.spans.append((name, start, duration))
+            if self.callback:
+                self.callback({"type": "span", "name": name, "start_ns": start, "duration_ns": duration})
+
+    def count(self, name: str, value: int = 1) -> None:
+        """Add value to the counter called name"""
+        self.counters[name] += value
+        if self.callback:
+            self.callback({"type": "counter", "name": name, "value": value})
+
+    def to_dict(self) -> Dict[str, Any]:
+        """
+        Returns:
+            {"spans": [{"name", "start_ns", "duration_ns"}, ...], "counters": {name: total},
+             "totals_ns": {span name: summed duration}}
+        """
+        totals = defaultdict(int)
+        for name, _, duration in self.spans:
+            totals[name] += duration
+        return {
+            "spans": [{"name": name, "start_ns": start, "duration_ns": duration}
+                      for name, start, duration in self.spans],
+            "counters": dict(self.counters),
+            "totals_ns": dict(totals)
+        }
+
+    def write_json_lines(self, file) -> None:
+        """Write one JSON object per span and per counter to an open text file"""
+        for name, start, duration in self.spans:
+            file.write(json.dumps({"type": "span", "name": name, "start_ns": start, "duration_ns": duration}) + "\n")
+        for name, value in self.counters.items():
+            file.write(json.dumps({"type": "counter", "name": name, "value": value}) + "\n")
+
+
+class _Disabled:
+    """Stand-in used when no instrumentation is active: every hook is a no-op"""
+
+    _null_span = nullcontext()
+
+    def span(self, name):
+        return self._null_span
+
+    def count(self, name, value=1):
+        pass
+
+
+_DISABLED = _Disabled()
+_active = ContextVar("instrumentation", default=_DISABLED)
+
+def get_instrumentation():
+    """Return the active Instrumentation, or a no-op stand-in when disabled"""
+    return _active.get()
+
+@contextmanager
+def instrument(callback: Optional[Callable[[Dict[str, Any]], None]] = None):
+    """
+    Enable instrumentation for the enclosed block.
+
+    Usage:
+        with instrument() as stats:
+            schedule_interviews(...)
+        print(stats.to_dict())
+
+    Instrumentation is per context (thread or task); work done in a process pool
+    (max_workers) is not recorded, apart from the spans around it.
+    """
+    instrumentation = Instrumentation(callback)
+    token = _active.set(instrumentation)
+    try:
+        yield instrumentation
+    finally:
+        _active.reset(token)
@@ -0,0 +1,150 @@
+import json
+import mailbox
+import os
+from collections import deque
+from email.utils import parseaddr
+from typing import Dict, Tuple, Optional, Any, Iterable, Iterator
+
+from utils.message_parser import MessageParser
+
+# A raw message: (sender address or None, entity type or None, message text)
+RawMessage = Tuple[Optional[str], Optional[str], str]
+
+def iter_mbox(path: str) -> Iterator[RawMessage]:
+    """Stream messages from an mbox file, one at a time"""
+    box = mailbox.mbox(path, create=False)
+    try:
+        for message in box.itervalues():
+            yield _sender(message.get("From")), None, _message_text(message)
+    finally:
+        box.close()
+
+def iter_maildir(path: str) -> Iterator[RawMessage]:
+    """Stream messages from a Maildir directory, one at a time"""
+    box = mailbox.Maildir(path, factory=None, create=False)
+    for message in box.itervalues():
+        yield _sender(message.get("From")), None, _message_text(message)
+
+def iter_jsonl(path: str) -> Iterator[RawMessage]:
+    """
+    Stream messages from a JSONL dump, one record per line.
+
+    Each record needs a "message" and may give a "sender" and an "entity_type"
+    ("candidate" or "recruiter"), either at the top level or under "metadata"
+    as in RandomMessageGenerator output (where the sender is metadata["email"]).
+    """
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            if not line.strip():
+                continue
+            record = json.loads(line)
+            metadata = record.get("metadata") or {}
+            sender = record.get("sender") or metadata.get("email")
+            entity_type = record.get("entity_type") or metadata.get("entity_type")
+            yield _sender(sender), entity_type, record["message"]
+
+def iter_messages(path: str) -> Iterator[RawMessage]:
+    """Stream messages from a Maildir directory, a .jsonl dump or an mbox file"""
+    if os.path.isdir(path):
+        return iter_maildir(path)
+    if path.endswith(".jsonl"):
+        return iter_jsonl(path)
+    return iter_mbox(path)
+
+def scheduler_entry(parsed_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Convert a parsed message into a scheduler input entry.
+
+    Returns:
+        {"availability": [...], "timezone": ...}, or None if the message has no
+        name or no availability
+    """
+    if not parsed_data["name"] or not parsed_data["available_slots"]:
+        return None
+    availability = []
+    for start, end in parsed_data["available_slots"]:
+        availability.append(f"{start.strftime('%Y-%m-%d %H:%M')}-{end.strftime('%H:%M')}")
+    return {
+        "availability": availability,
+        "timezone": parsed_data["timezone"]
+    }
+
+def stream_scheduling_data(
+    messages: Iterable[RawMessage],
+    parser: MessageParser = None,
+    max_workers: int = 1,
+    chunksize: int = 256
+) -> Iterator[Tuple[str, str, Dict[str, Any]]]:
+    """
+    Parse messages lazily and yield scheduler inputs as soon as they are known.
+
+    Only the first usable message of each sender is kept; later messages from the
+    same sender are skipped before parsing. Messages without a sender are deduped
+    by the parsed email, then the parsed name. Memory stays bounded by the set of
+    senders seen plus the messages in flight.
+
+    Args:
+        messages: (sender, entity_type, text) tuples, e.g. from iter_messages
+        parser: parser to use (a default MessageParser if None)
+        max_workers, chunksize: passed on to MessageParser.parse_many
+
+    Yields:
+        ("candidate" or "recruiter", name, {"availability": [...], "timezone": ...})
+    """
+    parser = parser or MessageParser(debug=False)
+    seen = set()
+    in_flight = deque()  # (sender, entity_type) of every message handed to the parser
+
+    def unseen_texts():
+        for sender, entity_type, text in messages:
+            if sender is not None and sender in seen:
+                continue
+            in_flight.append((sender, entity_type))
+            yield text
+
+    for parsed_data in parser.parse_many(unseen_texts(), max_workers=max_workers, chunksize=chunksize):
+        sender, entity_type = in_flight.popleft()
+        key = sender or parsed_data["email"] or parsed_data["name"]
+        if key in seen:
+            continue
+        entry = scheduler_entry(parsed_data)
+        if entry is None:
+            continue
+        seen.add(key)
+        if entity_type is None:
+            entity_type = "candidate" if parsed_data["is_candidate"] else "recruiter"
+        yield entity_type, parsed_data["name"], entry
+
+def load_scheduling_data(path: str, max_workers: int = 1) -> Tuple[Dict[str, Dict], Dict[str, Dict]]:
+    """
+    Read a mailbox or dump and build the candidates and recruiters dicts
+    expected by the scheduling algorithms.
+    """
+    candidates = {}
+    recruiters = {}
+    for entity_type, name, entry in stream_scheduling_data(iter_messages(path), max_workers=max_workers):
+        if entity_type == "candidate":
+            candidates[name] = entry
+        else:
+            recruiters[name] = entry
+    return candidates, recruiters
+
+def _sender(address: Optional[str]) -> Optional[str]:
+    """Normalize a From header or address to a lowercase address"""
+    if not address:
+        return None
+    return parseaddr(address)[1].lower() or None
+
+def _message_text(message: mailbox.Message) -> str:
+    """Return the subject and plain-text body of an email message"""
+    parts = []
+    for part in message.walk():
+        if part.get_content_type() != "text/plain":
+            continue
+        payload = part.get_payload(decode=True)
+        if payload is None:
+            continue
+        parts.append(payload.decode(part.get_content_charset() or "utf-8", errors="replace"))
+    body = "\n".join(parts)
+    subject = message.get("Subject")
+    return f"Subject: {subject}\n\n{body}" if subject else body
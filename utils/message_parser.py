@@ -1,16 +1,179 @@
+import hashlib
+import os
 import re
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo  # Use built-in zoneinfo instead of pytz
 import logging
-from typing import Dict, List, Tuple, Optional, Any, Set
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Dict, List, Tuple, Optional, Any, Set, Iterable, Iterator
+
+from utils.gazetteer import load_gazetteer
+from utils.parse_cache import ParseCache
+
+class FieldExtractor:
+    """
+    Extracts several fields from a text with precompiled patterns.
+
+    Each field has a list of regex patterns in priority order, and its value is the
+    first match of the first pattern that matches, exactly as with _extract_pattern.
+    Patterns are compiled once. Most of them start with a literal keyword ("My name is",
+    "Email:", ...), so the text is case-folded once and such a pattern only runs when
+    its keyword occurs in the text; the other patterns always run.
+    """
+
+    # Characters that end the literal prefix of a pattern
+    SPECIAL_CHARS = set(".^$*+?{}[]\\|()")
+
+    def __init__(self, field_patterns: Dict[str, List[str]], flags=re.IGNORECASE):
+        """Compile every pattern and find its keyword"""
+        self.field_patterns = {
+            field: [(self._keyword(pattern), re.compile(pattern, flags)) for pattern in patterns]
+            for field, patterns in field_patterns.items()
+        }
+
+    def extract(self, text: str) -> Dict[str, Optional[str]]:
+        """Return the value of every field, or None where no pattern matched"""
+        # re.IGNORECASE also matches a dotless i to "i", which casefold() keeps apart
+        folded = text.casefold().replace("\u0131", "i")
+        fields = {}
+        for field, patterns in self.field_patterns.items():
+            fields[field] = None
+            for keyword, pattern in patterns:
+                if keyword not in folded:
+                    continue
+                value = self._first_value(pattern, text)
+                if value is not None:
+                    fields[field] = value
+                    break
+        return fields
+
+    @classmethod
+    def _keyword(cls, pattern: str) -> str:
+        """Return the case-folded literal text every match of pattern starts with"""
+        keyword = []
+        for i, char in enumerate(pattern):
+            if char in cls.SPECIAL_CHARS:
+                break
+            if pattern[i + 1:i + 2] in ("?", "*", "{"):
+                # An optional character is not part of every match
+                break
+            keyword.append(char)
+        return "".join(keyword).casefold()
+
+    @staticmethod
+    def _first_value(pattern, text: str) -> Optional[str]:
+        """Return the first non-empty match the way re.findall results are used"""
+        for match in pattern.finditer(text):
+            groups = match.groups()
+            if len(groups) > 1:
+                # If match has several capture groups, join them
+                return ' '.join(m for m in groups if m).strip()
+            value = groups[0] if groups else match.group(0)
+            if value:
+                return value.strip()
+        return None
 
 class MessageParser:
     """Parse interview messages and extract key information"""
     
-    def __init__(self, debug=False):
-        """Initialize the parser"""
+    # Regular expression patterns - simplified and matched with generator
+    # Each field lists its patterns in priority order
+    
+    # Name patterns
+    NAME_PATTERNS = [
+        r"My name is ([A-Z][a-z]+(?: [A-Z][a-z]+)+)",
+        r"name:?\s*([A-Z][a-z]+(?: [A-Z][a-z]+)+)",
+        r"Regards,\s*([A-Z][a-z]+(?: [A-Z][a-z]+)+)",
+        r"Thank you,\s*([A-Z][a-z]+(?: [A-Z][a-z]+)+)",
+        r"Best regards,\s*([A-Z][a-z]+(?: [A-Z][a-z]+)+)"
+    ]
+    
+    # Email patterns
+    EMAIL_PATTERNS = [
+        r"([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)",
+        r"Email:?\s*([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)",
+        r"contact:.*?([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)"
+    ]
+    
+    # Phone patterns
+    PHONE_PATTERNS = [
+        r"(\+\d{1,3}[-\s]?\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4})",
+        r"Phone:?\s*(\+\d{1,3}[-\s]?\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4})",
+        r"contact:.*?(\+\d{1,3}[-\s]?\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4})"
+    ]
+    
+    # Role/position patterns
+    ROLE_PATTERNS = [
+        r"the ([A-Za-z]+(?: [A-Za-z]+){0,4}) position",
+        r"for the ([A-Za-z]+(?: [A-Za-z]+){0,4}) position",
+        r"Role:?\s*([A-Za-z]+(?: [A-Za-z]+){0,4})"
+    ]
+    
+    # Company patterns
+    COMPANY_PATTERNS = [
+        r"from ([A-Za-z0-9]+(?: [A-Za-z0-9]+){0,3})\.",
+        r"from ([A-Za-z0-9]+(?: [A-Za-z0-9]+){0,3})\s",
+        r"Company:?\s*([A-Za-z0-9]+(?: [A-Za-z0-9]+){0,3})",
+        r"([A-Za-z0-9]+(?: [A-Za-z0-9]+){0,3})$"
+    ]
+    
+    # Location patterns - updated to match generator format
+    LOCATION_PATTERNS = [
+        r"Location:?\s*([A-Za-z\s,]+)",
+        r"office is in ([A-Za-z\s,]+)",
+        r"based in ([A-Za-z\s,]+)",
+        r"located in ([A-Za-z\s,]+)(?:\s+\([A-Z]{3}\))?"
+    ]
+    
+    # Timezone patterns - exact match with generator format
+    # An abbreviation (EST, AEST, ...) or an IANA name (Europe/Paris)
+    TIMEZONE_PATTERNS = [
+        r"All times are in ([A-Z]+/[A-Z_]+(?:/[A-Z_]+)?|[A-Z]{3,5}\b)",
+        r"My timezone is ([A-Z]+/[A-Z_]+(?:/[A-Z_]+)?|[A-Z]{3,5}\b)",
+        r"Times listed are in ([A-Z]+/[A-Z_]+(?:/[A-Z_]+)?|[A-Z]{3,5}\b)",
+        r"Located in .+? \(([A-Z]+/[A-Z_]+(?:/[A-Z_]+)?|[A-Z]{3,5})\)"
+    ]
+    
+    # Date-time patterns - simplified to support only generator format
+    DATETIME_PATTERNS = [
+        # ISO format: 2023-06-15 10:00-11:00
+        r"(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2})-(\d{2}:\d{2})"
+    ]
+    
+    # List item patterns
+    LIST_ITEM_PATTERNS = [
+        r"[-•*]\s+(.+)$",  # Bullet points
+        r"\d+\.\s+(.+)$"   # Numbered items
+    ]
+
+    # Field patterns, compiled once for all instances
+    FIELD_EXTRACTOR = FieldExtractor({
+        "name": NAME_PATTERNS,
+        "email": EMAIL_PATTERNS,
+        "phone": PHONE_PATTERNS,
+        "role": ROLE_PATTERNS,
+        "company": COMPANY_PATTERNS,
+        "location": LOCATION_PATTERNS,
+        "timezone": TIMEZONE_PATTERNS
+    })
+
+    # Bump whenever a change to the parser changes its results, to invalidate cached parses
+    PARSER_VERSION = "3"
+
+    def __init__(self, debug=False, cache: Optional[ParseCache] = None):
+        """
+        Initialize the parser
+
+        Args:
+            debug: log parsing results
+            cache: optional ParseCache in front of parsing, keyed by the cleaned message
+                and the timezone and location maps
+        """
         # Set up logging
         self.debug = debug
+        self.cache = cache
         logging.basicConfig(level=logging.DEBUG if debug else logging.INFO)
         self.logger = logging.getLogger("MessageParser")
         
@@ -47,79 +210,79 @@ class MessageParser:
             "Portland": "America/Los_Angeles"
         }
         
-        # Regular expression patterns - simplified and matched with generator
-        
-        # Name patterns
-        self.name_patterns = [
-            r"My name is ([A-Z][a-z]+(?: [A-Z][a-z]+)+)",
-            r"name:?\s*([A-Z][a-z]+(?: [A-Z][a-z]+)+)",
-            r"Regards,\s*([A-Z][a-z]+(?: [A-Z][a-z]+)+)",
-            r"Thank you,\s*([A-Z][a-z]+(?: [A-Z][a-z]+)+)",
-            r"Best regards,\s*([A-Z][a-z]+(?: [A-Z][a-z]+)+)"
-        ]
-        
-        # Email patterns
-        self.email_patterns = [
-            r"([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)",
-            r"Email:?\s*([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)",
-            r"contact:.*?([a-zA-Z0-9_.+-]+@[a-zA-Z0-9-]+\.[a-zA-Z0-9-.]+)"
-        ]
-        
-        # Phone patterns
-        self.phone_patterns = [
-            r"(\+\d{1,3}[-\s]?\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4})",
-            r"Phone:?\s*(\+\d{1,3}[-\s]?\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4})",
-            r"contact:.*?(\+\d{1,3}[-\s]?\(?\d{3}\)?[-\s]?\d{3}[-\s]?\d{4})"
-        ]
-        
-        # Role/position patterns
-        self.role_patterns = [
-            r"the ([A-Za-z]+(?: [A-Za-z]+){0,4}) position",
-            r"for the ([A-Za-z]+(?: [A-Za-z]+){0,4}) position",
-            r"Role:?\s*([A-Za-z]+(?: [A-Za-z]+){0,4})"
-        ]
-        
-        # Company patterns
-        self.company_patterns = [
-            r"from ([A-Za-z0-9]+(?: [A-Za-z0-9]+){0,3})\.",
-            r"from ([A-Za-z0-9]+(?: [A-Za-z0-9]+){0,3})\s",
-            r"Company:?\s*([A-Za-z0-9]+(?: [A-Za-z0-9]+){0,3})",
-            r"([A-Za-z0-9]+(?: [A-Za-z0-9]+){0,3})$"
-        ]
-        
-        # Location patterns - updated to match generator format
-        self.location_patterns = [
-            r"Location:?\s*([A-Za-z\s,]+)",
-            r"office is in ([A-Za-z\s,]+)",
-            r"based in ([A-Za-z\s,]+)",
-            r"located in ([A-Za-z\s,]+)(?:\s+\([A-Z]{3}\))?"
-        ]
-        
-        # Timezone patterns - exact match with generator format
-        self.timezone_patterns = [
-            r"All times are in ([A-Z]{3})",
-            r"My timezone is ([A-Z]{3})",
-            r"Times listed are in ([A-Z]{3})",
-            r"Located in .+? \(([A-Z]{3})\)"
-        ]
-        
-        # Date-time patterns - simplified to support only generator format
-        self.datetime_patterns = [
-            # ISO format: 2023-06-15 10:00-11:00
-            r"(\d{4}-\d{2}-\d{2}\s+\d{2}:\d{2})-(\d{2}:\d{2})"
-        ]
-        
-        # List item patterns
-        self.list_item_patterns = [
-            r"[-•*]\s+(.+)$",  # Bullet points
-            r"\d+\.\s+(.+)$"   # Numbered items
-        ]
+        # Regular expression patterns, shared by all instances
+        self.name_patterns = self.NAME_PATTERNS
+        self.email_patterns = self.EMAIL_PATTERNS
+        self.phone_patterns = self.PHONE_PATTERNS
+        self.role_patterns = self.ROLE_PATTERNS
+        self.company_patterns = self.COMPANY_PATTERNS
+        self.location_patterns = self.LOCATION_PATTERNS
+        self.timezone_patterns = self.TIMEZONE_PATTERNS
+        self.datetime_patterns = self.DATETIME_PATTERNS
+        self.list_item_patterns = self.LIST_ITEM_PATTERNS
     
     def parse_message(self, message: str) -> Dict[str, Any]:
         """Parse message to extract all relevant scheduling information"""
         # Save original message
         self.original_message = message
-        
+        return self._parse(message)
+    
+    def parse_many(self, messages: Iterable[str], max_workers: int = 1, chunksize: int = 256) -> Iterator[Dict[str, Any]]:
+        """
+        Parse many messages, yielding results lazily in input order.
+        
+        Unlike parse_message, this does not touch parser state, so it is safe to share
+        one parser between threads. Worker processes get a copy of this parser, so
+        customised mappings (e.g. location_timezone_map) apply there too.
+        
+        Args:
+            messages: any iterable of message strings, consumed as results are needed
+            max_workers: number of worker processes (1 parses in this process,
+                None lets the executor pick one per CPU)
+            chunksize: number of messages sent to a worker at a time
+        """
+        if max_workers == 1:
+            for message in messages:
+                yield self._parse(message)
+            return
+        
+        messages = iter(messages)
+        with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker, initargs=(self,)) as pool:
+            # Keep a bounded number of chunks in flight so huge inputs stream through
+            max_pending = 2 * (max_workers or os.cpu_count() or 1)
+            pending = deque()
+            while True:
+                while len(pending) < max_pending:
+                    chunk = list(islice(messages, chunksize))
+                    if not chunk:
+                        break
+                    pending.append(pool.submit(_parse_chunk, chunk))
+                if not pending:
+                    break
+                yield from pending.popleft().result()
+    
+    def _parse(self, message: str) -> Dict[str, Any]:
+        """Parse one message without modifying the parser"""
+        # Clean message
+        clean_message = self._clean_message(message)
+        if self.cache is None:
+            return self._parse_clean(clean_message)
+        
+        # Quoted and re-sent messages clean to the same text, so they share an entry
+        key = self.cache.make_key(clean_message, self.PARSER_VERSION, self._mappings_digest())
+        result = self.cache.get(key)
+        if result is None:
+            result = self._parse_clean(clean_message)
+            self.cache.put(key, result)
+        return result
+    
+    def _mappings_digest(self) -> str:
+        """Digest of the timezone and location maps, which can be changed after construction"""
+        mappings = (sorted(self.timezone_mappings.items()), sorted(self.location_timezone_map.items()))
+        return hashlib.sha256(repr(mappings).encode("utf-8")).hexdigest()
+    
+    def _parse_clean(self, clean_message: str) -> Dict[str, Any]:
+        """Parse a cleaned message"""
         # Initialize result dictionary
         result = {
             "name": None,
@@ -136,19 +299,17 @@ class MessageParser:
             "raw_availability": []
         }
         
-        # Clean message
-        clean_message = self._clean_message(message)
-        
         # Extract basic information
-        result["name"] = self._extract_pattern(clean_message, self.name_patterns)
-        result["email"] = self._extract_pattern(clean_message, self.email_patterns)
-        result["phone"] = self._extract_pattern(clean_message, self.phone_patterns)
-        result["role"] = self._extract_pattern(clean_message, self.role_patterns)
-        result["company"] = self._extract_pattern(clean_message, self.company_patterns)
-        result["location"] = self._extract_pattern(clean_message, self.location_patterns)
+        fields = self.FIELD_EXTRACTOR.extract(clean_message)
+        result["name"] = fields["name"]
+        result["email"] = fields["email"]
+        result["phone"] = fields["phone"]
+        result["role"] = fields["role"]
+        result["company"] = fields["company"]
+        result["location"] = fields["location"]
         
         # Extract timezone - directly use matching patterns
-        timezone_match = self._extract_pattern(clean_message, self.timezone_patterns)
+        timezone_match = fields["timezone"]
         
         # Normalize timezone
         if timezone_match:
@@ -253,6 +414,14 @@ class MessageParser:
         if tz_clean in self.timezone_mappings:
             return self.timezone_mappings[tz_clean]
         
+        # Check every abbreviation in the tz database, then full IANA names
+        gazetteer = load_gazetteer()
+        zone = gazetteer.normalize_abbreviation(tz_clean)
+        if zone:
+            return zone
+        if timezone_str.strip() in gazetteer.zones:
+            return timezone_str.strip()
+        
         # If no match found, default to Eastern Time
         self.logger.warning(f"Could not parse timezone: {timezone_str}, defaulting to America/New_York")
         return "America/New_York"
@@ -313,10 +482,11 @@ class MessageParser:
         if location in self.location_timezone_map:
             return self.location_timezone_map[location]
         
-        # Partial match
-        for loc, tz in self.location_timezone_map.items():
-            if loc in location:
-                return tz
+        # Partial match: one pass of the gazetteer automaton over the location text,
+        # with this parser's own map taking precedence
+        zone = load_gazetteer().find_timezone(location, self.location_timezone_map)
+        if zone:
+            return zone
         
         # Default timezone
         return "America/New_York"
@@ -343,6 +513,17 @@ class MessageParser:
         
         print("===========================\n")
 
+_worker_parser = None
+
+def _init_worker(parser: MessageParser) -> None:
+    """Install a copy of the calling process's parser in a worker process"""
+    global _worker_parser
+    _worker_parser = parser
+
+def _parse_chunk(messages: List[str]) -> List[Dict[str, Any]]:
+    """Parse a chunk of messages in a worker process"""
+    return [_worker_parser._parse(message) for message in messages]
+
 def test_parser_with_generator(num_test_cases=5, with_noise=True):
     """Test parser integration with random generator"""
     # Import message generator
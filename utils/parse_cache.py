@@ -0,0 +1,136 @@
+import hashlib
+import os
+import pickle
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Any, Optional
+
+class ParseCache:
+    """
+    Two-level cache of parse results keyed by message content.
+
+    Entries live in a bounded in-memory LRU and, if a directory is given, as one
+    pickle file per entry on disk. The disk level is bounded by a number of entries
+    and evicts the least recently used files (by modification time, refreshed on
+    every hit), so it can be shared between runs and between worker processes.
+    Within a process the in-memory level is guarded by a lock, so one cache can be
+    used from several threads.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_memory_entries: int = 4096,
+                 max_disk_entries: int = 100000):
+        """
+        Args:
+            directory: where to keep entries on disk (memory only if None)
+            max_memory_entries: size of the in-memory LRU
+            max_disk_entries: number of files kept on disk before evicting
+        """
+        self.directory = directory
+        self.max_memory_entries = max_memory_entries
+        self.max_disk_entries = max_disk_entries
+        self.memory = OrderedDict()  # key -> pickled result
+        self.disk_entries = None  # files on disk, counted on first write
+        self.lock = threading.Lock()  # guards memory and disk_entries
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    @staticmethod
+    def make_key(text: str, version: str, config: str = "") -> str:
+        """Digest of a text, the version of the code that parses it and the parser's configuration"""
+        return hashlib.sha256(f"{version}\0{config}\0{text}".encode("utf-8", "surrogatepass")).hexdigest()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return a fresh copy of the cached value, or None on a miss"""
+        with self.lock:
+            data = self.memory.get(key)
+            if data is not None:
+                self.memory.move_to_end(key)
+        if data is not None:
+            return pickle.loads(data)
+        if not self.directory:
+            return None
+
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)
+        except OSError:
+            return None
+        self._remember(key, data)
+        return pickle.loads(data)
+
+    def put(self, key: str, value: Any) -> None:
+        """Store a value in memory and, if enabled, on disk"""
+        data = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        self._remember(key, data)
+        if not self.directory:
+            return
+
+        path = self._path(key)
+        is_new = not os.path.exists(path)
+        # Write to a temporary file first so readers never see a partial entry
+        fd, tmp_path = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+
+        with self.lock:
+            if self.disk_entries is None:
+                self.disk_entries = len(self._disk_files())
+            elif is_new:
+                self.disk_entries += 1
+            if self.disk_entries > self.max_disk_entries:
+                self._evict_disk()
+
+    def clear(self) -> None:
+        """Drop every entry from memory and disk"""
+        with self.lock:
+            self.memory.clear()
+            if self.directory:
+                for path in self._disk_files():
+                    os.remove(path)
+                self.disk_entries = 0
+
+    def _remember(self, key, data):
+        with self.lock:
+            self.memory[key] = data
+            self.memory.move_to_end(key)
+            while len(self.memory) > self.max_memory_entries:
+                self.memory.popitem(last=False)
+
+    def _path(self, key):
+        return os.path.join(self.directory, key + ".pickle")
+
+    def _disk_files(self):
+        return [entry.path for entry in os.scandir(self.directory) if entry.name.endswith(".pickle")]
+
+    def _evict_disk(self):
+        # Evict in batches of a tenth so the directory is not rescanned on every write
+        files = []
+        for path in self._disk_files():
+            try:
+                files.append((os.stat(path).st_mtime, path))
+            except OSError:
+                pass  # evicted by another process
+        files.sort()
+        keep = self.max_disk_entries - self.max_disk_entries // 10
+        for _, path in files[:max(len(files) - keep, 0)]:
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+        self.disk_entries = min(len(files), keep)
+
+    def __getstate__(self):
+        # Worker processes share the disk level only
+        state = self.__dict__.copy()
+        state["memory"] = OrderedDict()
+        state["disk_entries"] = None
+        del state["lock"]
+        return state
+
+    def __setstate__(self, state):
+        self.__dict__.update(state)
+        self.lock = threading.Lock()
@@ -1,6 +1,137 @@
-from datetime import datetime, timedelta
+from datetime import date, datetime
+from functools import lru_cache
 from zoneinfo import ZoneInfo
 
+# Map common timezone abbreviations to IANA
+TIMEZONE_MAP = {
+   "PST": "America/Los_Angeles",
+   "EST": "America/New_York",
+   "CST": "America/Chicago",
+   "MST": "America/Denver"
+}
+
+SLOT_FORMAT = "%Y-%m-%d %H:%M %Z"
+
+# Working hours as minutes since local midnight: 9am to 6pm
+WORK_START_MINUTE = 9 * 60
+WORK_END_MINUTE = 18 * 60
+
+EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# Upper bound on cached availability ranges and per-day zone offsets
+SLOT_CACHE_SIZE = 65536
+
+@lru_cache(maxsize=None)
+def resolve_timezone(tz_str):
+   """
+   Resolves a timezone string to a ZoneInfo object.
+   Supports common abbreviations by mapping them to full IANA names.
+   """
+   return ZoneInfo(TIMEZONE_MAP.get(tz_str, tz_str))
+
+def parse_multi_day_slot_minutes(availability, slot_length_minutes, timezone_str):
+   """
+   Converts availability ranges into discrete time slots of fixed length,
+   filtering out weekends and ensuring the slots fall within 9am-6pm in the local time zone.
+
+   Slots are plain integers (minutes since the UTC epoch), so slots of people in
+   different time zones can be compared and hashed without any datetime work.
+   Each range is parsed through a bounded LRU cache, since the same availability
+   strings recur across people and across runs.
+
+   Args:
+       availability: list of strings like "2025-04-01 09:00-10:00"
+       slot_length_minutes: duration of each interview slot (e.g., 30)
+       timezone_str: time zone (e.g., "EST", "PST", "America/New_York")
+
+   Returns:
+       A set of ints, each representing a slot start time in UTC minutes
+   """
+   time_slots = set()
+   for time_range in availability:
+       time_slots.update(range_slot_minutes(time_range, timezone_str, slot_length_minutes))
+   return time_slots
+
+@lru_cache(maxsize=SLOT_CACHE_SIZE)
+def range_slot_minutes(time_range, timezone_str, slot_length_minutes):
+   """
+   Converts one availability range like "2025-04-01 09:00-10:00" into its slots.
+
+   Returns:
+       A range of slot start times in UTC minutes (empty on weekends)
+   """
+   interval = range_interval_minutes(time_range, timezone_str)
+   if interval is None:
+       return range(0)
+
+   # Generate discrete time slots (e.g., every 30 minutes) that fit in the interval
+   start, end = interval
+   return range(start, end - slot_length_minutes + 1, slot_length_minutes)
+
+def parse_availability_intervals(availability, timezone_str):
+   """
+   Converts availability ranges into sorted, merged intervals, with the same weekend
+   and 9am-6pm filtering as parse_multi_day_slot_minutes but without cutting them
+   into slots, so the size does not grow with the horizon's granularity.
+
+   Args:
+       availability: list of strings like "2025-04-01 09:00-10:00"
+       timezone_str: time zone (e.g., "EST", "PST", "America/New_York")
+
+   Returns:
+       A list of (start, end) UTC minutes, half-open, sorted and non-overlapping
+   """
+   intervals = sorted(filter(None, (range_interval_minutes(time_range, timezone_str)
+                                    for time_range in availability)))
+   merged = []
+   for start, end in intervals:
+       if merged and start <= merged[-1][1]:
+           if end > merged[-1][1]:
+               merged[-1] = (merged[-1][0], end)
+       else:
+           merged.append((start, end))
+   return merged
+
+@lru_cache(maxsize=SLOT_CACHE_SIZE)
+def range_interval_minutes(time_range, timezone_str):
+   """
+   Converts one availability range like "2025-04-01 09:00-10:00" into an interval.
+   This is the one place ranges are parsed; range_slot_minutes cuts its result into slots.
+
+   Returns:
+       (start, end) in UTC minutes, or None on weekends or outside working hours
+   """
+   # Split "2025-04-01 09:00-10:00" into parts; fixed format, so no strptime needed
+   date_str, time_str = time_range.split()
+   start_str, end_str = time_str.split("-")
+   year, month, day = date_str.split("-")
+   start_hour, start_min = start_str.split(":")
+   end_hour, end_min = end_str.split(":")
+   ordinal = date(int(year), int(month), int(day)).toordinal()
+
+   # Skip weekends (ordinal 1 is a Monday)
+   if (ordinal - 1) % 7 >= 5:
+       return None
+
+   # Clamp to working hours: 9am to 6pm, as minutes since local midnight
+   start = max(int(start_hour) * 60 + int(start_min), WORK_START_MINUTE)
+   end = min(int(end_hour) * 60 + int(end_min), WORK_END_MINUTE)
+   if end <= start:
+       return None
+
+   day_start = (ordinal - EPOCH_ORDINAL) * 1440 - utc_offset_minutes(timezone_str, ordinal)
+   return day_start + start, day_start + end
+
+@lru_cache(maxsize=SLOT_CACHE_SIZE)
+def utc_offset_minutes(timezone_str, ordinal):
+   """
+   Returns the UTC offset in minutes of a time zone during working hours on a day
+   (given as a date ordinal). DST transitions happen outside 9am-6pm, so one
+   offset per zone and day is enough.
+   """
+   noon = datetime.fromordinal(ordinal).replace(hour=12, tzinfo=resolve_timezone(timezone_str))
+   return int(noon.utcoffset().total_seconds()) // 60
+
 def parse_multi_day_slots(availability, slot_length_minutes, timezone_str):
    """
    Converts availability ranges into discrete time slots of fixed length,
@@ -14,38 +145,47 @@ def parse_multi_day_slots(availability, slot_length_minutes, timezone_str):
    Returns:
        A set of timezone-aware datetime objects, each representing a slot start time
    """
+   return {slot_to_datetime(slot, timezone_str)
+           for slot in parse_multi_day_slot_minutes(availability, slot_length_minutes, timezone_str)}
 
-   TIMEZONE_MAP = {
-       "PST": "America/Los_Angeles",
-       "EST": "America/New_York",
-       "CST": "America/Chicago",
-       "MST": "America/Denver"
-   }
-   tz = ZoneInfo(TIMEZONE_MAP.get(timezone_str, timezone_str))
-   time_slots = set()
+def slot_to_datetime(slot_minute, timezone_str):
+   """
+   Converts a slot in UTC minutes back to a timezone-aware datetime in the given time zone.
+   """
+   return datetime.fromtimestamp(slot_minute * 60, resolve_timezone(timezone_str))
 
-   for time_range in availability:
-       # Split "2025-04-01 09:00-10:00" into parts
-       date_str, time_str = time_range.split()
-       start_str, end_str = time_str.split("-")
-
-       # Convert to timezone-aware datetime objects
-       start = datetime.strptime(f"{date_str} {start_str}", "%Y-%m-%d %H:%M").replace(tzinfo=tz)
-       end = datetime.strptime(f"{date_str} {end_str}", "%Y-%m-%d %H:%M").replace(tzinfo=tz)
-
-       # Skip weekends
-       if start.weekday() >= 5: 
-           continue
-      
-       # Clamp slots to working hours: 9am to 6pm
-       work_start = start.replace(hour=9, minute=0)
-       work_end = start.replace(hour=18, minute=0)
-       start = max(start, work_start)
-       end = min(end, work_end)
-
-       # Generate discrete time slots (e.g., every 30 minutes)
-       while start + timedelta(minutes=slot_length_minutes) <= end:
-           time_slots.add(start)
-           start += timedelta(minutes=slot_length_minutes)
-  
-   return time_slots
+def format_slot(slot_minute, timezone_str):
+   """
+   Formats a slot in UTC minutes as "YYYY-MM-DD HH:MM TZ" in the given time zone.
+   """
+   return slot_to_datetime(slot_minute, timezone_str).strftime(SLOT_FORMAT)
+
+def parse_formatted_slot(time_str, timezone_str):
+   """
+   Inverse of format_slot: converts "YYYY-MM-DD HH:MM TZ" back to UTC minutes.
+
+   Returns:
+       The slot, or None if time_str was not formatted in this time zone
+   """
+   try:
+       naive = datetime.strptime(time_str.rsplit(" ", 1)[0], "%Y-%m-%d %H:%M")
+   except ValueError:
+       return None
+   slot = int(naive.replace(tzinfo=resolve_timezone(timezone_str)).timestamp()) // 60
+   return slot if format_slot(slot, timezone_str) == time_str else None
+
+def resolve_slot(time_str, *people):
+   """
+   Matches a formatted time back to its slot, trying the time zone of each given
+   person ({"availability": [...], "timezone": ...} or None) in turn, since
+   schedulers show a slot in either the candidate's or the recruiter's time zone.
+
+   Returns:
+       The slot in UTC minutes, or None if it cannot be resolved
+   """
+   for data in people:
+       if data is not None:
+           slot = parse_formatted_slot(time_str, data["timezone"])
+           if slot is not None:
+               return slot
+   return None